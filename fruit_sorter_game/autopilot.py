@@ -0,0 +1,36 @@
+"""Scripted players for the headless tools.
+
+Each script takes (game, tick) and returns the (left, right) keys to
+hold for that tick. Nothing here imports the game, so main.py's own
+modules (stress mode) can use them too.
+"""
+
+
+def idle_script(game, tick):
+    """Never touch the keys"""
+    return False, False
+
+
+def sweep_script(game, tick):
+    """Sweep the basket from side to side every two seconds"""
+    left = (tick // (2 * game.sim_rate)) % 2 == 0
+    return left, not left
+
+
+def autopilot_script(game, tick):
+    """Steer towards the lowest fruit, ignoring bombs"""
+    target = None
+    for fruit in game.fruits:
+        if fruit.fruit_type != "bomb" and (target is None or fruit.y > target.y):
+            target = fruit
+    if target is None:
+        return False, False
+    offset = target.x - game.basket.x
+    return offset < -10, offset > 10
+
+
+SCRIPTS = {
+    "idle": idle_script,
+    "sweep": sweep_script,
+    "autopilot": autopilot_script,
+}
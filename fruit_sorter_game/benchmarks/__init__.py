@@ -0,0 +1,5 @@
+"""Standalone performance benchmarks, run from the game directory:
+
+    python -m benchmarks.broadphase_stress
+    python -m benchmarks.microbench
+"""
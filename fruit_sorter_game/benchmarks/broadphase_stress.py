@@ -0,0 +1,117 @@
+"""Stress test for the broadphase grid against brute-force rect checks.
+
+Moves N falling rects down a wide playfield for a number of ticks and
+finds every rect overlapping any of the catch zones, once with the
+SpatialHash and once by testing every pair. Both must find the same
+pairs. The table shows the collision phase in milliseconds per tick for
+each (grid upkeep included, moving the rects excluded).
+
+    python -m benchmarks.broadphase_stress --counts 100 1000 10000 --zones 32
+"""
+import random
+import time
+import argparse
+
+import pygame
+
+from broadphase import SpatialHash
+
+FIELD_WIDTH = 4000
+FIELD_HEIGHT = 3000
+FRUIT_SIZE = 40
+ZONE_WIDTH = 100
+ZONE_HEIGHT = 20
+
+
+class Body:
+    """Minimal moving entity with a rect, standing in for a Fruit"""
+    __slots__ = ("rect", "speed")
+
+    def __init__(self, rect, speed):
+        self.rect = rect
+        self.speed = speed
+
+
+def make_world(count, zones, seed):
+    rng = random.Random(seed)
+    bodies = [
+        Body(pygame.Rect(rng.randrange(FIELD_WIDTH - FRUIT_SIZE), rng.randrange(FIELD_HEIGHT),
+                         FRUIT_SIZE, FRUIT_SIZE), rng.randint(2, 8))
+        for _ in range(count)
+    ]
+    # Catch zones spread over a few rows, like baskets on several lanes
+    baskets = [
+        pygame.Rect(rng.randrange(FIELD_WIDTH - ZONE_WIDTH), rng.randrange(FIELD_HEIGHT),
+                    ZONE_WIDTH, ZONE_HEIGHT)
+        for _ in range(zones)
+    ]
+    return bodies, baskets
+
+
+def step(bodies):
+    for body in bodies:
+        body.rect.y += body.speed
+        if body.rect.top > FIELD_HEIGHT:
+            body.rect.bottom = 0
+
+
+def run_grid(bodies, baskets, ticks, cell_size):
+    grid = SpatialHash(cell_size)
+    for body in bodies:
+        grid.insert(body, body.rect)
+    hits = 0
+    elapsed = 0.0
+    for _ in range(ticks):
+        step(bodies)
+        start = time.perf_counter()
+        grid.update_all(bodies)
+        for zone in baskets:
+            for body in grid.query(zone):
+                if body.rect.colliderect(zone):
+                    hits += 1
+        elapsed += time.perf_counter() - start
+    return elapsed, hits
+
+
+def run_brute(bodies, baskets, ticks):
+    hits = 0
+    elapsed = 0.0
+    for _ in range(ticks):
+        step(bodies)
+        start = time.perf_counter()
+        for zone in baskets:
+            for body in bodies:
+                if body.rect.colliderect(zone):
+                    hits += 1
+        elapsed += time.perf_counter() - start
+    return elapsed, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadphase stress benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 1000, 5000, 10000],
+                        help="numbers of falling objects to test")
+    parser.add_argument("--zones", type=int, default=32, help="number of catch zones")
+    parser.add_argument("--ticks", type=int, default=60, help="ticks simulated per run")
+    parser.add_argument("--cell-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.zones} zones, {args.ticks} ticks, cell size {args.cell_size}")
+    print(f"{'objects':>8} {'grid ms/tick':>13} {'brute ms/tick':>14} {'speedup':>8} {'hits':>8}")
+    for count in args.counts:
+        bodies, baskets = make_world(count, args.zones, args.seed)
+        grid_time, grid_hits = run_grid(bodies, baskets, args.ticks, args.cell_size)
+
+        # Same starting positions for the brute-force run
+        bodies, baskets = make_world(count, args.zones, args.seed)
+        brute_time, brute_hits = run_brute(bodies, baskets, args.ticks)
+
+        if grid_hits != brute_hits:
+            raise AssertionError(f"grid found {grid_hits} hits, brute force found {brute_hits}")
+        print(f"{count:>8} {grid_time * 1000 / args.ticks:>13.3f} {brute_time * 1000 / args.ticks:>14.3f} "
+              f"{brute_time / grid_time:>7.1f}x {grid_hits:>8}")
+
+
+if __name__ == "__main__":
+    main()
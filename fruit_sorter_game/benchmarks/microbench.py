@@ -0,0 +1,250 @@
+"""Microbenchmarks for the hot paths in sprites.py, main.py and the audio modules.
+
+Runs under SDL's dummy drivers. Each benchmark times a function over a
+number of calls, repeated with fresh state, and records the median and
+best time per call. Results are written as JSON and compared against a
+baseline on the best time, which is much less disturbed by other load on
+the machine than the median. Anything slower than the baseline by more
+than the threshold is reported and makes the run exit with status 1.
+
+Absolute timings only mean something on the machine that recorded them,
+so the baseline is not kept in the repository. Record one locally
+before starting a change (it is git-ignored, like the results):
+
+    python -m benchmarks.microbench --save-baseline --repeats 9
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench --filter particles --repeats 9
+"""
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+
+# The dummy drivers must be selected before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from main import Game, SCREEN_WIDTH, SCREEN_HEIGHT
+from sprites import Fruit, ParticleSystem, Background, NEON_CYAN, NEON_GREEN
+from sound_effects import SoundEffects
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_FILE = os.path.join(BENCH_DIR, "results.json")
+
+FRUIT_TYPES = ["apple", "banana", "orange", "star_fruit", "blueberry", "bomb"]
+PARTICLE_COUNTS = [100, 1000, 5000]
+
+# Registry of (name, setup, calls per repeat); setup returns the function to time
+BENCHMARKS = []
+
+_game = None
+
+
+def benchmark(name, calls):
+    def register(setup):
+        BENCHMARKS.append((name, setup, calls))
+        return setup
+    return register
+
+
+def game():
+    """One shared Game for the benchmarks that need its screen and fonts"""
+    global _game
+    if _game is None:
+        _game = Game(seed=1)
+        _game.music.stop()
+    return _game
+
+
+def make_fruits(count=50, seed=1):
+    rng = random.Random(seed)
+    return [Fruit(rng.randint(50, SCREEN_WIDTH - 50), rng.randint(0, SCREEN_HEIGHT),
+                  FRUIT_TYPES[i % len(FRUIT_TYPES)], "left", rng.uniform(2, 4), rng)
+            for i in range(count)]
+
+
+def make_particles(count, seed=1):
+    rng = random.Random(seed)
+    particles = ParticleSystem(rng)
+    while len(particles.particles) < count:
+        particles.add_particles(rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT),
+                                NEON_CYAN, min(50, count - len(particles.particles)))
+    return particles
+
+
+@benchmark("fruit_init", 1000)
+def bench_fruit_init():
+    rng = random.Random(1)
+    types = iter(FRUIT_TYPES * 1000)
+    return lambda: Fruit(400, 0, next(types), "left", 3, rng)
+
+
+@benchmark("fruit_update_x50", 100)
+def bench_fruit_update():
+    fruits = make_fruits()
+
+    def run():
+        for fruit in fruits:
+            fruit.update()
+    return run
+
+
+@benchmark("fruit_draw_with_effects_x50", 50)
+def bench_fruit_draw():
+    fruits = make_fruits()
+    screen = game().screen
+
+    def run():
+        for fruit in fruits:
+            fruit.draw_with_effects(screen, music_pulse=0.5, alpha=0.5)
+    return run
+
+
+def particle_benchmarks(count):
+    # Ten ticks stay inside the shortest particle lifetime, so the count holds
+    @benchmark(f"particles_update_{count}", 10)
+    def bench_update():
+        particles = make_particles(count)
+        return particles.update
+
+    @benchmark(f"particles_draw_{count}", 5)
+    def bench_draw():
+        particles = make_particles(count)
+        screen = game().screen
+        return lambda: particles.draw(screen)
+
+
+for _count in PARTICLE_COUNTS:
+    particle_benchmarks(_count)
+
+
+@benchmark("background_update", 200)
+def bench_background_update():
+    return Background(SCREEN_WIDTH, SCREEN_HEIGHT, random.Random(1)).update
+
+
+@benchmark("background_draw", 50)
+def bench_background_draw():
+    background = Background(SCREEN_WIDTH, SCREEN_HEIGHT, random.Random(1))
+    screen = game().screen
+    return lambda: background.draw(screen)
+
+
+@benchmark("draw_neon_text", 200)
+def bench_draw_neon_text():
+    g = game()
+    return lambda: g.draw_neon_text("SCORE: 12450", 20, 20, NEON_GREEN)
+
+
+@benchmark("button_draw_hovered", 200)
+def bench_button_draw():
+    g = game()
+    button = g.start_button
+    button.is_hovered = True
+    return lambda: button.draw(g.screen, 0.5)
+
+
+@benchmark("sound_effects_init", 1)
+def bench_sound_effects():
+    return SoundEffects
+
+
+@benchmark("music_generate_simple_loop", 1)
+def bench_generate_loop():
+    return game().music.generate_simple_loop
+
+
+def run_benchmarks(repeats, name_filter=None):
+    results = {}
+    for name, setup, calls in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        times = []
+        for _ in range(repeats):
+            func = setup()
+            start = time.perf_counter()
+            for _ in range(calls):
+                func()
+            times.append((time.perf_counter() - start) / calls * 1e6)
+        results[name] = {
+            "median_us": statistics.median(times),
+            "min_us": min(times),
+            "calls": calls,
+            "repeats": repeats,
+        }
+        print(f"{name:<32} {results[name]['median_us']:>12.1f} us  (best {results[name]['min_us']:.1f})")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against the baseline and return the regressed names"""
+    regressions = []
+    print(f"\n{'benchmark':<32} {'baseline best':>14} {'best us':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<32} {'-':>14} {result['min_us']:>12.1f}      new")
+            continue
+        change = result["min_us"] / base["min_us"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {base['min_us']:>14.1f} {result['min_us']:>12.1f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the game's hot paths")
+    parser.add_argument("--repeats", type=int, default=5, help="repeats per benchmark, each with fresh state")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", default=RESULTS_FILE, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="report benchmarks slower than the baseline by more than this fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = run_benchmarks(args.repeats, args.filter)
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        stored = json.load(f)
+    if (stored.get("platform"), stored.get("python")) != (report["platform"], report["python"]):
+        print(f"Note: the baseline was recorded on {stored.get('platform')}, Python {stored.get('python')}")
+    baseline = stored["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
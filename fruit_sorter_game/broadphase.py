@@ -0,0 +1,91 @@
+class SpatialHash:
+    """Uniform grid broadphase for rect-shaped entities
+
+    Each entity is stored in every cell its rect overlaps. update() only
+    touches the cell dicts when the entity crosses a cell boundary, so a
+    fruit falling a few pixels per tick costs one tuple comparison. Cells
+    are insertion-ordered dicts, so query results come back in the same
+    order on every run (replays stay deterministic).
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entity_cells = {}
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, entity, rect):
+        cells = self.cell_range(rect)
+        self.entity_cells[entity] = cells
+        self._add(entity, cells)
+
+    def update(self, entity, rect):
+        cells = self.cell_range(rect)
+        old = self.entity_cells.get(entity)
+        if old == cells:
+            return
+        if old is not None:
+            self._discard(entity, old)
+        self.entity_cells[entity] = cells
+        self._add(entity, cells)
+
+    def update_all(self, entities, attr="rect"):
+        """update() every entity from its own rect attribute, with the lookups hoisted"""
+        size = self.cell_size
+        entity_cells = self.entity_cells
+        for entity in entities:
+            x, y, w, h = getattr(entity, attr)
+            cells = (x // size, y // size, (x + w - 1) // size, (y + h - 1) // size)
+            old = entity_cells.get(entity)
+            if old == cells:
+                continue
+            if old is not None:
+                self._discard(entity, old)
+            entity_cells[entity] = cells
+            self._add(entity, cells)
+
+    def remove(self, entity):
+        old = self.entity_cells.pop(entity, None)
+        if old is not None:
+            self._discard(entity, old)
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+
+    def query(self, rect):
+        """Return the entities in the cells rect overlaps (candidates only)"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = {}
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return list(found)
+
+    def _add(self, entity, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    bucket = self.cells[(cx, cy)] = {}
+                bucket[entity] = None
+
+    def _discard(self, entity, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(entity, None)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
@@ -0,0 +1,167 @@
+"""Gameplay event bus with per-tick effect coalescing.
+
+Game.update emits small typed events (Catch, Miss, Bomb, Milestone,
+GameOver) instead of playing sounds and spawning particles inline. At
+the end of the tick the bus hands each subscriber all events of its
+type at once. The audio and particle consumers then turn ten
+simultaneous catches into one sound and one bigger burst, so the effect
+cost per tick stays bounded however fast fruit is caught.
+"""
+import math
+from collections import namedtuple
+
+from screen import SCREEN_WIDTH, SCREEN_HEIGHT
+from sprites import NEON_RED, NEON_GREEN, NEON_BLUE, NEON_YELLOW, NEON_ORANGE, NEON_CYAN
+
+Catch = namedtuple("Catch", "x y fruit_type")
+Miss = namedtuple("Miss", "x")
+Bomb = namedtuple("Bomb", "x y fatal")
+Milestone = namedtuple("Milestone", "kind score")  # kind: "milestone", "speed_boost" or "level"
+GameOver = namedtuple("GameOver", "color bursts")
+
+FRUIT_COLORS = {
+    "apple": NEON_RED,
+    "banana": NEON_YELLOW,
+    "orange": NEON_ORANGE,
+    "star_fruit": NEON_YELLOW,
+    "blueberry": NEON_BLUE,
+}
+
+
+class EventBus:
+    def __init__(self):
+        self.queue = []
+        self.handlers = {}
+
+    def subscribe(self, event_type, handler):
+        """handler(events) is called with every queued event of that type"""
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def emit(self, event):
+        self.queue.append(event)
+
+    def dispatch(self):
+        """Deliver the queued events grouped by type, in first-emitted order"""
+        if not self.queue:
+            return
+        batches = {}
+        for event in self.queue:
+            batches.setdefault(type(event), []).append(event)
+        self.queue = []
+        for event_type, events in batches.items():
+            for handler in self.handlers.get(event_type, ()):
+                handler(events)
+
+
+def scaled(base, count, cap):
+    """Effect size for `count` coalesced events: grows with sqrt(count) up to cap"""
+    return min(cap, int(base * math.sqrt(count)))
+
+
+class AudioEffects:
+    """One sound per event type per tick, a little louder when several coalesce"""
+    def __init__(self, bus, sound_fx):
+        self.sound_fx = sound_fx
+        bus.subscribe(Catch, self.on_catch)
+        bus.subscribe(Miss, self.on_miss)
+        bus.subscribe(Bomb, self.on_bomb)
+        bus.subscribe(GameOver, self.on_game_over)
+
+    def loudness(self, count):
+        """Volume factor: 1 for a lone event, up to 1.3 for several at once"""
+        return min(1.3, 1.0 + 0.1 * (count - 1))
+
+    def on_catch(self, events):
+        self.sound_fx.play("correct", self.loudness(len(events)))
+
+    def on_miss(self, events):
+        self.sound_fx.play("miss", self.loudness(len(events)))
+
+    def on_bomb(self, events):
+        fatal = any(event.fatal for event in events)
+        self.sound_fx.play("bomb" if fatal else "wrong", self.loudness(len(events)))
+
+    def on_game_over(self, events):
+        self.sound_fx.play("game_over")
+
+
+class ParticleEffects:
+    """One particle burst per event type per tick, at the events' centroid"""
+    def __init__(self, bus, particles, rng):
+        self.particles = particles
+        self.rng = rng
+        bus.subscribe(Catch, self.on_catch)
+        bus.subscribe(Miss, self.on_miss)
+        bus.subscribe(Bomb, self.on_bomb)
+        bus.subscribe(Milestone, self.on_milestone)
+        bus.subscribe(GameOver, self.on_game_over)
+
+    def burst(self, events, color, base, cap, y=None):
+        x = sum(event.x for event in events) / len(events)
+        if y is None:
+            y = sum(event.y for event in events) / len(events)
+        self.particles.add_particles(x, y, color, scaled(base, len(events), cap))
+
+    def scatter(self, color, bursts, count, top=0, bottom=SCREEN_HEIGHT):
+        for _ in range(bursts):
+            self.particles.add_particles(
+                self.rng.randint(0, SCREEN_WIDTH),
+                self.rng.randint(top, bottom),
+                color, count
+            )
+
+    def on_catch(self, events):
+        # Color of the first catch of the tick
+        color = FRUIT_COLORS.get(events[0].fruit_type, NEON_GREEN)
+        self.burst(events, color, 20, 60)
+
+    def on_miss(self, events):
+        self.burst(events, NEON_RED, 15, 45, y=SCREEN_HEIGHT)
+
+    def on_bomb(self, events):
+        fatal = any(event.fatal for event in events)
+        self.burst(events, NEON_RED, 50 if fatal else 30, 90)
+
+    def on_milestone(self, events):
+        kinds = {event.kind for event in events}
+        if "speed_boost" in kinds:
+            self.scatter(NEON_RED, 80, 25)
+        if "milestone" in kinds:
+            self.scatter(NEON_YELLOW, 50, 20, SCREEN_HEIGHT // 4, SCREEN_HEIGHT // 2)
+        if "level" in kinds:
+            self.scatter(NEON_CYAN, 60, 20, 0, SCREEN_HEIGHT // 2)
+
+    def on_game_over(self, events):
+        event = events[0]
+        self.scatter(event.color, event.bursts, 30)
+
+
+class GameStats:
+    """Per-session counts of gameplay events"""
+    def __init__(self, bus):
+        self.reset()
+        bus.subscribe(Catch, self.on_catch)
+        bus.subscribe(Miss, self.on_miss)
+        bus.subscribe(Bomb, self.on_bomb)
+        bus.subscribe(Milestone, self.on_milestone)
+
+    def reset(self):
+        self.catches = {}
+        self.misses = 0
+        self.bombs = 0
+        self.milestones = 0
+        self.busiest_tick = 0
+
+    def on_catch(self, events):
+        for event in events:
+            self.catches[event.fruit_type] = self.catches.get(event.fruit_type, 0) + 1
+        self.busiest_tick = max(self.busiest_tick, len(events))
+
+    def on_miss(self, events):
+        self.misses += len(events)
+
+    def on_bomb(self, events):
+        self.bombs += len(events)
+
+    def on_milestone(self, events):
+        self.milestones += sum(1 for event in events if event.kind == "milestone")
@@ -0,0 +1,272 @@
+"""Array-backed falling objects for very large fruit counts.
+
+FruitField keeps every falling object as one lane of a set of NumPy
+arrays, so a tick is a handful of vectorized operations instead of one
+Fruit.update call per sprite. Movement, wobble, rotation, pulse,
+off-screen culling and the swept catch test against the basket all run
+over the whole field at once. Only the few lanes whose swept hitbox
+reaches the basket go on to the per-object mask test. Fruit sprites are
+used once per type, for their artwork and collision frames.
+
+    python main.py --field-stress 10000
+"""
+import time
+
+import numpy as np
+import pygame
+
+from collision import ROTATION_FRAMES, mask_contact
+from screen import SCREEN_WIDTH, SCREEN_HEIGHT
+from sprites import Fruit, Basket, Background
+
+FIELD_TYPES = ["apple", "banana", "orange", "star_fruit", "blueberry", "bomb"]
+
+
+class FruitField:
+    def __init__(self, capacity=1024, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.capacity = 0
+        self.free = []
+        self.x = self.y = self.prev_x = self.prev_y = None
+        self.speed = self.rotation = self.rotation_speed = None
+        self.pulse = self.pulse_speed = None
+        self.type = self.alive = None
+        self.grow(capacity)
+
+        # Per-type artwork and collision data, borrowed from one Fruit each
+        self.frames = []
+        hitboxes = []
+        half_sizes = np.zeros((len(FIELD_TYPES), ROTATION_FRAMES, 2), dtype=np.int32)
+        for t, fruit_type in enumerate(FIELD_TYPES):
+            prototype = Fruit(0, 0, fruit_type, "basket", 0)
+            self.frames.append(prototype.frames)
+            hitboxes.append(prototype.hitbox_offset)
+            for f, (image, _) in enumerate(prototype.frames):
+                half_sizes[t, f] = (image.get_width() // 2, image.get_height() // 2)
+        self.hitboxes = hitboxes
+        self.half_sizes = half_sizes
+        self.hitbox_left = np.array([h.x for h in hitboxes])
+        self.hitbox_top = np.array([h.y for h in hitboxes])
+        self.hitbox_width = np.array([h.width for h in hitboxes])
+        self.hitbox_height = np.array([h.height for h in hitboxes])
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def grow(self, capacity):
+        """Resize every lane array, keeping the existing objects"""
+        old = self.capacity
+        if capacity <= old:
+            return
+
+        def resized(array, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if array is not None:
+                new[:old] = array
+            return new
+
+        self.x = resized(self.x, np.float64)
+        self.y = resized(self.y, np.float64)
+        self.prev_x = resized(self.prev_x, np.float64)
+        self.prev_y = resized(self.prev_y, np.float64)
+        self.speed = resized(self.speed, np.float64)
+        self.rotation = resized(self.rotation, np.float64)
+        self.rotation_speed = resized(self.rotation_speed, np.float64)
+        self.pulse = resized(self.pulse, np.float64)
+        self.pulse_speed = resized(self.pulse_speed, np.float64)
+        self.type = resized(self.type, np.uint8)
+        self.alive = resized(self.alive, bool)
+        # Pop from the end, so low lanes are reused first
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def spawn_many(self, xs, ys, types, speeds):
+        """Add objects; types are indexes into FIELD_TYPES. Returns their lanes"""
+        count = len(xs)
+        if count > len(self.free):
+            self.grow(max(self.capacity * 2, len(self) + count))
+        lanes = np.array([self.free.pop() for _ in range(count)], dtype=np.intp)
+        self.x[lanes] = self.prev_x[lanes] = xs
+        self.y[lanes] = self.prev_y[lanes] = ys
+        self.speed[lanes] = speeds
+        self.type[lanes] = types
+        self.rotation[lanes] = 0
+        self.rotation_speed[lanes] = self.rng.uniform(-2, 2, count)
+        self.pulse[lanes] = 0
+        self.pulse_speed[lanes] = self.rng.uniform(0.05, 0.1, count)
+        self.alive[lanes] = True
+        return lanes
+
+    def spawn(self, x, y, fruit_type, speed):
+        return self.spawn_many([x], [y], [FIELD_TYPES.index(fruit_type)], [speed])[0]
+
+    def kill(self, lanes):
+        self.alive[lanes] = False
+        self.free.extend(lanes.tolist())
+
+    def frame_indexes(self):
+        return np.rint(self.rotation * ROTATION_FRAMES / 360).astype(np.int64) % ROTATION_FRAMES
+
+    def step(self, dt=1.0, basket=None):
+        """Advance every object one tick and resolve catches and misses
+
+        Returns (caught, missed) as arrays of lane indexes; those lanes are
+        already freed. dt is the tick length in 60 Hz frames.
+        """
+        alive = self.alive
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.y += self.speed * dt
+        self.x += self.rng.integers(-1, 2, self.capacity) * np.sqrt(dt)  # random walk, as in Fruit.update
+        self.rotation += self.rotation_speed * dt
+        self.pulse += self.pulse_speed * dt
+        self.pulse[self.pulse > 1] = 0
+
+        caught = np.zeros(0, dtype=np.intp)
+        if basket is not None:
+            caught = self.catch_lanes(basket)
+            alive[caught] = False
+
+        # Off the bottom once the hitbox has left the screen
+        missed = np.flatnonzero(alive & (self.y + self.hitbox_top[self.type] > SCREEN_HEIGHT))
+        alive[caught] = True
+        self.kill(caught)
+        self.kill(missed)
+        return caught, missed
+
+    def catch_lanes(self, basket):
+        """Lanes whose fruit touched the basket this tick (swept, like collide_fruit_basket)"""
+        types = self.type
+        x0 = np.rint(self.prev_x)
+        y0 = np.rint(self.prev_y)
+        basket_x0 = round(basket.prev_x)
+        dx = (np.rint(self.x) - x0) - (round(basket.x) - basket_x0)
+        dy = np.rint(self.y) - y0
+
+        target = basket.rect.move(basket_x0 - basket.rect.centerx, 0)
+        enter_x, exit_x = sweep_axis(x0 + self.hitbox_left[types], self.hitbox_width[types], dx,
+                                     target.x, target.width)
+        enter_y, exit_y = sweep_axis(y0 + self.hitbox_top[types], self.hitbox_height[types], dy,
+                                     target.y, target.height)
+        toi = np.maximum(np.maximum(enter_x, enter_y), 0.0)
+        exit_time = np.minimum(np.minimum(exit_x, exit_y), 1.0)
+        candidates = np.flatnonzero(self.alive & (toi < exit_time))
+        if not len(candidates):
+            return candidates
+
+        # Narrow phase only for the few lanes the swept boxes let through
+        frames = self.frame_indexes()
+        caught = []
+        for lane in candidates.tolist():
+            t, f = types[lane], frames[lane]
+            mask = self.frames[t][f][1]
+            half_width, half_height = self.half_sizes[t, f]
+            if mask_contact(mask, self.hitboxes[t], int(x0[lane]) - half_width, int(y0[lane]) - half_height,
+                            dx[lane], dy[lane], toi[lane], basket, basket_x0):
+                caught.append(lane)
+        return np.array(caught, dtype=np.intp)
+
+    def draw(self, surface, alpha=None):
+        """Blit every live object with its nearest rotation frame"""
+        lanes = np.flatnonzero(self.alive)
+        if alpha is None:
+            x, y = self.x[lanes], self.y[lanes]
+        else:
+            x = self.prev_x[lanes] + (self.x[lanes] - self.prev_x[lanes]) * alpha
+            y = self.prev_y[lanes] + (self.y[lanes] - self.prev_y[lanes]) * alpha
+        types = self.type[lanes]
+        frames = self.frame_indexes()[lanes]
+        half = self.half_sizes[types, frames]
+        left = (np.rint(x) - half[:, 0]).astype(np.int64).tolist()
+        top = (np.rint(y) - half[:, 1]).astype(np.int64).tolist()
+
+        all_frames = self.frames
+        surface.blits([(all_frames[t][f][0], (l, tp))
+                       for t, f, l, tp in zip(types.tolist(), frames.tolist(), left, top)], doreturn=False)
+
+
+def sweep_axis(start, size, delta, target_start, target_size):
+    """Vectorized single-axis slab test; returns (enter, exit) times"""
+    inside = (start < target_start + target_size) & (start + size > target_start)
+    moving = delta != 0
+    safe = np.where(moving, delta, 1)
+    t0 = (target_start - (start + size)) / safe
+    t1 = (target_start + target_size - start) / safe
+    enter = np.where(moving, np.minimum(t0, t1), np.where(inside, -np.inf, np.inf))
+    exit_time = np.where(moving, np.maximum(t0, t1), np.inf)
+    return enter, exit_time
+
+
+def run_stress(count, sim_rate=60, display_fps=60, seconds=None, seed=None):
+    """Keep `count` objects falling through a FruitField and report timings
+
+    Caught and missed objects are respawned above the screen, so the load
+    stays constant. The basket sweeps back and forth on its own.
+    """
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Fruit field stress: {count} objects")
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("Arial", 20)
+    background = Background(SCREEN_WIDTH, SCREEN_HEIGHT)
+    basket = Basket(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, "basket")
+    field = FruitField(count, seed)
+    dt = 60 / sim_rate
+
+    def respawn(number):
+        rng = field.rng
+        field.spawn_many(rng.uniform(20, SCREEN_WIDTH - 20, number),
+                         rng.uniform(-SCREEN_HEIGHT, 0, number),
+                         rng.integers(0, len(FIELD_TYPES), number),
+                         rng.uniform(2, 8, number))
+
+    # Spread the first wave over the whole screen height
+    respawn(count)
+    field.y[:count] += SCREEN_HEIGHT
+    field.prev_y[:count] = field.y[:count]
+
+    step_times = []
+    draw_times = []
+    caught_total = missed_total = 0
+    frames = 0
+    start = time.perf_counter()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        if (frames // sim_rate) % 4 < 2:
+            basket.move_left(dt)
+        else:
+            basket.move_right(dt)
+
+        t0 = time.perf_counter()
+        basket.update(dt)
+        caught, missed = field.step(dt, basket)
+        respawn(len(caught) + len(missed))
+        t1 = time.perf_counter()
+        background.update(dt)
+        background.draw(screen)
+        field.draw(screen)
+        basket.draw_with_effects(screen)
+        stats = f"{len(field)} objects  step {(t1 - t0) * 1000:.2f} ms  fps {clock.get_fps():.0f}"
+        screen.blit(font.render(stats, True, (255, 255, 255)), (10, 10))
+        pygame.display.flip()
+        t2 = time.perf_counter()
+
+        step_times.append(t1 - t0)
+        draw_times.append(t2 - t1)
+        caught_total += len(caught)
+        missed_total += len(missed)
+        frames += 1
+        clock.tick(display_fps)
+        if seconds is not None and time.perf_counter() - start >= seconds:
+            running = False
+
+    wall = time.perf_counter() - start
+    step_ms = np.array(step_times) * 1000
+    draw_ms = np.array(draw_times) * 1000
+    print(f"Field stress: {count} objects, {frames} frames in {wall:.1f}s ({frames / wall:.1f} fps)")
+    print(f"  step  mean {step_ms.mean():.2f} ms  p95 {np.percentile(step_ms, 95):.2f} ms")
+    print(f"  draw  mean {draw_ms.mean():.2f} ms  p95 {np.percentile(draw_ms, 95):.2f} ms")
+    print(f"  caught {caught_total}  missed {missed_total}")
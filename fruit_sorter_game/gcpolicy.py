@@ -0,0 +1,199 @@
+"""Frame-aware garbage collection and hitch detection.
+
+Python's cyclic GC runs whenever allocation counts cross its thresholds,
+which in this game means somewhere in the middle of Game.update or
+Game.draw, in the middle of the churn from fruits, particles and
+temporary surfaces. A full (generation 2) collection walks every live
+object and can take several milliseconds.
+
+While a session is being played, FrameGC:
+
+- freezes everything that existed when the session started
+  (gc.freeze), so later collections never traverse it
+- turns automatic collection off
+- collects the young generations only in a frame's slack, after the
+  frame's work is done and before clock.tick would sleep anyway, and
+  only when that slack is large enough; generation 1 every few young
+  collections
+- forces a young collection if the allocation count runs far past the
+  threshold without any slack, so garbage cannot pile up indefinitely
+
+On the other screens the normal collector is back, and every screen
+change runs a full collection (the transition hides it).
+
+HitchDetector hooks gc.callbacks to time every collection. It records
+each frame whose work took longer than the budget, noting whether a
+collection ran in it, of which generation and for how long. The
+summary is printed when the game exits.
+
+The policy is on by default; FRUIT_GC=off leaves the collector alone and
+only detects hitches, for comparison:
+
+    FRUIT_GC=off python main.py
+"""
+import os
+import gc
+import time
+from collections import deque, namedtuple
+
+GC_ENV = "FRUIT_GC"
+
+Hitch = namedtuple("Hitch", "frame sim_time screen work_ms gc_ms generations transition")
+
+MIN_SLACK_MS = 2.0  # only collect when at least this much of the frame budget is left
+MID_EVERY = 8  # young collections between generation 1 collections
+FORCE_FACTOR = 10  # force a young collection at this many times the gen 0 threshold
+
+
+class HitchDetector:
+    def __init__(self, budget_ms, keep=200):
+        self.budget_ms = budget_ms
+        self.hitches = deque(maxlen=keep)
+        self.frames = 0
+        self.total = 0
+        self.with_gc = 0
+        self.worst = None
+        self.gc_started = 0.0
+        self.frame_gc_ms = 0.0
+        self.frame_generations = []
+        self.frame_transition = False
+        self.transitions = 0
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            gc.callbacks.append(self.on_gc)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            gc.callbacks.remove(self.on_gc)
+            self.installed = False
+
+    def on_gc(self, phase, info):
+        if phase == "start":
+            self.gc_started = time.perf_counter()
+        else:
+            self.frame_gc_ms += (time.perf_counter() - self.gc_started) * 1000
+            self.frame_generations.append(info["generation"])
+
+    def begin_frame(self):
+        self.frame_gc_ms = 0.0
+        self.frame_generations = []
+        self.frame_transition = False
+
+    def end_frame(self, work_ms, screen, sim_time):
+        """Record the frame if its work went over budget; returns the Hitch or None"""
+        self.frames += 1
+        if work_ms <= self.budget_ms:
+            return None
+        hitch = Hitch(self.frames, sim_time, screen, work_ms, self.frame_gc_ms, tuple(self.frame_generations),
+                      self.frame_transition)
+        self.hitches.append(hitch)
+        self.total += 1
+        if hitch.transition:
+            # Scene changes load and collect on purpose; count them apart
+            self.transitions += 1
+            return hitch
+        if hitch.generations:
+            self.with_gc += 1
+        if self.worst is None or work_ms > self.worst.work_ms:
+            self.worst = hitch
+        return hitch
+
+    def summary(self):
+        if not self.frames:
+            return "no frames measured"
+        text = (f"{self.total} of {self.frames} frames over {self.budget_ms:.1f} ms "
+                f"({self.transitions} at scene changes), {self.with_gc} of the rest with a GC pass")
+        if self.worst:
+            worst = self.worst
+            text += (f"; worst {worst.work_ms:.1f} ms on {worst.screen} at {worst.sim_time / 1000:.1f}s"
+                     + (f" (GC gen {max(worst.generations)}, {worst.gc_ms:.1f} ms)" if worst.generations else ""))
+        return text
+
+
+class FrameGC:
+    def __init__(self, budget_ms, managed=True):
+        self.budget_ms = budget_ms
+        self.managed = managed
+        self.hitches = HitchDetector(budget_ms)
+        self.attached = False
+        self.gameplay = False
+        self.young_collections = 0
+        self.slack_collections = 0
+        self.forced_collections = 0
+        self.slack_ms = 0.0
+
+    @classmethod
+    def from_env(cls, budget_ms):
+        return cls(budget_ms, managed=os.environ.get(GC_ENV, "") not in ("0", "off"))
+
+    def attach(self, screen):
+        """Start managing the collector (Game.run calls this)"""
+        self.attached = True
+        self.hitches.install()
+        if self.managed and screen == "game":
+            self.enter_gameplay()
+
+    def detach(self):
+        if self.gameplay:
+            self.leave_gameplay()
+        self.hitches.uninstall()
+        self.attached = False
+
+    def on_transition(self, screen):
+        """Scene change: collect fully, and switch policy on entering or leaving play"""
+        self.hitches.frame_transition = True
+        if not (self.attached and self.managed):
+            return
+        if screen == "game":
+            if self.gameplay:
+                self.leave_gameplay()
+            self.enter_gameplay()
+        elif self.gameplay:
+            self.leave_gameplay()
+        else:
+            gc.collect()
+
+    def enter_gameplay(self):
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self.gameplay = True
+
+    def leave_gameplay(self):
+        gc.unfreeze()
+        gc.enable()
+        gc.collect()
+        self.gameplay = False
+
+    def begin_frame(self):
+        self.hitches.begin_frame()
+
+    def end_frame(self, work_ms, screen, sim_time):
+        """Check the frame for a hitch, then spend its slack on young collections"""
+        self.hitches.end_frame(work_ms, screen, sim_time)
+        if not self.gameplay:
+            return
+
+        pending = gc.get_count()[0]
+        threshold = gc.get_threshold()[0]
+        if pending < threshold:
+            return
+        if self.budget_ms - work_ms >= MIN_SLACK_MS:
+            start = time.perf_counter()
+            self.young_collections += 1
+            gc.collect(1 if self.young_collections % MID_EVERY == 0 else 0)
+            self.slack_ms += (time.perf_counter() - start) * 1000
+            self.slack_collections += 1
+        elif pending >= threshold * FORCE_FACTOR:
+            gc.collect(0)
+            self.forced_collections += 1
+
+    def summary(self):
+        if not self.managed:
+            return f"GC: automatic; hitches: {self.hitches.summary()}"
+        average = self.slack_ms / self.slack_collections if self.slack_collections else 0.0
+        return (f"GC: {self.slack_collections} collections in frame slack ({average:.2f} ms each), "
+                f"{self.forced_collections} forced; hitches: {self.hitches.summary()}")
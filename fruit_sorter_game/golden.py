@@ -0,0 +1,219 @@
+"""Golden-frame checks for the renderer.
+
+Plays seeded, recorded sessions headless and captures the frame drawn
+by Game.draw at fixed ticks. Each frame is compared with a stored
+golden image and timed, so a render optimization (caching, dirty rects,
+batched blits) is checked for fidelity and speed in the same run.
+
+    python golden.py              compare against goldens/, exit 1 on a mismatch
+    python golden.py --update     re-record the sessions and golden frames
+
+Each scenario is recorded once as a replay file (goldens/<name>.nfcr)
+and played back from it afterwards, so the frames stay pinned to the
+same input even if the scripted players change. Drawing is made
+deterministic by reseeding the render random stream before each
+capture, driving the music envelope from the simulation clock and
+waiting for every music track to be decoded (so track switches happen
+on time) before the first tick.
+
+Frames are compared after a 3x3 box blur, which hides single-pixel
+anti-aliasing and sub-pixel glow shifts but not a missing sprite or a
+changed color. A frame fails when more than --max-changed of its
+pixels differ by more than --pixel-tolerance in any channel.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+# The dummy drivers must be selected before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from main import Game
+from replay import ReplayPlayer, state_digest
+from autopilot import SCRIPTS
+
+GOLDEN_DIR = "goldens"
+MANIFEST = "manifest.json"
+FAILURE_DIR = os.path.join(GOLDEN_DIR, "failures")
+
+# Tick 0 is the home screen before any input; the first click starts the session
+SCENARIOS = {
+    "normal": {"seed": 7, "mode": "normal", "script": "autopilot", "captures": [0, 90, 600, 1500]},
+    "unlimited": {"seed": 3, "mode": "unlimited", "script": "sweep", "captures": [300, 1200, 2400]},
+}
+
+PIXEL_TOLERANCE = 24
+MAX_CHANGED = 0.002
+
+
+def make_game(seed, sim_rate=None, record_path=None):
+    kwargs = {"sim_rate": sim_rate} if sim_rate else {}
+    game = Game(display_fps=0, seed=seed, record_path=record_path, **kwargs)
+    game.music.wait_decoded()
+    game.music.clock = lambda: game.sim_time
+    game.music.play_start = game.music.clock()
+    return game
+
+
+def capture(game, tick, repeats):
+    """Draw the current state; returns (pixels, best render time in ms)"""
+    best = float("inf")
+    for _ in range(repeats):
+        game.rng.render.seed(f"{game.rng.seed}:render:{tick}")
+        start = time.perf_counter()
+        game.draw()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return pygame.surfarray.array3d(game.screen), best
+
+
+def run_scenario(name, spec, update, repeats):
+    """Play a scenario, returning {tick: (pixels, render_ms)} and the final digest"""
+    replay_path = os.path.join(GOLDEN_DIR, f"{name}.nfcr")
+    captures = set(spec["captures"])
+    last = max(captures)
+    frames = {}
+
+    if update:
+        game = make_game(spec["seed"], record_path=replay_path)
+        script = SCRIPTS[spec["script"]]
+        button = game.unlimited_button if spec["mode"] == "unlimited" else game.start_button
+        feed = None
+    else:
+        player = ReplayPlayer(replay_path)
+        game = make_game(player.seed, player.sim_rate)
+        feed = player.feed
+
+    for tick in range(last + 1):
+        if tick in captures:
+            frames[tick] = capture(game, tick, repeats)
+        if tick == last:
+            break
+        if feed:
+            feed(game)
+        elif game.current_screen == "game":
+            game.input_left, game.input_right = script(game, tick)
+        else:
+            game.input_clicks.append(button.rect.center)
+        game.update()
+
+    if game.recorder:
+        game.recorder.close()
+    game.music.stop()
+    return frames, state_digest(game)
+
+
+def blur(pixels):
+    """3x3 box blur of an (w, h, 3) frame"""
+    padded = np.pad(pixels.astype(np.float32), ((1, 1), (1, 1), (0, 0)), mode="edge")
+    w, h = pixels.shape[:2]
+    total = np.zeros((w, h, 3), dtype=np.float32)
+    for dx in range(3):
+        for dy in range(3):
+            total += padded[dx:dx + w, dy:dy + h]
+    return total / 9
+
+
+def compare(pixels, golden, pixel_tolerance):
+    """Return (fraction of changed pixels, largest change, per-pixel change map)"""
+    change = np.abs(blur(pixels) - blur(golden)).max(axis=2)
+    return float(np.mean(change > pixel_tolerance)), float(change.max()), change
+
+
+def save_failure(name, tick, pixels, golden, change, pixel_tolerance):
+    """Write the frame, and a diff image with changed pixels in red, for inspection"""
+    os.makedirs(FAILURE_DIR, exist_ok=True)
+    pygame.image.save(pygame.surfarray.make_surface(pixels), os.path.join(FAILURE_DIR, f"{name}_{tick}.png"))
+    diff = (golden // 3).astype(np.uint8)
+    diff[change > pixel_tolerance] = (255, 0, 0)
+    path = os.path.join(FAILURE_DIR, f"{name}_{tick}_diff.png")
+    pygame.image.save(pygame.surfarray.make_surface(diff), path)
+    return path
+
+
+def load_manifest():
+    path = os.path.join(GOLDEN_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-frame render checks")
+    parser.add_argument("--update", action="store_true", help="re-record the sessions and golden frames")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="only run this scenario (repeatable)")
+    parser.add_argument("--repeats", type=int, default=5, help="draws per captured frame, best time is kept")
+    parser.add_argument("--pixel-tolerance", type=int, default=PIXEL_TOLERANCE,
+                        help="per-channel change (0-255) after blurring that counts as a changed pixel")
+    parser.add_argument("--max-changed", type=float, default=MAX_CHANGED,
+                        help="fraction of changed pixels a frame may have and still pass")
+    parser.add_argument("--report", metavar="PATH", help="write the per-frame results as JSON")
+    args = parser.parse_args()
+
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    manifest = load_manifest()
+    failures = 0
+    report = []
+
+    print(f"{'frame':<16} {'render ms':>9} {'golden ms':>9} {'speedup':>8} {'changed':>8} {'max':>5}  result")
+    for name in args.scenario or sorted(SCENARIOS):
+        frames, digest = run_scenario(name, SCENARIOS[name], args.update, args.repeats)
+        entry = manifest.get(name, {})
+
+        if args.update:
+            entry = {"digest": digest, "frames": {}}
+            for tick, (pixels, render_ms) in sorted(frames.items()):
+                image = f"{name}_{tick}.png"
+                pygame.image.save(pygame.surfarray.make_surface(pixels), os.path.join(GOLDEN_DIR, image))
+                entry["frames"][str(tick)] = {"image": image, "render_ms": round(render_ms, 3)}
+                print(f"{name + ' @' + str(tick):<16} {render_ms:>9.2f} {'':>9} {'':>8} {'':>8} {'':>5}  saved")
+            manifest[name] = entry
+            continue
+
+        if digest != entry.get("digest"):
+            print(f"{name}: replay ended in state {digest}, goldens were recorded at {entry.get('digest')}")
+        for tick, (pixels, render_ms) in sorted(frames.items()):
+            label = f"{name} @{tick}"
+            golden_entry = entry.get("frames", {}).get(str(tick))
+            if golden_entry is None:
+                print(f"{label:<16} {render_ms:>9.2f}  no golden frame, run with --update")
+                failures += 1
+                continue
+            golden = pygame.surfarray.array3d(pygame.image.load(os.path.join(GOLDEN_DIR, golden_entry["image"])))
+            changed, largest, change = compare(pixels, golden, args.pixel_tolerance)
+            passed = changed <= args.max_changed
+            result = "ok"
+            if not passed:
+                failures += 1
+                result = "FAIL -> " + save_failure(name, tick, pixels, golden, change, args.pixel_tolerance)
+            golden_ms = golden_entry["render_ms"]
+            print(f"{label:<16} {render_ms:>9.2f} {golden_ms:>9.2f} {golden_ms / render_ms:>7.2f}x "
+                  f"{changed:>8.2%} {largest:>5.0f}  {result}")
+            report.append({"scenario": name, "tick": tick, "render_ms": render_ms, "golden_render_ms": golden_ms,
+                           "changed_fraction": changed, "max_change": largest, "passed": passed})
+
+    if args.update:
+        with open(os.path.join(GOLDEN_DIR, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Golden frames saved to {GOLDEN_DIR}/")
+        return 0
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    if failures:
+        print(f"{failures} frame(s) differ from the goldens")
+        return 1
+    print("All frames match the goldens")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
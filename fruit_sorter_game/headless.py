@@ -0,0 +1,137 @@
+"""Run the game simulation headless, as fast as possible.
+
+Uses SDL's dummy video and audio drivers, never draws and never waits on
+the frame clock, so Game.update runs back to back. Input comes from a
+scripted player instead of the keyboard, or from a recorded replay.
+
+    python headless.py --mode unlimited --seconds 300 --script autopilot
+    python headless.py --replay session.nfcr
+"""
+import os
+import sys
+import time
+import argparse
+
+# The dummy drivers must be selected before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from main import Game, SIM_RATE
+from rng import seed_arg
+from replay import ReplayPlayer, state_digest
+from pipeline import measure_throughput
+from autopilot import SCRIPTS
+
+
+def run_headless(game, mode, ticks, script):
+    """Simulate `ticks` ticks, starting a new session after each game over
+
+    Sessions are started by clicking the mode's button, so a recording of
+    the run replays exactly. Returns a dict with the run statistics.
+    """
+    sessions = 0
+    scores = []
+    button = game.unlimited_button if mode == "unlimited" else game.start_button
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if game.current_screen == "game":
+            game.input_left, game.input_right = script(game, tick)
+        else:
+            if sessions:
+                scores.append(game.score)
+            game.input_clicks.append(button.rect.center)
+            sessions += 1
+        game.update()
+    wall = time.perf_counter() - start
+    if sessions:
+        scores.append(game.score)
+
+    sim_seconds = ticks / game.sim_rate
+    return {
+        "ticks": ticks,
+        "sim_seconds": sim_seconds,
+        "wall_seconds": wall,
+        "speedup": sim_seconds / wall if wall > 0 else float("inf"),
+        "ticks_per_second": ticks / wall if wall > 0 else float("inf"),
+        "sessions": sessions,
+        "scores": scores,
+    }
+
+
+def run_replay(game, player):
+    """Play a recorded session back at full speed"""
+    start = time.perf_counter()
+    while not player.finished():
+        player.feed(game)
+        game.update()
+    wall = time.perf_counter() - start
+
+    sim_seconds = player.tick_count / game.sim_rate
+    return {
+        "ticks": player.tick_count,
+        "sim_seconds": sim_seconds,
+        "wall_seconds": wall,
+        "speedup": sim_seconds / wall if wall > 0 else float("inf"),
+        "ticks_per_second": player.tick_count / wall if wall > 0 else float("inf"),
+        "sessions": None,
+        "scores": [getattr(game, "score", 0)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless game simulation")
+    parser.add_argument("--mode", choices=["normal", "unlimited"], default="normal")
+    parser.add_argument("--seconds", type=float, default=120, help="simulated seconds to run")
+    parser.add_argument("--sim-rate", type=int, default=SIM_RATE, help="simulation ticks per second")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="autopilot", help="scripted player")
+    parser.add_argument("--seed", type=seed_arg, help="seed for all gameplay randomness")
+    parser.add_argument("--record", metavar="PATH", help="record the run to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a replay file instead of a script")
+    parser.add_argument("--pipeline-bench", type=int, metavar="FRAMES",
+                        help="compare sequential and pipelined update+draw throughput on this machine")
+    args = parser.parse_args()
+
+    if args.pipeline_bench:
+        game = Game(sim_rate=args.sim_rate, display_fps=0, seed=args.seed)
+        # Warm up into a busy session first so there is something to draw
+        run_headless(game, args.mode, 5 * args.sim_rate, SCRIPTS[args.script])
+        result = measure_throughput(game, args.pipeline_bench)
+        print(f"Sequential: {result['sequential_fps']:.0f} frames/s")
+        print(f"Pipelined:  {result['pipelined_fps']:.0f} frames/s ({result['speedup']:.2f}x, {os.cpu_count()} CPUs)")
+        game.music.stop()
+        return 0
+
+    if args.replay:
+        player = ReplayPlayer(args.replay)
+        game = Game(sim_rate=player.sim_rate, display_fps=0, seed=player.seed)
+        stats = run_replay(game, player)
+    else:
+        game = Game(sim_rate=args.sim_rate, display_fps=0, seed=args.seed, record_path=args.record)
+        ticks = int(args.seconds * args.sim_rate)
+        stats = run_headless(game, args.mode, ticks, SCRIPTS[args.script])
+        if game.recorder:
+            game.recorder.close()
+
+    print(f"Simulated {stats['sim_seconds']:.1f}s ({stats['ticks']} ticks) in {stats['wall_seconds']:.2f}s wall")
+    print(f"Speed: {stats['speedup']:.1f} simulated seconds per wall second, {stats['ticks_per_second']:.0f} ticks/s")
+    if stats["sessions"] is not None:
+        print(f"Sessions: {stats['sessions']}  scores: {stats['scores']}")
+    print(f"Seed: {game.rng.seed}  final state: {state_digest(game)}")
+    if hasattr(game, "score"):
+        stats = game.stats
+        print(f"Last session: caught {sum(stats.catches.values())} {stats.catches}, missed {stats.misses}, "
+              f"bombs {stats.bombs}, most catches in one tick {stats.busiest_tick}")
+    spawn = game.spawn_stats
+    if spawn["fruits"]:
+        print(f"Spawns: {spawn['fruits']} fruits in {spawn['drops']} drops, "
+              f"{spawn['spawn_ms'] * 1000 / spawn['fruits']:.0f} us per fruit, "
+              f"worst tick {spawn['worst_tick_fruits']} fruits / {spawn['worst_tick_ms']:.2f} ms")
+    for stats in game.pool_stats():
+        print(f"Pool {stats['name']}: {stats['size']} objects, high water {stats['high_water']}")
+    game.music.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
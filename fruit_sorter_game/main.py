@@ -3,6 +3,28 @@ import sys
 import random
 import os
 import math
+import time
+import bisect
+import argparse
+from rng import RandomStreams, seed_arg
+from screen import SCREEN_WIDTH, SCREEN_HEIGHT
+from replay import ReplayRecorder
+from snapshot import RewindBuffer
+from pipeline import RenderPipeline
+from perf_hud import PerfHud, new_surface, render_text
+from profiling import SessionProfiler
+from tracing import tracer
+from sampler import StackSampler
+from gcpolicy import FrameGC
+import memtrack
+from broadphase import SpatialHash
+from collision import collide_fruit_basket
+from pool import Pool
+from scheduler import Scheduler
+from patterns import PatternLibrary, load_patterns
+from events import EventBus, AudioEffects, ParticleEffects, GameStats, Catch, Miss, Bomb, Milestone, GameOver
+from fruit_field import run_stress as run_field_stress
+import stress
 from sprites import Fruit, Basket, Conveyor, Button, ParticleSystem, Background
 from sound_effects import SoundEffects
 from music import BackgroundMusic
@@ -11,9 +33,12 @@ from music import BackgroundMusic
 pygame.init()
 
 # Game constants
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # Display frame rate (0 = uncapped)
+SIM_RATE = 60  # Simulation ticks per second
+BASE_RATE = 60  # Rate all per-tick speeds and lifetimes are tuned for
+MAX_SIM_STEPS = 8  # Catch-up ticks allowed per frame before dropping time
+MAX_FRAME_SKIP = 4  # Consecutive frames that may skip drawing under load
+MAX_FRAME_TIME = 0.25  # Longest frame fed into the accumulator (seconds)
 GAME_TITLE = "NEON FRUIT CATCHER"
 
 # Enhanced colors (neon retro style)
@@ -29,18 +54,61 @@ NEON_PINK = (255, 100, 200)
 NEON_CYAN = (60, 255, 255)
 
 class Game:
-    def __init__(self):
+    def __init__(self, sim_rate=SIM_RATE, display_fps=FPS, seed=None, record_path=None, rewind_seconds=0,
+                 pipelined=False):
+        # Per-scene memory accounting (FRUIT_MEMTRACK=1); traces from here on
+        self.memtrack = memtrack.MemTracker() if memtrack.enabled() else None
+        
         # Set up the display
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_TITLE)
         self.clock = pygame.time.Clock()
         
+        # Fixed simulation timestep, independent of the display rate
+        self.sim_rate = sim_rate
+        self.display_fps = display_fps
+        self.tick_dt = BASE_RATE / sim_rate  # Tick length in 60 Hz frames
+        self.tick_ms = 1000 / sim_rate
+        self.sim_time = 0  # Simulated milliseconds since start
+        
+        # Timed events (spawns, time limits, music fades) on the sim clock
+        self.scheduler = Scheduler()
+        
+        # Spawn patterns, compiled into per-tick timelines for this tick rate
+        self.patterns = PatternLibrary(load_patterns(), self.tick_ms)
+        self.spawn_stats = {"drops": 0, "fruits": 0, "plan_ms": 0.0, "spawn_ms": 0.0,
+                            "worst_tick_ms": 0.0, "worst_tick_fruits": 0}
+        
+        # Seeded random streams for every gameplay subsystem
+        self.rng = RandomStreams(seed)
+        
+        # Input for the next tick: held keys are sampled once per frame,
+        # clicks and escape are queued until a tick consumes them
+        self.input_left = False
+        self.input_right = False
+        self.input_clicks = []
+        self.input_escape = False
+        
+        # Optional per-tick input recording for bit-exact replays
+        self.recorder = None
+        if record_path:
+            self.recorder = ReplayRecorder(record_path, self.rng.seed, sim_rate)
+        
+        # Optional debug rewind buffer (Backspace jumps back 5 seconds)
+        self.rewind = None
+        if rewind_seconds:
+            self.rewind = RewindBuffer(rewind_seconds, sim_rate)
+        
+        # Optional render thread drawing one frame behind the simulation
+        self.pipelined = pipelined
+        
         # Load sound effects
         self.sound_fx = SoundEffects()
         
         # Load background music
-        self.music = BackgroundMusic()
+        self.music = BackgroundMusic(scheduler=self.scheduler)
         self.music.fade_in(2000)  # Fade in over 2 seconds
+        self.music_pulse = None
         
         # Game state
         self.running = True
@@ -64,15 +132,37 @@ class Game:
             self.title_font = pygame.font.Font(None, 72)
         
         # Create particle system
-        self.particles = ParticleSystem()
+        self.particles = ParticleSystem(self.rng.particles)
+        
+        # Frame timing overlay (F3) and cProfile captures (F9)
+        self.perf_hud = PerfHud(SCREEN_WIDTH - 250, 110)
+        self.profiler = SessionProfiler()
+        
+        # Stack sampling with hitch captures (FRUIT_SAMPLE=<hz>)
+        self.sampler = StackSampler.from_env()
+        
+        # Garbage collection kept out of gameplay frames, and hitch detection
+        self.gc_policy = FrameGC.from_env(1000 / (display_fps or FPS))
+        
+        # Falling fruits and bombs are recycled between spawns and sessions
+        self.fruit_pool = Pool(Fruit)
+        
+        # Gameplay events, turned into sounds, particles and stats once per tick
+        self.events = EventBus()
+        AudioEffects(self.events, self.sound_fx)
+        ParticleEffects(self.events, self.particles, self.rng.particles)
+        self.stats = GameStats(self.events)
         
         # Create background
-        self.background = Background(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.background = Background(SCREEN_WIDTH, SCREEN_HEIGHT, self.rng.background, self.rng.render)
         
         # Preload fruit images for decorative purposes
         self.fruit_types = ["apple", "banana", "orange", "star_fruit", "blueberry"]
         self.decorative_fruits = []
         self.create_decorative_fruits()
+        
+        if self.memtrack:
+            self.memtrack.start(self)
     
     def create_decorative_fruits(self):
         """Create decorative fruits for the home screen with bouncing behavior"""
@@ -89,13 +179,13 @@ class Game:
         
         for i, pos in enumerate(positions):
             fruit_type = fruit_types[i]
-            fruit = Fruit(pos[0], pos[1], fruit_type, "basket", 0)
+            fruit = Fruit(pos[0], pos[1], fruit_type, "basket", 0, self.rng.fruit)
             
             # Add bounce properties
-            fruit.bounce_speed_x = random.uniform(-2, 2)
-            fruit.bounce_speed_y = random.uniform(-2, 2)
-            fruit.bounce_amplitude = random.uniform(0.5, 1.5)
-            fruit.bounce_offset = random.uniform(0, math.pi * 2)
+            fruit.bounce_speed_x = self.rng.fruit.uniform(-2, 2)
+            fruit.bounce_speed_y = self.rng.fruit.uniform(-2, 2)
+            fruit.bounce_amplitude = self.rng.fruit.uniform(0.5, 1.5)
+            fruit.bounce_offset = self.rng.fruit.uniform(0, math.pi * 2)
             fruit.original_pos = pos
             
             self.decorative_fruits.append(fruit)
@@ -143,7 +233,7 @@ class Game:
     
     def start_new_game(self, mode="normal"):
         # Game state
-        self.current_screen = "game"
+        self.set_screen("game")
         self.game_over = False
         self.score = 0
         self.lives = 3
@@ -153,34 +243,40 @@ class Game:
         
         # Timer for unlimited mode
         self.unlimited_timer = 55 * 1000  # 55 seconds in milliseconds
-        self.timer_start_time = pygame.time.get_ticks()
+        self.timer_start_time = self.sim_time
+        
+        # Return the previous session's fruits to the pool
+        if hasattr(self, "fruits"):
+            for fruit in list(self.fruits):
+                self.remove_fruit(fruit)
         
         # Create sprite groups
         self.all_sprites = pygame.sprite.Group()
         self.fruits = pygame.sprite.Group()
         self.baskets = pygame.sprite.Group()
         
+        # Broadphase grid of falling objects, queried per basket
+        self.grid = SpatialHash(cell_size=64)
+        
         # Create single basket
         self.basket = Basket(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, "basket")
         self.all_sprites.add(self.basket)
         self.baskets.add(self.basket)
         
-        # Game timers
-        self.fruit_spawn_timer = 0
+        # Game timers (first spawns are measured from the start of the clock)
         self.fruit_spawn_delay = 2000  # Increased delay for easier gameplay
-        self.next_fruit_spawn = random.randint(1000, 2000)  # More predictable timing
+        first_fruit = self.rng.spawn.randint(1000, 2000)  # More predictable timing
         
         # Bomb timer
-        self.bomb_spawn_timer = 0
         self.bomb_spawn_delay = 1500  # Increased delay for bombs
-        self.next_bomb_spawn = random.randint(1000, 2000)  # More predictable timing
+        first_bomb = self.rng.spawn.randint(1000, 2000)  # More predictable timing
         
         # Game start time
-        self.game_start_time = pygame.time.get_ticks()
+        self.game_start_time = self.sim_time
         
         # Fruit spawn pattern variables
         self.fruit_pattern = "single"  # Start with single fruit
-        self.pattern_change_timer = 0
+        self.pending_spawns = []  # (due time, x, fruit type, speed), sorted by due time
         self.pattern_change_delay = 15000  # Change pattern less frequently (15 seconds)
         
         # Milestone tracking
@@ -198,103 +294,176 @@ class Game:
             self.fruits_per_drop = 1  # Start with 1 fruit at a time in normal mode
             self.max_fruits_per_drop = 6
         
-        # Clear particles
-        self.particles = ParticleSystem()
+        # Clear particles and the previous session's counts
+        self.particles.clear()
+        self.stats.reset()
+        
+        self.schedule_session(first_fruit, first_bomb, self.pattern_change_delay)
+    
+    def schedule_session(self, fruit_due, bomb_due, pattern_due):
+        """(Re)arm the spawn, pattern change and time limit events of a session"""
+        self.scheduler.cancel_group("session")
+        self.fruit_spawn_event = self.scheduler.at(fruit_due, self.on_fruit_spawn, group="session")
+        self.bomb_spawn_event = self.scheduler.at(bomb_due, self.on_bomb_spawn, group="session")
+        self.pattern_event = self.scheduler.at(pattern_due, self.on_pattern_change,
+                                               interval=self.pattern_change_delay, group="session")
+        self.time_up_event = None
+        if self.game_mode == "unlimited":
+            self.time_up_event = self.scheduler.at(self.timer_start_time + self.unlimited_timer, self.on_time_up,
+                                                   group="session")
+    
+    def end_game(self, color=NEON_RED, bursts=20):
+        """Stop the session and return to the home screen after 2 seconds"""
+        self.game_over = True
+        self.game_over_time = self.sim_time
+        self.schedule_return_home()
+        self.events.emit(GameOver(color, bursts))
+    
+    def schedule_return_home(self):
+        """Replace the session events with the return to the home screen"""
+        self.scheduler.cancel_group("session")
+        self.scheduler.at(self.game_over_time + 2000, self.set_screen, "home", group="session")
     
     def spawn_fruit(self, x=None, speed_modifier=1.0):
+        fruit_type = self.roll_fruit_type()
+        
+        # Create the fruit at a random x position at the top of the screen if not specified
+        if x is None:
+            x = self.rng.spawn.randint(SCREEN_WIDTH // 6, 5 * SCREEN_WIDTH // 6)
+        
+        return self.drop_fruit(x, fruit_type, self.roll_fruit_speed(speed_modifier))
+    
+    def roll_fruit_type(self):
         # Fruit types without bombs (bombs are spawned separately)
         fruit_types = ["apple", "banana", "orange", "star_fruit", "blueberry"]
         weights = [25, 25, 25, 15, 15]
         
         # Randomly select a fruit type based on weights
-        fruit_type = random.choices(fruit_types, weights=weights, k=1)[0]
-        
-        # Create the fruit at a random x position at the top of the screen if not specified
-        if x is None:
-            x = random.randint(SCREEN_WIDTH // 6, 5 * SCREEN_WIDTH // 6)
-        
+        return self.rng.spawn.choices(fruit_types, weights=weights, k=1)[0]
+    
+    def roll_fruit_speed(self, speed_modifier=1.0):
         # Add minimal randomness to the speed for more predictable gameplay
-        speed = self.fruit_speed * speed_modifier * random.uniform(0.9, 1.1)
-        
-        new_fruit = Fruit(x, 0, fruit_type, "basket", speed)
-        self.all_sprites.add(new_fruit)
-        self.fruits.add(new_fruit)
+        return self.fruit_speed * speed_modifier * self.rng.spawn.uniform(0.9, 1.1)
+    
+    def drop_fruit(self, x, fruit_type, speed):
+        new_fruit = self.fruit_pool.acquire(x, 0, fruit_type, "basket", speed, self.rng.fruit)
+        self.add_fruit(new_fruit)
         return new_fruit
     
     def spawn_bomb(self, x=None):
         # Create a bomb at a random x position at the top of the screen if not specified
         if x is None:
-            x = random.randint(SCREEN_WIDTH // 6, 5 * SCREEN_WIDTH // 6)
+            x = self.rng.spawn.randint(SCREEN_WIDTH // 6, 5 * SCREEN_WIDTH // 6)
         
         # Slightly randomize bomb speed
-        bomb_speed = self.fruit_speed * 1.1 * random.uniform(0.95, 1.05)  # Less variation
+        bomb_speed = self.fruit_speed * 1.1 * self.rng.spawn.uniform(0.95, 1.05)  # Less variation
         
-        new_bomb = Fruit(x, 0, "bomb", "basket", bomb_speed)
-        self.all_sprites.add(new_bomb)
-        self.fruits.add(new_bomb)
+        new_bomb = self.fruit_pool.acquire(x, 0, "bomb", "basket", bomb_speed, self.rng.fruit)
+        self.add_fruit(new_bomb)
         
         # Play spawn sound for bombs (with 50% chance to reduce sound spam)
-        if random.random() > 0.5:
+        if self.rng.spawn.random() > 0.5:
             self.sound_fx.play("spawn_bomb")
         
         return new_bomb
     
+    def add_fruit(self, fruit):
+        """Put a falling object into play"""
+        self.all_sprites.add(fruit)
+        self.fruits.add(fruit)
+        self.grid.insert(fruit, fruit.sweep_rect)
+    
+    def remove_fruit(self, fruit):
+        """Take a falling object out of play"""
+        fruit.kill()
+        self.grid.remove(fruit)
+        self.fruit_pool.release(fruit)
+    
+    def on_pattern_change(self):
+        """Switch to a random spawn pattern (repeats every pattern_change_delay)"""
+        self.fruit_pattern = self.rng.spawn.choice(self.patterns.rotation())
+        
+        # Add visual effect for pattern change
+        color = self.patterns.color(self.fruit_pattern, NEON_CYAN)
+        
+        # Add particles at the top of the screen to indicate pattern change
+        for _ in range(20):
+            self.particles.add_particles(
+                self.rng.particles.randint(0, SCREEN_WIDTH),
+                self.rng.particles.randint(0, 50),
+                color, 15
+            )
+    
+    def on_fruit_spawn(self):
+        """Drop the current pattern and schedule the next drop"""
+        self.spawn_fruit_pattern(self.fruit_pattern)
+        # More predictable spawn timing
+        delay = self.rng.spawn.randint(
+            max(1000, self.fruit_spawn_delay - 300),
+            self.fruit_spawn_delay + 200
+        )
+        self.fruit_spawn_event = self.scheduler.after(delay, self.on_fruit_spawn, group="session")
+    
+    def on_bomb_spawn(self):
+        """Maybe drop a bomb and schedule the next chance"""
+        # 60% chance to spawn a bomb
+        if self.rng.spawn.random() < 0.6:
+            self.spawn_bomb()
+        
+        # More predictable bomb spawn timing
+        delay = self.rng.spawn.randint(
+            max(1000, self.bomb_spawn_delay - 200),
+            self.bomb_spawn_delay + 500
+        )
+        self.bomb_spawn_event = self.scheduler.after(delay, self.on_bomb_spawn, group="session")
+    
+    def on_time_up(self):
+        """End an unlimited mode session when its timer runs out"""
+        self.end_game(NEON_YELLOW)
+    
+    def pool_stats(self):
+        """Size and high-water mark of each entity pool"""
+        return [self.fruit_pool.stats(), self.particles.particle_pool.stats(),
+                self.particles.crackle_pool.stats()]
+    
     def spawn_fruit_pattern(self, pattern_type="single"):
-        """Spawn fruits in different patterns"""
+        """Queue a drop of fruits in one of the spawn patterns"""
+        start = time.perf_counter()
+        
         # Limit the number of fruits based on current progression
         max_fruits = min(self.fruits_per_drop, self.max_fruits_per_drop)
         
         # In unlimited mode, add some randomness to the number of fruits
-        if self.game_mode == "unlimited" and random.random() < 0.3:  # 30% chance for bonus fruits
-            max_fruits += random.randint(1, 3)  # Add 1-3 extra fruits randomly
+        if self.game_mode == "unlimited" and self.rng.spawn.random() < 0.3:  # 30% chance for bonus fruits
+            max_fruits += self.rng.spawn.randint(1, 3)  # Add 1-3 extra fruits randomly
         
-        if pattern_type == "single" or max_fruits == 1:
-            # Just spawn a single fruit
-            x = random.randint(SCREEN_WIDTH // 6, 5 * SCREEN_WIDTH // 6)
-            self.spawn_fruit(x)
-            
-        elif pattern_type == "wave" and max_fruits >= 3:
-            # Spawn fruits in a wave pattern (simplified)
-            base_x = random.randint(SCREEN_WIDTH // 4, 3 * SCREEN_WIDTH // 4)
-            for i in range(min(max_fruits, 6)):  # Maximum 6 fruits in wave pattern
-                x = (base_x + i * 80) % SCREEN_WIDTH  # Increased spacing
-                self.spawn_fruit(x)
-        
-        elif pattern_type == "cluster" and max_fruits >= 2:
-            # Spawn a tight cluster of fruits (simplified)
-            center_x = random.randint(SCREEN_WIDTH // 3, 2 * SCREEN_WIDTH // 3)
-            for _ in range(min(max_fruits, 5)):  # Maximum 5 fruits in cluster
-                x = center_x + random.randint(-60, 60)
-                x = max(50, min(SCREEN_WIDTH - 50, x))  # Keep within screen bounds
-                self.spawn_fruit(x)
-        
-        elif pattern_type == "random":
-            # Spawn random fruits (simplified)
-            num_fruits = random.randint(1, max_fruits)
-            for _ in range(num_fruits):
-                self.spawn_fruit()
-        
-        elif pattern_type == "alternating" and max_fruits >= 2:
-            # Spawn fruits alternating from left to right (simplified)
-            sections = min(5, max_fruits)  # Maximum 5 sections
-            section_width = SCREEN_WIDTH / sections
-            for i in range(sections):
-                if i % 2 == 0 or max_fruits > 3:  # Only spawn in alternating sections unless we have enough fruits
-                    x = i * section_width + random.randint(0, int(section_width))
-                    self.spawn_fruit(x)
-        
-        elif pattern_type == "corners" and max_fruits >= 2:
-            # Spawn fruits at the edges and middle (simplified)
-            positions = [SCREEN_WIDTH // 6, SCREEN_WIDTH // 3, SCREEN_WIDTH // 2, 
-                        2 * SCREEN_WIDTH // 3, 5 * SCREEN_WIDTH // 6]
-            positions = positions[:max_fruits]  # Limit based on max fruits
-            for x in positions:
-                self.spawn_fruit(x)
+        # Everything random is decided now, so pending spawns are plain data
+        for tick, x, speed_modifier, fruit_type in self.patterns.roll(pattern_type, max_fruits, self.rng.spawn):
+            fruit_type = fruit_type or self.roll_fruit_type()
+            speed = self.roll_fruit_speed(speed_modifier)
+            bisect.insort(self.pending_spawns, (self.sim_time + tick * self.tick_ms, x, fruit_type, speed))
         
-        else:
-            # Default to single fruit if pattern doesn't match or not enough fruits
-            x = random.randint(SCREEN_WIDTH // 6, 5 * SCREEN_WIDTH // 6)
-            self.spawn_fruit(x)
+        self.spawn_stats["drops"] += 1
+        self.spawn_stats["plan_ms"] += (time.perf_counter() - start) * 1000
+    
+    def spawn_pending(self):
+        """Spawn the queued fruits that are due this tick"""
+        pending = self.pending_spawns
+        if not pending or pending[0][0] > self.sim_time:
+            return
+        start = time.perf_counter()
+        count = 0
+        while pending and pending[0][0] <= self.sim_time:
+            _, x, fruit_type, speed = pending.pop(0)
+            self.drop_fruit(x, fruit_type, speed)
+            count += 1
+        
+        elapsed = (time.perf_counter() - start) * 1000
+        stats = self.spawn_stats
+        stats["fruits"] += count
+        stats["spawn_ms"] += elapsed
+        stats["worst_tick_ms"] = max(stats["worst_tick_ms"], elapsed)
+        stats["worst_tick_fruits"] = max(stats["worst_tick_fruits"], count)
     
     def handle_events(self):
         for event in pygame.event.get():
@@ -304,66 +473,101 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     if self.current_screen == "game":
-                        self.current_screen = "home"
+                        self.input_escape = True
                     else:
                         self.running = False
                 
                 # Mute/unmute with M key
                 if event.key == pygame.K_m:
                     self.toggle_mute()
-            
-            # Handle mouse clicks
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # Add crackle effect at mouse position for any click
-                self.particles.add_crackle(event.pos[0], event.pos[1])
                 
-                if self.current_screen == "home" or self.current_screen == "game":
-                    # Check if mute button was clicked
-                    if self.mute_button.is_clicked(event.pos):
-                        self.toggle_mute()
+                # Toggle the performance overlay
+                if event.key == pygame.K_F3:
+                    self.perf_hud.toggle()
                 
-                if self.current_screen == "home":
-                    # Check if start button was clicked
-                    if self.start_button.is_clicked(event.pos):
-                        self.sound_fx.play("correct")
-                        # Add particles at click position
-                        self.particles.add_particles(event.pos[0], event.pos[1], NEON_GREEN, 20)
-                        self.start_new_game(mode="normal")
-                    
-                    # Check if unlimited button was clicked
-                    if self.unlimited_button.is_clicked(event.pos):
-                        self.sound_fx.play("correct")
-                        # Add particles at click position
-                        self.particles.add_particles(event.pos[0], event.pos[1], NEON_PURPLE, 20)
-                        self.start_new_game(mode="unlimited")
-                    
-                    # Check if info button was clicked
-                    if self.info_button.is_clicked(event.pos):
-                        self.sound_fx.play("correct")
-                        # Add particles at click position
-                        self.particles.add_particles(event.pos[0], event.pos[1], NEON_BLUE, 20)
-                        self.current_screen = "info"
+                # Start or stop a cProfile capture
+                if event.key == pygame.K_F9:
+                    self.profiler.toggle(self)
                 
-                elif self.current_screen == "info":
-                    # Any click returns to home screen
-                    self.sound_fx.play("correct")
-                    # Add particles at click position
-                    self.particles.add_particles(event.pos[0], event.pos[1], NEON_BLUE, 20)
-                    self.current_screen = "home"
+                # Start or stop tracing, exporting the trace on stop
+                if event.key == pygame.K_F10:
+                    tracer.toggle()
+                
+                # Rewind the last 5 seconds (debug, not while recording)
+                if event.key == pygame.K_BACKSPACE and self.rewind and not self.recorder:
+                    self.rewind.rewind(self, 5)
             
-            # Handle music fade events
-            elif event.type == pygame.USEREVENT + 1:
-                self.music.update_fade()
-            elif event.type == pygame.USEREVENT + 2:
-                self.music.update_fade_out()
+            # Queue mouse clicks for the next simulation tick
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.input_clicks.append(event.pos)
         
-        # Check for continuous key presses for basket movement (only in game screen)
-        if self.current_screen == "game":
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_a]:  # A key for left movement
-                self.basket.move_left()
-            if keys[pygame.K_d]:  # D key for right movement
-                self.basket.move_right()
+        # Sample held keys for basket movement; update() applies them every tick
+        keys = pygame.key.get_pressed()
+        self.input_left = keys[pygame.K_a]  # A key for left movement
+        self.input_right = keys[pygame.K_d]  # D key for right movement
+    
+    def apply_input(self):
+        """Record and consume the queued input at the start of a tick"""
+        if self.recorder:
+            self.recorder.record(self.input_left, self.input_right, self.input_clicks, self.input_escape)
+        
+        if self.input_escape and self.current_screen == "game":
+            self.set_screen("home")
+        for pos in self.input_clicks:
+            self.handle_click(pos)
+        
+        self.input_clicks = []
+        self.input_escape = False
+    
+    def handle_click(self, pos):
+        # Add crackle effect at mouse position for any click
+        self.particles.add_crackle(pos[0], pos[1])
+        
+        if self.current_screen == "home" or self.current_screen == "game":
+            # Check if mute button was clicked
+            if self.mute_button.is_clicked(pos):
+                self.toggle_mute()
+        
+        if self.current_screen == "home":
+            # Check if start button was clicked
+            if self.start_button.is_clicked(pos):
+                self.sound_fx.play("correct")
+                # Add particles at click position
+                self.particles.add_particles(pos[0], pos[1], NEON_GREEN, 20)
+                self.start_new_game(mode="normal")
+            
+            # Check if unlimited button was clicked
+            if self.unlimited_button.is_clicked(pos):
+                self.sound_fx.play("correct")
+                # Add particles at click position
+                self.particles.add_particles(pos[0], pos[1], NEON_PURPLE, 20)
+                self.start_new_game(mode="unlimited")
+            
+            # Check if info button was clicked
+            if self.info_button.is_clicked(pos):
+                self.sound_fx.play("correct")
+                # Add particles at click position
+                self.particles.add_particles(pos[0], pos[1], NEON_BLUE, 20)
+                self.set_screen("info")
+        
+        elif self.current_screen == "info":
+            # Any click returns to home screen
+            self.sound_fx.play("correct")
+            # Add particles at click position
+            self.particles.add_particles(pos[0], pos[1], NEON_BLUE, 20)
+            self.set_screen("home")
+    
+    def set_screen(self, screen):
+        """Change the current screen and crossfade to its music track"""
+        previous = self.current_screen
+        self.current_screen = screen
+        if self.memtrack and screen != previous:
+            self.memtrack.on_transition(self, previous, screen)
+        if screen != previous:
+            self.gc_policy.on_transition(screen)
+        self.music.switch_to("game" if screen == "game" else "home")
+        if screen != "game":
+            self.scheduler.cancel_group("session")
     
     def toggle_mute(self):
         """Toggle mute/unmute for all sounds"""
@@ -379,28 +583,45 @@ class Game:
             self.mute_button.text = "speaker"
     
     def update(self):
+        """Advance the simulation by one fixed tick"""
+        self.simulate()
+        
+        # Play the tick's gameplay effects, coalesced per event type
+        self.events.dispatch()
+    
+    def simulate(self):
+        self.sim_time += self.tick_ms
+        dt = self.tick_dt
+        self.scheduler.run_due(self.sim_time)
+        self.apply_input()
+        if self.rewind:
+            self.rewind.tick(self)
+        
+        # Finish any music switch whose track has finished decoding
+        self.music.update()
+        
         # Update background
-        self.background.update()
+        self.background.update(dt)
         
         # Update particles
-        self.particles.update()
+        self.particles.update(dt)
         
         if self.current_screen == "home" or self.current_screen == "info":
             # Update button hover state
             mouse_pos = pygame.mouse.get_pos()
-            self.start_button.update(mouse_pos)
+            self.start_button.update(mouse_pos, dt)
             
             # Update info button hover state
             if self.current_screen == "home":
-                self.info_button.update(mouse_pos)
-                self.unlimited_button.update(mouse_pos)
-                self.mute_button.update(mouse_pos)
+                self.info_button.update(mouse_pos, dt)
+                self.unlimited_button.update(mouse_pos, dt)
+                self.mute_button.update(mouse_pos, dt)
             
             # Animate and bounce decorative fruits
-            current_time = pygame.time.get_ticks() / 1000.0  # Convert to seconds for smoother animation
+            current_time = self.sim_time / 1000.0  # Convert to seconds for smoother animation
             for fruit in self.decorative_fruits:
                 # Basic rotation and pulse animation
-                fruit.update()
+                fruit.update(dt)
                 
                 # Bouncing motion
                 if hasattr(fruit, 'original_pos') and hasattr(fruit, 'bounce_speed_x'):
@@ -427,164 +648,67 @@ class Game:
         # Update mute button in game screen
         if self.current_screen == "game":
             mouse_pos = pygame.mouse.get_pos()
-            self.mute_button.update(mouse_pos)
+            self.mute_button.update(mouse_pos, dt)
         
         if self.game_over:
+            self.music.switch_to("game_over")
+            
             # Update best score if current score is higher
             if self.score > self.best_score:
                 self.best_score = self.score
             
-            # Show game over message briefly, then return to home screen
-            current_time = pygame.time.get_ticks()
-            if current_time - self.game_over_time > 2000:  # 2 seconds
-                self.current_screen = "home"
+            # end_game() scheduled the return to the home screen
             return
         
+        # Move the basket with the held keys
+        if self.input_left:
+            self.basket.move_left(dt)
+        if self.input_right:
+            self.basket.move_right(dt)
+        
         # Update all sprites
-        self.all_sprites.update()
+        self.all_sprites.update(dt)
+        
+        # Keep the broadphase grid in step with the moved fruits
+        self.grid.update_all(self.fruits, "sweep_rect")
+        
+        # Check for collisions between fruits and baskets, only testing the
+        # fruits in grid cells the basket swept through this tick. Catches
+        # go first so a fast fruit that passed through the basket counts.
+        for basket in self.baskets:
+            for fruit in self.grid.query(basket.sweep_rect):
+                if collide_fruit_basket(fruit, basket):
+                    # Handle different fruit types
+                    if fruit.fruit_type == "bomb":
+                        if self.game_mode == "normal":
+                            # Game over immediately when bomb is caught in normal mode
+                            self.lives = 0
+                            self.events.emit(Bomb(fruit.rect.centerx, fruit.rect.centery, True))
+                            self.end_game(NEON_RED, 30)
+                        else:
+                            # In unlimited mode, bombs just deduct 50 points
+                            self.score = max(0, self.score - 50)  # Don't go below 0
+                            self.events.emit(Bomb(fruit.rect.centerx, fruit.rect.centery, False))
+                    else:
+                        # All fruits are good to catch
+                        self.score += 100
+                        self.events.emit(Catch(fruit.rect.centerx, fruit.rect.centery, fruit.fruit_type))
+                
+                    self.remove_fruit(fruit)
         
-        # Check timer for unlimited mode
-        if self.game_mode == "unlimited":
-            current_time = pygame.time.get_ticks()
-            elapsed_time = current_time - self.timer_start_time
-            
-            # End game when timer runs out
-            if elapsed_time >= self.unlimited_timer:
-                self.game_over = True
-                self.game_over_time = current_time
-                self.sound_fx.play("game_over")
-                # Add explosion particles
-                for _ in range(20):
-                    self.particles.add_particles(
-                        random.randint(0, SCREEN_WIDTH),
-                        random.randint(0, SCREEN_HEIGHT),
-                        NEON_YELLOW, 30
-                    )
-        
-        # Check for collisions between fruits and baskets
+        # Check for fruits that have fallen off the bottom of the screen
         for fruit in list(self.fruits):
-            # Check if fruit has fallen off the bottom of the screen
             if fruit.rect.top > SCREEN_HEIGHT:
                 if fruit.fruit_type != "bomb":  # Only lose a life if it's not a bomb
                     if self.game_mode == "normal":
                         self.lives -= 1
-                        self.sound_fx.play("miss")
-                        # Add particles where fruit was lost
-                        self.particles.add_particles(fruit.rect.centerx, SCREEN_HEIGHT, NEON_RED, 15)
+                        self.events.emit(Miss(fruit.rect.centerx))
                         if self.lives <= 0:
-                            self.game_over = True
-                            self.game_over_time = pygame.time.get_ticks()
-                            self.sound_fx.play("game_over")
-                            # Add explosion particles
-                            for _ in range(20):
-                                self.particles.add_particles(
-                                    random.randint(0, SCREEN_WIDTH),
-                                    random.randint(0, SCREEN_HEIGHT),
-                                    NEON_RED, 30
-                                )
-                fruit.kill()
-                continue
-            
-            # Check for collisions with basket
-            if pygame.sprite.collide_rect(fruit, self.basket):
-                # Handle different fruit types
-                if fruit.fruit_type == "bomb":
-                    if self.game_mode == "normal":
-                        # Game over immediately when bomb is caught in normal mode
-                        self.lives = 0
-                        self.sound_fx.play("bomb")
-                        # Add explosion particles
-                        self.particles.add_particles(fruit.rect.centerx, fruit.rect.centery, NEON_RED, 50)
-                        
-                        self.game_over = True
-                        self.game_over_time = pygame.time.get_ticks()
-                        self.sound_fx.play("game_over")
-                        
-                        # Add more explosion particles across the screen
-                        for _ in range(30):
-                            self.particles.add_particles(
-                                random.randint(0, SCREEN_WIDTH),
-                                random.randint(0, SCREEN_HEIGHT),
-                                NEON_RED, 30
-                            )
-                    else:
-                        # In unlimited mode, bombs just deduct 50 points
-                        self.score = max(0, self.score - 50)  # Don't go below 0
-                        self.sound_fx.play("wrong")
-                        # Add explosion particles
-                        self.particles.add_particles(fruit.rect.centerx, fruit.rect.centery, NEON_RED, 30)
-                else:
-                    # All fruits are good to catch
-                    self.score += 100
-                    self.sound_fx.play("correct")
-                    # Add positive particles
-                    if fruit.fruit_type == "apple":
-                        color = NEON_RED
-                    elif fruit.fruit_type == "banana":
-                        color = NEON_YELLOW
-                    elif fruit.fruit_type == "orange":
-                        color = NEON_ORANGE
-                    elif fruit.fruit_type == "star_fruit":
-                        color = NEON_YELLOW
-                    elif fruit.fruit_type == "blueberry":
-                        color = NEON_BLUE
-                    else:
-                        color = NEON_GREEN
-                    
-                    self.particles.add_particles(fruit.rect.centerx, fruit.rect.centery, color, 20)
-                
-                fruit.kill()
+                            self.end_game()
+                self.remove_fruit(fruit)
         
-        # Spawn new fruits with varied patterns (simplified)
-        current_time = pygame.time.get_ticks()
-        
-        # Check if it's time to change the spawn pattern
-        if current_time - self.pattern_change_timer > self.pattern_change_delay:
-            patterns = ["random", "wave", "cluster", "alternating", "corners"]
-            self.fruit_pattern = random.choice(patterns)
-            self.pattern_change_timer = current_time
-            
-            # Add visual effect for pattern change
-            pattern_colors = {
-                "random": NEON_PURPLE,
-                "wave": NEON_BLUE,
-                "cluster": NEON_GREEN,
-                "alternating": NEON_YELLOW,
-                "corners": NEON_ORANGE
-            }
-            color = pattern_colors.get(self.fruit_pattern, NEON_CYAN)
-            
-            # Add particles at the top of the screen to indicate pattern change
-            for _ in range(20):
-                self.particles.add_particles(
-                    random.randint(0, SCREEN_WIDTH),
-                    random.randint(0, 50),
-                    color, 15
-                )
-        
-        # Simplified fruit spawning with more predictable timing
-        if current_time - self.fruit_spawn_timer > self.next_fruit_spawn:
-            self.spawn_fruit_pattern(self.fruit_pattern)
-            self.fruit_spawn_timer = current_time
-            # More predictable spawn timing
-            self.next_fruit_spawn = random.randint(
-                max(1000, self.fruit_spawn_delay - 300),
-                self.fruit_spawn_delay + 200
-            )
-        
-        # Simplified bomb spawning with more predictable timing
-        if current_time - self.bomb_spawn_timer > self.next_bomb_spawn:
-            # 60% chance to spawn a bomb
-            if random.random() < 0.6:
-                self.spawn_bomb()
-            
-            self.bomb_spawn_timer = current_time
-            
-            # More predictable bomb spawn timing
-            self.next_bomb_spawn = random.randint(
-                max(1000, self.bomb_spawn_delay - 200),
-                self.bomb_spawn_delay + 500
-            )
+        # Spawn the fruits of the current drop that are due
+        self.spawn_pending()
         
         # Check for milestone achievements
         if self.score >= self.last_milestone + self.milestone_increment:
@@ -604,75 +728,33 @@ class Game:
                 self.fruit_pattern = "single"
             elif self.fruits_per_drop == 2:
                 patterns = ["random", "cluster"]
-                self.fruit_pattern = random.choice(patterns)
+                self.fruit_pattern = self.rng.spawn.choice(patterns)
             else:
-                patterns = ["random", "wave", "cluster", "alternating", "corners"]
-                self.fruit_pattern = random.choice(patterns)
+                self.fruit_pattern = self.rng.spawn.choice(self.patterns.rotation())
             
             # Special speed boost at 2000 points
             if self.last_milestone >= self.speed_boost_milestone and not self.speed_boosted:
                 self.speed_boosted = True
                 self.fruit_speed += 0.5  # Additional speed boost
                 self.fruit_spawn_delay = max(600, self.fruit_spawn_delay - 200)  # Drop faster
-                
-                # Visual feedback for speed boost
-                boost_text = "SPEED BOOST!"
-                boost_font = pygame.font.Font(None, 60)
-                text_surface = boost_font.render(boost_text, True, NEON_RED)
-                text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 - 50))
-                self.screen.blit(text_surface, text_rect)
-                
-                # Add special speed boost particles
-                for _ in range(80):
-                    self.particles.add_particles(
-                        random.randint(0, SCREEN_WIDTH),
-                        random.randint(0, SCREEN_HEIGHT),
-                        NEON_RED, 25
-                    )
+                self.events.emit(Milestone("speed_boost", self.score))
             
-            # Visual feedback for milestone
-            milestone_text = f"{self.last_milestone} POINTS!"
-            milestone_font = pygame.font.Font(None, 48)
-            text_surface = milestone_font.render(milestone_text, True, NEON_YELLOW)
-            text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-            self.screen.blit(text_surface, text_rect)
-            
-            # Add celebration particles
-            for _ in range(50):
-                self.particles.add_particles(
-                    random.randint(0, SCREEN_WIDTH),
-                    random.randint(SCREEN_HEIGHT // 4, SCREEN_HEIGHT // 2),
-                    NEON_YELLOW, 20
-                )
+            self.events.emit(Milestone("milestone", self.score))
         
         # Increase difficulty over time based on milestones instead of level
         if self.score > self.level * 1000:
             self.level += 1
-            
-            # Add level up particles
-            for _ in range(30):
-                self.particles.add_particles(
-                    random.randint(0, SCREEN_WIDTH),
-                    random.randint(0, SCREEN_HEIGHT // 2),
-                    NEON_CYAN, 20
-                )
-            
-            # Add level up particles
-            for _ in range(30):
-                self.particles.add_particles(
-                    random.randint(0, SCREEN_WIDTH),
-                    random.randint(0, SCREEN_HEIGHT // 2),
-                    NEON_CYAN, 20
-                )
+            self.events.emit(Milestone("level", self.score))
     
     def draw_home_screen(self):
         # Draw title with glow effect
-        title_text = self.title_font.render("NEON FRUIT CATCHER", True, NEON_CYAN)
+        title_text = render_text(self.title_font, "NEON FRUIT CATCHER", NEON_CYAN)
         
-        # Draw glow effect for title
-        glow_surf = pygame.Surface((title_text.get_width() + 20, title_text.get_height() + 20), pygame.SRCALPHA)
+        # Draw glow effect for title (brightens with the music when playing)
+        glow_boost = 1.0 if self.music_pulse is None else 0.5 + self.music_pulse * 1.5
+        glow_surf = new_surface((title_text.get_width() + 20, title_text.get_height() + 20), pygame.SRCALPHA)
         for i in range(10, 0, -2):
-            alpha = 20 - i * 2
+            alpha = int((20 - i * 2) * glow_boost)
             pygame.draw.rect(glow_surf, (*NEON_CYAN, alpha), 
                            (10-i, 10-i, title_text.get_width() + i*2, title_text.get_height() + i*2), 
                            border_radius=5)
@@ -683,23 +765,23 @@ class Game:
         self.screen.blit(title_text, (title_x, title_y))
         
         # Draw start button
-        self.start_button.draw(self.screen)
+        self.start_button.draw(self.screen, self.music_pulse)
         
         # Draw unlimited mode button
-        self.unlimited_button.draw(self.screen)
+        self.unlimited_button.draw(self.screen, self.music_pulse)
         
         # Draw info button
-        self.info_button.draw(self.screen)
+        self.info_button.draw(self.screen, self.music_pulse)
         
         # Draw mute button
-        self.mute_button.draw(self.screen)
+        self.mute_button.draw(self.screen, self.music_pulse)
         
         # Draw best score at the bottom left corner
         if self.best_score > 0:
-            best_score_text = self.font.render(f"BEST SCORE: {self.best_score}", True, NEON_YELLOW)
+            best_score_text = render_text(self.font, f"BEST SCORE: {self.best_score}", NEON_YELLOW)
             
             # Add glow effect for best score
-            glow_surf = pygame.Surface((best_score_text.get_width() + 10, best_score_text.get_height() + 10), pygame.SRCALPHA)
+            glow_surf = new_surface((best_score_text.get_width() + 10, best_score_text.get_height() + 10), pygame.SRCALPHA)
             for i in range(5, 0, -1):
                 alpha = 15 - i * 2
                 pygame.draw.rect(glow_surf, (*NEON_YELLOW, alpha), 
@@ -712,14 +794,14 @@ class Game:
         
         # Draw decorative fruits with effects
         for fruit in self.decorative_fruits:
-            fruit.draw_with_effects(self.screen)
+            fruit.draw_with_effects(self.screen, self.music_pulse)
     
     def draw_info_screen(self):
         # Draw title with glow effect
-        title_text = self.font.render("HOW TO PLAY", True, NEON_YELLOW)
+        title_text = render_text(self.font, "HOW TO PLAY", NEON_YELLOW)
         
         # Draw glow effect for title
-        glow_surf = pygame.Surface((title_text.get_width() + 20, title_text.get_height() + 20), pygame.SRCALPHA)
+        glow_surf = new_surface((title_text.get_width() + 20, title_text.get_height() + 20), pygame.SRCALPHA)
         for i in range(10, 0, -2):
             alpha = 20 - i * 2
             pygame.draw.rect(glow_surf, (*NEON_YELLOW, alpha), 
@@ -751,11 +833,11 @@ class Game:
         
         for i, line in enumerate(instructions):
             color = colors[i % len(colors)]
-            instr_text = self.font.render(line, True, color)
+            instr_text = render_text(self.font, line, color)
             
             # Add subtle glow for text
             if line:  # Skip empty lines
-                glow_surf = pygame.Surface((instr_text.get_width() + 10, instr_text.get_height() + 10), pygame.SRCALPHA)
+                glow_surf = new_surface((instr_text.get_width() + 10, instr_text.get_height() + 10), pygame.SRCALPHA)
                 pygame.draw.rect(glow_surf, (*color, 30), 
                                (5, 5, instr_text.get_width(), instr_text.get_height()), 
                                border_radius=3)
@@ -768,16 +850,13 @@ class Game:
                             (SCREEN_WIDTH // 2 - instr_text.get_width() // 2, 
                              SCREEN_HEIGHT // 3 + i * 40))
     
-    def draw_game_screen(self):
-        # Draw all sprites
-        self.all_sprites.draw(self.screen)
-        
+    def draw_game_screen(self, alpha=None):
         # Draw basket with effects
-        self.basket.draw_with_effects(self.screen)
+        self.basket.draw_with_effects(self.screen, alpha)
         
         # Draw fruits with effects
         for sprite in self.fruits:
-            sprite.draw_with_effects(self.screen)
+            sprite.draw_with_effects(self.screen, self.music_pulse, alpha)
         
         # Draw UI with neon effect
         self.draw_neon_text(f"SCORE: {self.score}", 20, 20, NEON_GREEN)
@@ -792,14 +871,13 @@ class Game:
             self.draw_neon_text(f"NEXT MILESTONE: {next_milestone}", SCREEN_WIDTH // 2, 60, NEON_YELLOW, center=True)
         else:
             # Draw timer for unlimited mode
-            current_time = pygame.time.get_ticks()
-            elapsed_time = current_time - self.timer_start_time
+            elapsed_time = self.sim_time - self.timer_start_time
             remaining_time = max(0, self.unlimited_timer - elapsed_time)
-            seconds_left = remaining_time // 1000
+            seconds_left = int(remaining_time // 1000)
             
             # Make timer pulse red when low on time
             if seconds_left <= 10:
-                pulse = abs(math.sin(pygame.time.get_ticks() * 0.01)) * 0.5 + 0.5
+                pulse = abs(math.sin(self.sim_time * 0.01)) * 0.5 + 0.5
                 timer_color = (NEON_RED[0], int(NEON_RED[1] * pulse), int(NEON_RED[2] * pulse))
             else:
                 timer_color = NEON_YELLOW
@@ -818,14 +896,14 @@ class Game:
             self.draw_neon_text(f"BEST: {self.best_score}", 20, SCREEN_HEIGHT - 40, NEON_YELLOW)
         
         # Draw mute button
-        self.mute_button.draw(self.screen)
+        self.mute_button.draw(self.screen, self.music_pulse)
     
     def draw_neon_text(self, text, x, y, color, center=False):
         """Draw text with neon glow effect"""
-        text_surface = self.font.render(text, True, color)
+        text_surface = render_text(self.font, text, color)
         
         # Create glow effect
-        glow_surf = pygame.Surface((text_surface.get_width() + 10, text_surface.get_height() + 10), pygame.SRCALPHA)
+        glow_surf = new_surface((text_surface.get_width() + 10, text_surface.get_height() + 10), pygame.SRCALPHA)
         for i in range(5, 0, -1):
             alpha = 25 - i * 5
             pygame.draw.rect(glow_surf, (*color, alpha), 
@@ -840,18 +918,18 @@ class Game:
     
     def draw_game_over_screen(self):
         # Create semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay = new_surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         self.screen.blit(overlay, (0, 0))
         
         # Draw game over text with intense glow
-        game_over_text = self.title_font.render("GAME OVER", True, NEON_RED)
+        game_over_text = render_text(self.title_font, "GAME OVER", NEON_RED)
         
         # Create pulsing glow effect
-        pulse = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 0.5 + 0.5
+        pulse = abs(math.sin(self.sim_time * 0.005)) * 0.5 + 0.5
         glow_size = int(20 * pulse) + 10
         
-        glow_surf = pygame.Surface((game_over_text.get_width() + glow_size*2, 
+        glow_surf = new_surface((game_over_text.get_width() + glow_size*2, 
                                   game_over_text.get_height() + glow_size*2), pygame.SRCALPHA)
         
         for i in range(glow_size, 0, -2):
@@ -869,9 +947,9 @@ class Game:
         self.screen.blit(game_over_text, (text_x, text_y))
         
         # Draw final score with glow
-        final_score_text = self.font.render(f"FINAL SCORE: {self.score}", True, NEON_YELLOW)
+        final_score_text = render_text(self.font, f"FINAL SCORE: {self.score}", NEON_YELLOW)
         
-        glow_surf = pygame.Surface((final_score_text.get_width() + 20, final_score_text.get_height() + 20), pygame.SRCALPHA)
+        glow_surf = new_surface((final_score_text.get_width() + 20, final_score_text.get_height() + 20), pygame.SRCALPHA)
         for i in range(10, 0, -2):
             alpha = 20 - i * 2
             pygame.draw.rect(glow_surf, (*NEON_YELLOW, alpha), 
@@ -884,7 +962,36 @@ class Game:
         self.screen.blit(glow_surf, (score_x - 10, score_y - 10))
         self.screen.blit(final_score_text, (score_x, score_y))
     
-    def draw(self):
+    def draw(self, alpha=None):
+        """Draw a frame; alpha (0-1) is how far render time is past the last tick"""
+        # Sample the music envelope once per frame for the neon glows
+        self.music_pulse = self.music.get_pulse()
+        self.render_frame(alpha)
+        self.present()
+    
+    def present(self):
+        """Draw the overlay on the finished frame and flip it to the display"""
+        hud = self.perf_hud
+        hud.lap("draw")
+        hud.draw(self.screen)
+        hud.lap("hud")
+        pygame.display.flip()
+        hud.lap("flip")
+    
+    def count_entities(self):
+        """Live object counts for the performance overlay"""
+        return {
+            "fruits": len(self.fruits) if hasattr(self, "fruits") else 0,
+            "particles": len(self.particles.particles),
+            "lasers": len(self.background.lasers),
+            "explosions": len(self.background.explosion_particles),
+        }
+    
+    def render_frame(self, alpha=None):
+        """Draw the current frame to self.screen
+        
+        Only reads state, so it can also run on a RenderState snapshot.
+        """
         # Draw background
         self.background.draw(self.screen)
         
@@ -892,7 +999,7 @@ class Game:
         if self.current_screen == "home":
             self.draw_home_screen()
         elif self.current_screen == "game":
-            self.draw_game_screen()
+            self.draw_game_screen(alpha)
             
             # Draw game over screen if game is over
             if self.game_over:
@@ -902,25 +1009,148 @@ class Game:
         
         # Draw particles on top
         self.particles.draw(self.screen)
-        
-        # Update the display
-        pygame.display.flip()
     
     def run(self):
-        # Game loop
+        # Game loop: fixed simulation ticks fed by an accumulator, with
+        # rendering interpolated between the last two ticks
+        sim_step = 1.0 / self.sim_rate
+        accumulator = 0.0
+        frames_skipped = 0
+        previous = time.perf_counter()
+        pipeline = RenderPipeline(self) if self.pipelined else None
+        
+        hud = self.perf_hud
+        if self.profiler.from_env:
+            self.profiler.start()
+        if tracer.from_env:
+            tracer.start()
+        sampler = self.sampler
+        if sampler:
+            sampler.start()
+        gc_policy = self.gc_policy
+        gc_policy.attach(self.current_screen)
+        
         while self.running:
-            self.clock.tick(FPS)
+            hud.begin_frame(self.count_entities)
+            now = frame_start = time.perf_counter()
+            gc_policy.begin_frame()
+            if sampler:
+                sampler.begin_frame()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+            
             self.handle_events()
-            self.update()
-            self.draw()
+            hud.lap("events")
+            
+            steps = 0
+            while accumulator >= sim_step and steps < MAX_SIM_STEPS:
+                self.update()
+                accumulator -= sim_step
+                steps += 1
+            hud.lap("update")
+            
+            # Still behind after the catch-up cap: skip drawing this frame so
+            # the next one can simulate, or drop the backlog if we keep falling
+            # behind so the game slows down instead of spiralling
+            skip_draw = False
+            if accumulator >= sim_step:
+                if frames_skipped < MAX_FRAME_SKIP:
+                    frames_skipped += 1
+                    skip_draw = True
+                else:
+                    accumulator %= sim_step
+            
+            if not skip_draw:
+                frames_skipped = 0
+                if pipeline:
+                    pipeline.draw(accumulator / sim_step)
+                else:
+                    self.draw(accumulator / sim_step)
+            
+            # Every frame, skipped or not, ends here: the skipped ones are the
+            # overloaded frames the tracer, sampler and hitch detector need
+            if tracer.enabled:
+                tracer.record("frame", frame_start, time.perf_counter())
+            work_ms = (time.perf_counter() - frame_start) * 1000
+            if sampler:
+                sampler.end_frame(work_ms)
+            # Collect in the time clock.tick would otherwise sleep away
+            gc_policy.end_frame(work_ms, self.current_screen, self.sim_time)
+            self.clock.tick(self.display_fps)
         
         # Clean up
+        gc_policy.detach()
+        print(gc_policy.summary())
+        self.profiler.stop(self)
+        if tracer.enabled:
+            tracer.toggle()
+        if sampler:
+            sampler.stop()
+            sampler.write()
+        if self.memtrack:
+            self.memtrack.report(self)
+        if pipeline:
+            pipeline.stop()
+        if self.recorder:
+            self.recorder.close()
         self.music.stop()
         pygame.quit()
         sys.exit()
 
+# Spans recorded while tracing is on (F10 or FRUIT_TRACE=1)
+tracer.trace_method(Game, "handle_events", "events")
+tracer.trace_method(Game, "update", "update")
+tracer.trace_method(Game, "draw", "draw")
+tracer.trace_method(Game, "render_frame", "render")
+tracer.trace_method(Game, "present", "present")
+tracer.trace_method(Game, "spawn_fruit_pattern", "spawn.plan")
+tracer.trace_method(Game, "spawn_pending", "spawn.drop")
+tracer.trace_method(Game, "spawn_bomb", "spawn.bomb")
+tracer.trace_method(EventBus, "dispatch", "effects")
+tracer.trace_method(Background, "update")
+tracer.trace_method(Background, "draw")
+tracer.trace_method(ParticleSystem, "update")
+tracer.trace_method(ParticleSystem, "draw")
+tracer.trace_method(SoundEffects, "play", "sound.play")
+
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description=GAME_TITLE)
+    parser.add_argument("--sim-rate", type=int, default=SIM_RATE, help="simulation ticks per second")
+    parser.add_argument("--fps", type=int, default=FPS, help="display frame rate (0 = uncapped)")
+    parser.add_argument("--seed", type=seed_arg, help="seed for all gameplay randomness")
+    parser.add_argument("--record", metavar="PATH", help="record per-tick input to a replay file")
+    parser.add_argument("--rewind", type=float, default=0, metavar="SECONDS",
+                        help="keep a rewind buffer of this many seconds (Backspace rewinds 5s)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="experimental: draw on a render thread while the next frame simulates; "
+                             "only pays off with several cores (check with headless.py --pipeline-bench)")
+    parser.add_argument("--field-stress", type=int, metavar="COUNT",
+                        help="run the array-backed fruit field with COUNT objects instead of the game")
+    parser.add_argument("--seconds", type=float, help="stop the field stress run after this many seconds")
+    parser.add_argument("--stress", action="store_true",
+                        help="ramp up the load in unlimited mode and report frame time percentiles")
+    parser.add_argument("--stress-drops", metavar="LIST", help="fruits per drop for each stress level, e.g. 5,15,60")
+    parser.add_argument("--stress-bursts", metavar="LIST", help="particle burst multiplier for each level")
+    parser.add_argument("--stress-ships", metavar="LIST", help="background ships for each level")
+    parser.add_argument("--stress-seconds", type=float, default=5, help="simulated seconds per stress level")
+    args = parser.parse_args()
+    
+    if args.field_stress:
+        run_field_stress(args.field_stress, sim_rate=args.sim_rate, display_fps=args.fps,
+                         seconds=args.seconds, seed=args.seed)
+        pygame.quit()
+        sys.exit()
+    
+    game = Game(sim_rate=args.sim_rate, display_fps=args.fps, seed=args.seed,
+                record_path=args.record, rewind_seconds=args.rewind, pipelined=args.pipelined)
+    
+    if args.stress:
+        levels = stress.parse_levels(args.stress_drops, args.stress_bursts, args.stress_ships)
+        stress.print_table(stress.run_stress(game, levels, args.stress_seconds))
+        game.music.stop()
+        pygame.quit()
+        sys.exit()
+    
     game.run()
     def spawn_powerup(self):
         """Spawn a random power-up"""
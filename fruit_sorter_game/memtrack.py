@@ -0,0 +1,192 @@
+"""Per-scene memory accounting.
+
+With FRUIT_MEMTRACK=1 the game starts tracemalloc and measures memory at
+every current_screen transition ("home", "game", "info"):
+
+- tracemalloc's traced total and a snapshot of live allocations
+- an account per subsystem, built by walking the game's own structures:
+  pixel and mask bytes of surfaces, decoded audio, and the approximate
+  size of the Python objects in each list
+
+Leaving a scene prints what it cost (growth between entering and
+leaving it). Every return to the home screen is compared with the first
+home visit and prints what was not freed: the subsystems that grew and
+the allocation sites that still hold the most new memory. A summary per
+scene is printed when the game exits.
+
+    FRUIT_MEMTRACK=1 python main.py
+"""
+import os
+import sys
+import tracemalloc
+
+import pygame
+
+import collision
+from sprites import Fruit
+
+MEMTRACK_ENV = "FRUIT_MEMTRACK"
+TOP_ALLOCATIONS = 8
+
+
+def enabled():
+    return os.environ.get(MEMTRACK_ENV, "") not in ("", "0")
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def mask_bytes(mask):
+    width, height = mask.get_size()
+    return (width + 7) // 8 * height
+
+
+def sound_bytes(sound):
+    frequency, size, channels = pygame.mixer.get_init() or (44100, -16, 2)
+    return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+
+def object_bytes(objects):
+    """Shallow size of a container plus its items and their attribute dicts"""
+    total = sys.getsizeof(objects)
+    for obj in objects:
+        total += sys.getsizeof(obj)
+        if hasattr(obj, "__dict__"):
+            total += sys.getsizeof(obj.__dict__)
+    return total
+
+
+def account(game):
+    """{subsystem: {"surfaces": bytes, "python": bytes, "items": count}}"""
+    accounts = {}
+
+    def add(name, surfaces=0, python=0, items=0):
+        entry = accounts.setdefault(name, {"surfaces": 0, "python": 0, "items": 0})
+        entry["surfaces"] += surfaces
+        entry["python"] += python
+        entry["items"] += items
+
+    # Artwork and pre-rotated frames shared by every fruit
+    add("sprite caches", surfaces=sum(surface_bytes(image) for image in Fruit.image_cache.values()),
+        items=len(Fruit.image_cache))
+    for frames in collision.frame_cache.values():
+        add("sprite caches", surfaces=sum(surface_bytes(image) + mask_bytes(mask) for image, mask in frames),
+            python=object_bytes(frames), items=len(frames))
+    add("sprite caches", python=object_bytes(collision.hitbox_cache.values()), items=len(collision.hitbox_cache))
+
+    fruits = list(getattr(game, "fruits", ()))
+    add("fruits", python=object_bytes(fruits) + object_bytes(game.fruit_pool.free),
+        items=len(fruits) + len(game.fruit_pool.free))
+
+    particles = game.particles
+    add("particles", python=object_bytes(particles.particles), items=len(particles.particles))
+    for pool in (particles.particle_pool, particles.crackle_pool):
+        add("particles", python=object_bytes(pool.free), items=len(pool.free))
+
+    for sound in game.sound_fx.sounds.values():
+        add("audio", surfaces=sound_bytes(sound), items=1)
+    with game.music.decode_lock:
+        tracks = list(game.music.decoded.values())
+    for sound, envelope in tracks:
+        add("audio", surfaces=sound_bytes(sound) + envelope.nbytes, items=1)
+
+    background = game.background
+    for name in ("stars", "tie_fighters", "x_wings", "lasers", "explosion_particles"):
+        items = getattr(background, name)
+        add("background", python=object_bytes(items) + sum(object_bytes(item) for item in items
+                                                            if isinstance(item, (list, tuple))),
+            items=len(items))
+
+    hud = game.perf_hud
+    add("debug tools", surfaces=surface_bytes(hud.graph) + surface_bytes(hud.panel)
+        + sum(surface_bytes(glyph) for glyph in hud.glyphs.values()), items=len(hud.glyphs))
+
+    add("display", surfaces=surface_bytes(game.screen), items=1)
+    return accounts
+
+
+def account_total(entry):
+    return entry["surfaces"] + entry["python"]
+
+
+def kb(value):
+    return f"{value / 1024:+.0f} KB"
+
+
+class MemTracker:
+    def __init__(self, frames=1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.filters = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+        self.entered = None  # (screen, traced bytes, snapshot, accounts)
+        self.home_baseline = None  # (traced bytes, snapshot, accounts) at the first home visit
+        self.costs = {}  # screen: [traced bytes gained per visit]
+        self.retained = 0
+
+    def measure(self, game):
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.filters)
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        return traced, snapshot, account(game)
+
+    def start(self, game):
+        """Take the first home screen measurement (the game starts there)"""
+        traced, snapshot, accounts = self.measure(game)
+        self.entered = (game.current_screen, traced, snapshot, accounts)
+        if game.current_screen == "home":
+            self.home_baseline = (traced, snapshot, accounts)
+        print(f"[mem] tracking scenes, {traced / 2 ** 20:.1f} MB traced on {game.current_screen}")
+
+    def on_transition(self, game, old, new):
+        traced, snapshot, accounts = self.measure(game)
+
+        if self.entered and self.entered[0] == old:
+            _, entered_traced, _, entered_accounts = self.entered
+            cost = traced - entered_traced
+            self.costs.setdefault(old, []).append(cost)
+            print(f"[mem] {old} -> {new}: {old} cost {kb(cost)} traced "
+                  f"({self.describe_growth(entered_accounts, accounts)})")
+        self.entered = (new, traced, snapshot, accounts)
+
+        if new == "home":
+            if self.home_baseline is None:
+                self.home_baseline = (traced, snapshot, accounts)
+            else:
+                self.report_retained(traced, snapshot, accounts)
+
+    def describe_growth(self, before, after, limit=4):
+        changes = []
+        for name, entry in after.items():
+            change = account_total(entry) - account_total(before.get(name, entry))
+            if change:
+                changes.append((abs(change), f"{name} {kb(change)}"))
+        changes.sort(reverse=True)
+        return ", ".join(text for _, text in changes[:limit]) or "no subsystem change"
+
+    def report_retained(self, traced, snapshot, accounts):
+        base_traced, base_snapshot, base_accounts = self.home_baseline
+        self.retained = traced - base_traced
+        print(f"[mem] back home, {kb(self.retained)} traced still held since the first home visit")
+        for name, entry in accounts.items():
+            before = base_accounts.get(name, {"surfaces": 0, "python": 0, "items": 0})
+            change = account_total(entry) - account_total(before)
+            if change:
+                print(f"[mem]   {name:<14} {kb(change):>10}  ({before['items']} -> {entry['items']} items, "
+                      f"{entry['surfaces'] / 1024:.0f} KB surfaces/audio)")
+        for stat in snapshot.compare_to(base_snapshot, "lineno")[:TOP_ALLOCATIONS]:
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                print(f"[mem]   {os.path.basename(frame.filename)}:{frame.lineno} {kb(stat.size_diff)} "
+                      f"in {stat.count_diff:+d} blocks")
+
+    def report(self, game):
+        """Print the cost of each scene and the current account per subsystem"""
+        print("[mem] scene costs (traced growth between entering and leaving):")
+        for screen, costs in sorted(self.costs.items()):
+            print(f"[mem]   {screen:<6} {len(costs):>4} visits  mean {kb(sum(costs) / len(costs))}  "
+                  f"max {kb(max(costs))}")
+        print(f"[mem] retained at the last return home: {kb(self.retained)}")
+        print("[mem] current account:")
+        for name, entry in account(game).items():
+            print(f"[mem]   {name:<14} {entry['surfaces'] / 1024:>8.0f} KB surfaces/audio "
+                  f"{entry['python'] / 1024:>8.0f} KB objects  {entry['items']:>6} items")
@@ -1,33 +1,256 @@
 import pygame
 import numpy as np
 import os
+import time
+import queue
+import threading
+
+# Music-reactive visuals sample a precomputed envelope at this rate
+ENVELOPE_RATE = 60  # envelope frames per second of audio
+
+# Track file for each part of the game; missing files use generated music
+DEFAULT_PLAYLIST = {
+    "home": "space_theme.ogg",
+    "game": "game_theme.ogg",
+    "game_over": "game_over_theme.ogg",
+}
+
+# Generated music per track (tempo, pitch factor, noise seed), so each part
+# of the game still sounds different without its file
+GENERATED_STYLES = {
+    "home": {"bpm": 120, "pitch": 1.0, "seed": 0},
+    "game": {"bpm": 150, "pitch": 1.5, "seed": 1},
+    "game_over": {"bpm": 80, "pitch": 0.75, "seed": 2},
+}
 
 class BackgroundMusic:
-    def __init__(self):
+    def __init__(self, playlist=None, scheduler=None):
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
         
         # Create music directory if it doesn't exist
-        music_dir = os.path.join("assets", "music")
-        os.makedirs(music_dir, exist_ok=True)
+        self.music_dir = os.path.join("assets", "music")
+        os.makedirs(self.music_dir, exist_ok=True)
         
-        # Set up music channels
-        self.music_channel = pygame.mixer.Channel(7)  # Reserve channel 7 for music
+        # Two music channels so tracks can crossfade into each other
+        self.channels = [pygame.mixer.Channel(7), pygame.mixer.Channel(6)]
+        self.music_channel = self.channels[0]  # Reserve channel 7 for music
         self.volume = 0.4
         
+        # Fade steps run on the game's sim-time scheduler; without one
+        # fades jump straight to their final volume
+        self.scheduler = scheduler
+        self.fade_event = None
+        
+        # Playback position for the envelope comes from this millisecond
+        # clock; golden-frame runs swap in the simulation clock
+        self.clock = pygame.time.get_ticks
+        
         # Music file path
-        self.music_path = os.path.join(music_dir, "space_theme.ogg")
+        self.playlist = dict(playlist or DEFAULT_PLAYLIST)
+        self.music_path = os.path.join(self.music_dir, self.playlist["home"])
+        
+        # Decoded tracks keyed by file path: (sound, envelope)
+        self.decoded = {}
+        self.decode_lock = threading.Lock()
+        self.decode_queue = queue.Queue()
+        self.decode_requested = set()
+        self.decode_thread = threading.Thread(target=self._decode_worker, daemon=True)
+        self.decode_thread.start()
+        
+        # The home track is needed immediately, so decode it on this thread
+        self.current_track = "home"
+        self.pending_track = None
+        self.pending_crossfade = 0
+        self.music, self.envelope = self.load_track(self.music_path)
+        self.music.set_volume(self.volume)
+        self.play_start = self.clock()
+        
+        # Decode the remaining tracks in the background
+        for track in self.playlist:
+            self.preload(track)
+    
+    def load_track(self, path):
+        """Decode a track and analyze its envelope, returning (sound, envelope)"""
+        with self.decode_lock:
+            if path in self.decoded:
+                return self.decoded[path]
         
         # Load music - use the existing file without trying to generate a new one
-        try:
-            print(f"Loading music from {self.music_path}")
-            self.music = pygame.mixer.Sound(self.music_path)
-            self.music.set_volume(self.volume)
-            print("Music loaded successfully!")
-        except Exception as e:
-            print(f"Error loading music: {e}")
-            print("Generating fallback music")
-            self.music = self.generate_simple_loop()
-            self.music.set_volume(self.volume)
+        style = GENERATED_STYLES.get(self.track_name(path), GENERATED_STYLES["home"])
+        if not os.path.exists(path):
+            print(f"Generating music for {path}")
+            sound = self.generate_simple_loop(**style)
+        else:
+            try:
+                print(f"Loading music from {path}")
+                sound = pygame.mixer.Sound(path)
+                print("Music loaded successfully!")
+            except Exception as e:
+                print(f"Error loading music: {e}")
+                print("Generating fallback music")
+                sound = self.generate_simple_loop(**style)
+        
+        # Analyze the track once so render code never touches audio data
+        track = (sound, self.analyze_envelope(sound))
+        with self.decode_lock:
+            self.decoded[path] = track
+        return track
+    
+    def track_path(self, track):
+        return os.path.join(self.music_dir, self.playlist[track])
+    
+    def track_name(self, path):
+        for track in self.playlist:
+            if self.track_path(track) == path:
+                return track
+        return None
+    
+    def preload(self, track):
+        """Queue a track for decoding on the background thread"""
+        path = self.track_path(track)
+        if path not in self.decode_requested:
+            self.decode_requested.add(path)
+            self.decode_queue.put(path)
+    
+    def wait_decoded(self, timeout=30):
+        """Block until every playlist track is decoded (for headless tools)"""
+        paths = {self.track_path(track) for track in self.playlist}
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            with self.decode_lock:
+                if paths <= self.decoded.keys():
+                    return
+            time.sleep(0.01)
+        raise RuntimeError("music tracks did not finish decoding")
+    
+    def _decode_worker(self):
+        while True:
+            path = self.decode_queue.get()
+            try:
+                self.load_track(path)
+            except Exception as e:
+                print(f"Error decoding {path}: {e}")
+    
+    def switch_to(self, track, crossfade_ms=1500):
+        """Crossfade to another playlist track without blocking the frame
+        
+        If the track is still decoding the switch happens on the first
+        update() after it is ready.
+        """
+        if track == self.pending_track or (track == self.current_track and self.pending_track is None):
+            return
+        self.pending_track = track
+        self.pending_crossfade = crossfade_ms
+        self.preload(track)
+        self.update()
+    
+    def update(self):
+        """Complete a pending track switch once its decode has finished"""
+        if self.pending_track is None:
+            return
+        with self.decode_lock:
+            ready = self.decoded.get(self.track_path(self.pending_track))
+        if ready is None:
+            return
+        
+        track = self.pending_track
+        self.pending_track = None
+        sound, envelope = ready
+        if sound is self.music:
+            self.current_track = track
+            return
+        
+        # The mixer applies both fades per sample, so the overlap is gapless
+        old_channel = self.music_channel
+        self.music_channel = self.channels[1] if old_channel is self.channels[0] else self.channels[0]
+        sound.set_volume(self.music.get_volume())
+        if old_channel.get_busy():
+            old_channel.fadeout(self.pending_crossfade)
+            self.music_channel.play(sound, loops=-1, fade_ms=self.pending_crossfade)
+        else:
+            self.music_channel.play(sound, loops=-1)
+        
+        self.current_track = track
+        self.music = sound
+        self.envelope = envelope
+        self.play_start = self.clock()
+    
+    def analyze_envelope(self, sound, frame_rate=ENVELOPE_RATE):
+        """Precompute a compact energy/beat envelope for a sound
+        
+        Returns a uint8 array of shape (frames, 2): column 0 is RMS energy and
+        column 1 is a decaying pulse triggered by spectral-flux onsets, both
+        scaled to 0-255.
+        """
+        mixer_rate = pygame.mixer.get_init()[0]
+        samples = pygame.sndarray.array(sound).astype(np.float32)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        
+        # Split the PCM into one analysis frame per envelope step
+        hop = max(1, int(mixer_rate / frame_rate))
+        n_frames = len(samples) // hop
+        if n_frames == 0:
+            return np.zeros((1, 2), dtype=np.uint8)
+        frames = samples[:n_frames * hop].reshape(n_frames, hop)
+        
+        # RMS energy per frame, normalized against the loud end of the track
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        loud = np.percentile(rms, 95)
+        energy = np.clip(rms / loud, 0, 1) if loud > 0 else np.zeros_like(rms)
+        
+        # Spectral flux, computed in blocks to keep the FFT buffers small
+        window = np.hanning(hop).astype(np.float32)
+        flux = np.zeros(n_frames, dtype=np.float32)
+        previous = None
+        block = 512
+        for start in range(0, n_frames, block):
+            spectrum = np.abs(np.fft.rfft(frames[start:start + block] * window, axis=1))
+            if previous is not None:
+                spectrum_prev = np.vstack((previous, spectrum[:-1]))
+            else:
+                spectrum_prev = np.vstack((spectrum[:1], spectrum[:-1]))
+            flux[start:start + block] = np.maximum(spectrum - spectrum_prev, 0).sum(axis=1)
+            previous = spectrum[-1:]
+        
+        # Onsets are local flux peaks well above the running average
+        avg_len = max(1, frame_rate // 4)
+        local_mean = np.convolve(flux, np.ones(avg_len) / avg_len, mode="same")
+        is_peak = np.r_[False, (flux[1:-1] >= flux[:-2]) & (flux[1:-1] >= flux[2:]), False]
+        onsets = is_peak & (flux > local_mean * 1.5) & (flux > 0)
+        
+        # Turn onsets into a pulse that decays over ~150 ms
+        index = np.arange(n_frames)
+        last_onset = np.maximum.accumulate(np.where(onsets, index, -n_frames))
+        beat = np.exp(-(index - last_onset) / (0.15 * frame_rate))
+        
+        envelope = np.empty((n_frames, 2), dtype=np.uint8)
+        envelope[:, 0] = (energy * 255).astype(np.uint8)
+        envelope[:, 1] = (beat * 255).astype(np.uint8)
+        return envelope
+    
+    def sample_envelope(self):
+        """Return (energy, beat) in 0-1 at the current playback position"""
+        if not self.music_channel.get_busy():
+            return None
+        elapsed = self.clock() - self.play_start
+        track_ms = self.music.get_length() * 1000
+        if track_ms > 0 and elapsed >= track_ms:
+            # Re-anchor at the start of the current loop, using the exact
+            # track length (the envelope drops the last partial hop)
+            self.play_start += elapsed // track_ms * track_ms
+            elapsed -= elapsed // track_ms * track_ms
+        frame = min(int(elapsed * ENVELOPE_RATE / 1000), len(self.envelope) - 1)
+        energy, beat = self.envelope[frame]
+        return energy / 255.0, beat / 255.0
+    
+    def get_pulse(self):
+        """Return a 0-1 glow pulse following the music, or None if silent"""
+        sample = self.sample_envelope()
+        if sample is None:
+            return None
+        energy, beat = sample
+        return min(1.0, 0.5 * energy + 0.5 * beat)
     
     def generate_space_theme(self):
         """Generate a Star Wars-themed background music loop"""
@@ -40,12 +263,14 @@ class BackgroundMusic:
         except Exception as e:
             print(f"Error generating music: {e}")
     
-    def generate_simple_loop(self, save_path=None):
-        """Generate a Star Wars-themed music loop"""
+    def generate_simple_loop(self, save_path=None, bpm=120, pitch=1.0, seed=0):
+        """Generate a Star Wars-themed music loop
+        
+        bpm and pitch (a factor on every note) vary the loop per track.
+        """
         # Parameters
         sample_rate = 44100
-        duration = 10.0  # 10 second loop
-        bpm = 120  # Imperial March tempo
+        duration = max(10.0, 16 * 60.0 / bpm)  # 10 second loop, longer if 4 bars need it
         
         # Calculate total samples
         total_samples = int(sample_rate * duration)
@@ -53,6 +278,9 @@ class BackgroundMusic:
         # Create empty array for the loop
         music_data = np.zeros((total_samples, 2), dtype=np.float32)
         
+        # Fixed seed, so the loop (and its envelope) is the same every run
+        noise_rng = np.random.default_rng(seed)
+        
         # Define a Star Wars-inspired chord progression (Imperial March inspired)
         chords = [
             [146.83, 220.00, 293.66],  # D minor
@@ -60,9 +288,11 @@ class BackgroundMusic:
             [146.83, 220.00, 293.66],  # D minor
             [116.54, 174.61, 233.08]   # Bb major
         ]
+        chords = [[note * pitch for note in chord] for chord in chords]
         
         # Define a Star Wars-inspired bassline (Imperial March motif)
         bassline = [73.42, 73.42, 73.42, 58.27, 87.31, 73.42, 58.27, 87.31, 73.42]  # D, D, D, Bb, F, D, Bb, F, D
+        bassline = [note * pitch for note in bassline]
         
         # Calculate samples per beat and per chord
         samples_per_beat = int(60.0 / bpm * sample_rate)
@@ -91,7 +321,7 @@ class BackgroundMusic:
                 chord_data += 0.05 * np.sin(2 * np.pi * (note * 1.01) * t)
             
             # Add some noise for texture
-            noise = np.random.uniform(-0.02, 0.02, len(t))
+            noise = noise_rng.uniform(-0.02, 0.02, len(t))
             chord_data += noise
             
             # Normalize
@@ -205,7 +435,7 @@ class BackgroundMusic:
                     whoosh_len = total_samples - i
                 
                 # Create a filtered noise sweep
-                noise = np.random.uniform(-0.1, 0.1, whoosh_len)
+                noise = noise_rng.uniform(-0.1, 0.1, whoosh_len)
                 
                 # Apply envelope
                 env = np.exp(-np.linspace(0, 5, whoosh_len))
@@ -224,7 +454,7 @@ class BackgroundMusic:
             # Every beat, add a subtle "click"
             click_len = 100
             if i + click_len <= total_samples:
-                click = np.random.uniform(-0.1, 0.1, click_len)
+                click = noise_rng.uniform(-0.1, 0.1, click_len)
                 click_env = np.exp(-np.linspace(0, 10, click_len))
                 click = click * click_env
                 
@@ -254,21 +484,27 @@ class BackgroundMusic:
     def play(self):
         """Play the background music on loop"""
         self.music_channel.play(self.music, loops=-1)
+        self.play_start = self.clock()
     
     def stop(self):
         """Stop the background music"""
-        self.music_channel.stop()
+        for channel in self.channels:
+            channel.stop()
     
     def set_volume(self, volume):
         """Set the volume of the background music"""
         self.volume = max(0.0, min(1.0, volume))
-        self.music.set_volume(self.volume)
+        with self.decode_lock:
+            tracks = list(self.decoded.values())
+        for sound, _ in tracks:
+            sound.set_volume(self.volume)
     
     def fade_in(self, milliseconds=2000):
         """Fade in the music"""
         # Start at zero volume
         self.music.set_volume(0)
         self.music_channel.play(self.music, loops=-1)
+        self.play_start = self.clock()
         
         # Create a timer to gradually increase volume
         self.fade_steps = 20
@@ -277,17 +513,32 @@ class BackgroundMusic:
         self.current_fade_step = 0
         
         # Start the fade timer
-        pygame.time.set_timer(pygame.USEREVENT + 1, int(self.fade_delay))
+        self.start_fade(self.update_fade)
+    
+    def start_fade(self, step):
+        if self.scheduler is None:
+            while step():
+                pass
+            return
+        if self.fade_event is not None:
+            self.fade_event.cancel()
+        self.fade_event = self.scheduler.every(self.fade_delay, step, group="music")
+    
+    def stop_fade(self):
+        if self.fade_event is not None:
+            self.fade_event.cancel()
+            self.fade_event = None
     
     def update_fade(self):
-        """Update the fade-in effect"""
+        """Update the fade-in effect; returns False once it is complete"""
         if self.current_fade_step < self.fade_steps:
             self.current_fade_step += 1
             new_volume = self.current_fade_step * self.fade_amount
             self.music.set_volume(new_volume)
-        else:
-            # Stop the timer when fade is complete
-            pygame.time.set_timer(pygame.USEREVENT + 1, 0)
+            return True
+        # Stop the timer when fade is complete
+        self.stop_fade()
+        return False
     
     def fade_out(self, milliseconds=2000):
         """Fade out the music"""
@@ -298,15 +549,16 @@ class BackgroundMusic:
         self.current_fade_step = self.fade_steps
         
         # Start the fade timer
-        pygame.time.set_timer(pygame.USEREVENT + 2, int(self.fade_delay))
+        self.start_fade(self.update_fade_out)
     
     def update_fade_out(self):
-        """Update the fade-out effect"""
+        """Update the fade-out effect; returns False once it is complete"""
         if self.current_fade_step > 0:
             self.current_fade_step -= 1
             new_volume = self.current_fade_step * self.fade_amount
             self.music.set_volume(new_volume)
-        else:
-            # Stop the timer and the music when fade is complete
-            pygame.time.set_timer(pygame.USEREVENT + 2, 0)
-            self.music_channel.stop()
+            return True
+        # Stop the timer and the music when fade is complete
+        self.stop_fade()
+        self.music_channel.stop()
+        return False
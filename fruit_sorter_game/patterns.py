@@ -0,0 +1,173 @@
+"""Data-driven fruit spawn patterns.
+
+Each pattern is a dict of layout parameters. The built-in set below can
+be extended or overridden from assets/patterns.json without touching
+code. PatternLibrary compiles every pattern, for every fruit count it
+can be asked for, into a timeline of spawn entries:
+
+    (tick offset, x offset, x jitter low, x jitter high, speed modifier, fruit type)
+
+Entries are spread `stagger_ms` apart, so a 15-fruit burst is spawned
+over several ticks instead of all in one. At drop time only the anchor
+and jitter need random draws.
+
+Pattern keys:
+    layout       "random", "row", "cluster", "sections" or "fixed"
+    min_fruits   drops smaller than this fall back to "single"
+    max_count    cap on the number of fruits
+    count        "all" (default) or "random" (1 to the drop size)
+    stagger_ms   time between consecutive spawns of one drop
+    speed        speed modifier, plus speed_step per spawn
+    fruit_type   fixed fruit type, or null for the usual weighted pick
+    color        particle color shown when the pattern becomes active
+    in_rotation  whether the periodic pattern change may pick it
+    x_range      [low, high] for random x, or for the anchor of row/cluster
+    spacing, wrap            row: x offset per fruit, wrap around the screen
+    jitter, clamp            cluster: random offset per fruit, x limits
+    sections, every_other_below   sections: screen slices, and below this
+                                  drop size only every other slice spawns
+    positions    fixed: x positions, in order
+"""
+import json
+import os
+
+from screen import SCREEN_WIDTH
+
+PATTERN_FILE = os.path.join("assets", "patterns.json")
+
+DEFAULT_PATTERNS = {
+    "single": {
+        "layout": "random", "x_range": [133, 666], "max_count": 1,
+        "in_rotation": False,
+    },
+    "wave": {
+        "layout": "row", "min_fruits": 3, "max_count": 6, "x_range": [200, 600],
+        "spacing": 80, "wrap": True, "stagger_ms": 100, "color": [60, 120, 255],
+    },
+    "cluster": {
+        "layout": "cluster", "min_fruits": 2, "max_count": 5, "x_range": [266, 533],
+        "jitter": [-60, 60], "clamp": [50, 750], "stagger_ms": 60, "color": [60, 255, 120],
+    },
+    "random": {
+        "layout": "random", "count": "random", "x_range": [133, 666],
+        "stagger_ms": 150, "color": [200, 60, 255],
+    },
+    "alternating": {
+        "layout": "sections", "min_fruits": 2, "sections": 5, "every_other_below": 4,
+        "stagger_ms": 120, "color": [255, 255, 60],
+    },
+    "corners": {
+        "layout": "fixed", "min_fruits": 2, "positions": [133, 266, 400, 533, 666],
+        "stagger_ms": 80, "color": [255, 150, 60],
+    },
+}
+
+
+def load_patterns(path=PATTERN_FILE):
+    """Built-in patterns, updated with any defined in the pattern file"""
+    patterns = {name: dict(spec) for name, spec in DEFAULT_PATTERNS.items()}
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                custom = json.load(f)
+            for name, spec in custom.items():
+                patterns.setdefault(name, {}).update(spec)
+            print(f"Loaded {len(custom)} spawn patterns from {path}")
+        except (OSError, ValueError) as e:
+            print(f"Error loading spawn patterns: {e}")
+    return patterns
+
+
+class PatternLibrary:
+    # Drop sizes compiled up front; bigger ones are compiled when first used
+    MAX_DROP = 20
+
+    def __init__(self, patterns, tick_ms):
+        self.patterns = patterns
+        self.names = list(patterns)
+        self.tick_ms = tick_ms
+        self.timelines = {}
+        for name in self.names:
+            for count in range(1, self.MAX_DROP + 1):
+                self.timelines[(name, count)] = self.compile(patterns[name], count)
+
+    def add(self, name, spec):
+        """Register (or replace) a pattern at run time"""
+        if name not in self.patterns:
+            self.names.append(name)
+        self.patterns[name] = spec
+        for key in [key for key in self.timelines if key[0] == name]:
+            del self.timelines[key]
+
+    def timeline(self, name, count):
+        """Compiled timeline, compiling bigger drops than MAX_DROP on demand"""
+        timeline = self.timelines.get((name, count))
+        if timeline is None:
+            timeline = self.timelines[(name, count)] = self.compile(self.patterns[name], count)
+        return timeline
+
+    def rotation(self):
+        """Patterns the periodic pattern change picks from"""
+        return [name for name in self.names if self.patterns[name].get("in_rotation", True)]
+
+    def color(self, name, default):
+        color = self.patterns.get(name, {}).get("color")
+        return tuple(color) if color else default
+
+    def compile(self, spec, count):
+        """Timeline for a drop of `count` fruits"""
+        layout = spec["layout"]
+        count = min(count, spec.get("max_count", count))
+
+        if layout == "random":
+            low, high = spec["x_range"]
+            placements = [(0, low, high)] * count
+        elif layout == "row":
+            placements = [(i * spec["spacing"], 0, 0) for i in range(count)]
+        elif layout == "cluster":
+            low, high = spec["jitter"]
+            placements = [(0, low, high)] * count
+        elif layout == "sections":
+            sections = min(spec["sections"], count)
+            width = SCREEN_WIDTH / sections
+            placements = [(i * width, 0, int(width)) for i in range(sections)
+                          if i % 2 == 0 or count >= spec.get("every_other_below", 0)]
+        elif layout == "fixed":
+            placements = [(x, 0, 0) for x in spec["positions"][:count]]
+        else:
+            raise ValueError(f"Unknown spawn layout {layout!r}")
+
+        stagger = spec.get("stagger_ms", 0)
+        speed = spec.get("speed", 1.0)
+        speed_step = spec.get("speed_step", 0.0)
+        fruit_type = spec.get("fruit_type")
+        return tuple(
+            (round(i * stagger / self.tick_ms), dx, low, high, speed + i * speed_step, fruit_type)
+            for i, (dx, low, high) in enumerate(placements)
+        )
+
+    def roll(self, name, drop_size, rng):
+        """Resolve one drop: list of (tick offset, x, speed modifier, fruit type)"""
+        spec = self.patterns.get(name)
+        if spec is None or drop_size == 1 or drop_size < spec.get("min_fruits", 1):
+            name, spec = "single", self.patterns["single"]
+        if spec.get("count") == "random":
+            drop_size = rng.randint(1, drop_size)
+
+        anchor = 0
+        if spec["layout"] in ("row", "cluster"):
+            anchor = rng.randint(*spec["x_range"])
+        wrap = spec.get("wrap", False)
+        clamp = spec.get("clamp")
+
+        spawns = []
+        for tick, dx, low, high, speed, fruit_type in self.timeline(name, drop_size):
+            x = anchor + dx
+            if low != high:
+                x += rng.randint(low, high)
+            if wrap:
+                x %= SCREEN_WIDTH
+            if clamp:
+                x = max(clamp[0], min(clamp[1], x))
+            spawns.append((tick, x, speed, fruit_type))
+        return spawns
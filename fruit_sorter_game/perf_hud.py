@@ -0,0 +1,187 @@
+"""Performance overlay, toggled with F3.
+
+Shows how each frame splits between handle_events, update, draw and
+display.flip (plus the overlay itself and the idle wait in clock.tick),
+a rolling stacked frame-time graph, entity counts and the number of
+surfaces the game allocates per frame.
+
+The overlay is built to be cheap: text is blitted from a cache of
+pre-rendered glyphs, and the graph is one pre-allocated surface that is
+scrolled by a pixel and gets one new column per frame. Phase timing is
+a few perf_counter() calls per frame and always runs, so the graph is
+already full when the overlay is turned on.
+
+Surfaces are counted where the game creates them: the drawing code in
+main.py and sprites.py allocates through new_surface() and
+render_text() below instead of calling pygame.Surface and font.render
+directly. Nothing in pygame is patched, so turning the overlay on does
+not change what it measures. Rotated fruit frames come from the
+collision cache, built once per fruit type, and are not counted.
+"""
+import time
+import itertools
+
+import pygame
+
+PHASES = ("events", "update", "draw", "hud", "flip", "idle")
+PHASE_COLORS = {
+    "events": (255, 150, 60),
+    "update": (60, 255, 120),
+    "draw": (60, 120, 255),
+    "hud": (200, 60, 255),
+    "flip": (255, 255, 60),
+    "idle": (60, 60, 60),
+}
+
+PANEL_WIDTH = 240
+GRAPH_HEIGHT = 50
+GRAPH_MAX_MS = 33.3  # top of the graph: two 60 FPS frames
+LINE_HEIGHT = 14
+TEXT_COLOR = (220, 220, 220)
+SMOOTHING = 0.1  # weight of the newest frame in the displayed averages
+
+
+class SurfaceCounter:
+    """Counts the surfaces the game allocates, at its own allocation sites
+
+    Drawing code creates surfaces through new_surface() and
+    render_text(), which bump this counter. The increment is a next() on
+    an itertools.count, which is atomic, so the render thread of the
+    pipelined mode can count too.
+    """
+    def __init__(self):
+        self.counter = itertools.count()
+        self.taken = next(self.counter)
+
+    def add(self):
+        next(self.counter)
+
+    def take(self):
+        """Return the count since the last call and restart it"""
+        total = next(self.counter)
+        count = total - self.taken - 1
+        self.taken = total
+        return count
+
+
+surface_allocations = SurfaceCounter()
+
+
+def new_surface(size, flags=0):
+    """pygame.Surface(size, flags), counted for the overlay"""
+    surface_allocations.add()
+    return pygame.Surface(size, flags)
+
+
+def render_text(font, text, color, antialias=True):
+    """font.render(text, antialias, color), counted for the overlay"""
+    surface_allocations.add()
+    return font.render(text, antialias, color)
+
+
+class PerfHud:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.visible = False
+        self.font = pygame.font.Font(None, 18)
+        self.glyphs = {}
+
+        # Phase times of the frame in progress, and smoothed ones for display
+        self.frame_start = time.perf_counter()
+        self.lap_start = self.frame_start
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.average = dict.fromkeys(PHASES, 0.0)
+        self.frame_ms = 0.0
+        self.worst_ms = 0.0
+
+        self.surfaces = surface_allocations
+        self.surfaces_per_frame = 0
+        self.counts = {}
+
+        # Allocated once, outside the counted drawing code
+        self.graph = pygame.Surface((PANEL_WIDTH, GRAPH_HEIGHT))
+        self.graph.fill((0, 0, 0))
+        self.panel = pygame.Surface((PANEL_WIDTH + 8, GRAPH_HEIGHT + LINE_HEIGHT * 11 + 8), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 170))
+        self.target_y = GRAPH_HEIGHT - int(GRAPH_HEIGHT * (1000 / 60) / GRAPH_MAX_MS)
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.surfaces.take()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to `phase`"""
+        now = time.perf_counter()
+        self.current[phase] += (now - self.lap_start) * 1000
+        self.lap_start = now
+
+    def begin_frame(self, count_entities=None):
+        """Close the previous frame (its unlapped time is idle) and start a new one
+
+        count_entities() returns {name: count} and is only called while visible.
+        """
+        now = time.perf_counter()
+        self.frame_ms = (now - self.frame_start) * 1000
+        self.current["idle"] += (now - self.lap_start) * 1000
+        self.frame_start = self.lap_start = now
+
+        self.worst_ms = max(self.worst_ms * 0.99, self.frame_ms)
+        for phase in PHASES:
+            self.average[phase] += (self.current[phase] - self.average[phase]) * SMOOTHING
+        self.add_graph_column()
+        for phase in PHASES:
+            self.current[phase] = 0.0
+
+        if self.visible:
+            self.surfaces_per_frame = self.surfaces.take()
+            self.counts = count_entities() if count_entities else {}
+
+    def add_graph_column(self):
+        graph = self.graph
+        graph.scroll(-1, 0)
+        x = PANEL_WIDTH - 1
+        graph.fill((0, 0, 0), (x, 0, 1, GRAPH_HEIGHT))
+        bottom = GRAPH_HEIGHT
+        for phase in PHASES:
+            height = int(self.current[phase] * GRAPH_HEIGHT / GRAPH_MAX_MS)
+            if height > 0:
+                top = max(0, bottom - height)
+                graph.fill(PHASE_COLORS[phase], (x, top, 1, bottom - top))
+                bottom = top
+                if bottom == 0:
+                    break
+        graph.fill((255, 60, 60), (x, self.target_y, 1, 1))
+
+    def glyph(self, char, color):
+        surface = self.glyphs.get((char, color))
+        if surface is None:
+            surface = self.glyphs[(char, color)] = self.font.render(char, True, color)
+        return surface
+
+    def draw_text(self, surface, text, x, y, color=TEXT_COLOR):
+        for char in text:
+            glyph = self.glyph(char, color)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        surface.blit(self.panel, (self.x - 4, self.y - 4))
+        surface.blit(self.graph, (self.x, self.y))
+
+        y = self.y + GRAPH_HEIGHT + 4
+        fps = 1000 / self.frame_ms if self.frame_ms > 0 else 0
+        self.draw_text(surface, f"frame {self.frame_ms:5.1f} ms  worst {self.worst_ms:5.1f}  {fps:4.0f} fps",
+                       self.x, y)
+        y += LINE_HEIGHT
+        for phase in PHASES:
+            self.draw_text(surface, f"{phase:<7}{self.average[phase]:6.2f} ms", self.x, y, PHASE_COLORS[phase])
+            y += LINE_HEIGHT
+        self.draw_text(surface, f"surfaces/frame {self.surfaces_per_frame}", self.x, y)
+        counts = [f"{name} {count}" for name, count in self.counts.items()]
+        for i in range(0, len(counts), 2):
+            y += LINE_HEIGHT
+            self.draw_text(surface, "  ".join(counts[i:i + 2]), self.x, y)
@@ -0,0 +1,165 @@
+"""Pipelined rendering: draw frame N on a worker thread while frame N+1 simulates.
+
+The main thread captures an immutable RenderState after simulating, hands
+it to the render thread, and presents the previously finished frame. The
+render thread runs Game.render_frame against the snapshot into one of two
+back buffers, so it never reads live game objects. Blits, fills and
+transforms release the GIL, which lets drawing overlap the Python-heavy
+update on a multi-core machine.
+
+The mode is experimental. With one core the thread handoff is pure
+overhead: headless.py --pipeline-bench measured 0.75x of sequential
+throughput on a single-CPU machine, and no multi-core figure has been
+recorded yet. Run the benchmark before turning it on.
+"""
+import queue
+import threading
+import time
+
+import pygame
+
+from sprites import ParticleSnapshot
+
+# Game attributes read by render_frame that change during play
+RENDER_SCALARS = (
+    "current_screen", "game_over", "score", "lives", "level", "game_mode",
+    "best_score", "last_milestone", "milestone_increment", "speed_boosted",
+    "sim_time", "unlimited_timer", "timer_start_time", "music_pulse",
+)
+
+
+class RenderState:
+    """Frozen copy of everything Game.render_frame reads
+
+    Dynamic state is copied at construction. Anything else (fonts, the
+    home screen layout) is looked up on the game, and Game methods are
+    bound to this state, so render_frame and the draw_* helpers run
+    unchanged against the snapshot and draw into `surface`. Particles,
+    by far the most numerous objects, are written into the reused
+    `particles` buffer as plain draw tuples rather than copied.
+    """
+    def __init__(self, game, surface, particles=None):
+        self._game = game
+        self.screen = surface
+        for name in RENDER_SCALARS:
+            if hasattr(game, name):
+                setattr(self, name, getattr(game, name))
+
+        self.background = game.background.snapshot()
+        self.particles = game.particles.snapshot(particles)
+        self.start_button = game.start_button.snapshot()
+        self.unlimited_button = game.unlimited_button.snapshot()
+        self.info_button = game.info_button.snapshot()
+        self.mute_button = game.mute_button.snapshot()
+        self.decorative_fruits = [fruit.snapshot() for fruit in game.decorative_fruits]
+        if hasattr(game, "basket"):
+            self.basket = game.basket.snapshot()
+            self.fruits = [fruit.snapshot() for fruit in game.fruits]
+
+    def __getattr__(self, name):
+        # Only reached for attributes not copied above
+        value = getattr(type(self._game), name, None)
+        if callable(value):
+            return value.__get__(self)
+        return getattr(self._game, name)
+
+
+class RenderPipeline:
+    def __init__(self, game):
+        self.game = game
+        size = game.screen.get_size()
+        self.buffers = [pygame.Surface(size), pygame.Surface(size)]
+        self.particle_buffers = [ParticleSnapshot(), ParticleSnapshot()]
+        self.next_buffer = 0
+        self.requests = queue.Queue(maxsize=1)
+        self.finished = queue.Queue(maxsize=1)
+        self.in_flight = False
+        self.thread = threading.Thread(target=self._render_worker, daemon=True)
+        self.thread.start()
+
+    def _render_worker(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            state, alpha = request
+            state.render_frame(alpha)
+            self.finished.put(state.screen)
+
+    def wait(self):
+        """Block until the frame in flight is drawn and return its buffer"""
+        if not self.in_flight:
+            return None
+        self.in_flight = False
+        return self.finished.get()
+
+    def submit(self, alpha=None):
+        """Snapshot the game and start drawing it on the render thread"""
+        game = self.game
+        game.music_pulse = game.music.get_pulse()
+        surface = self.buffers[self.next_buffer]
+        particles = self.particle_buffers[self.next_buffer]
+        self.next_buffer ^= 1
+        self.requests.put((RenderState(game, surface, particles), alpha))
+        self.in_flight = True
+
+    def draw(self, alpha=None, present=True):
+        """Pipelined replacement for Game.draw
+
+        Starts rendering this frame and presents the previous one while the
+        render thread works, so the caller can go on simulating.
+        """
+        done = self.wait()
+        self.submit(alpha)
+        if done is not None and present:
+            self.game.screen.blit(done, (0, 0))
+            self.game.present()
+
+    def stop(self):
+        self.wait()
+        self.requests.put(None)
+        self.thread.join()
+
+
+def measure_throughput(game, frames=600, ticks_per_frame=1, block=30):
+    """Time `frames` update+draw frames sequentially and pipelined
+
+    The two modes alternate in blocks of `block` frames, so both are
+    timed over the same stretch of the session rather than one of them
+    over a busier part. Drawing goes to an offscreen surface in both
+    cases so the display driver does not affect the comparison. Returns
+    frames per second for each mode and the speedup.
+    """
+    offscreen = pygame.Surface(game.screen.get_size())
+    display = game.screen
+    pipeline = RenderPipeline(game)
+    sequential = pipelined = 0.0
+
+    for done in range(0, frames, block):
+        count = min(block, frames - done)
+
+        game.screen = offscreen
+        start = time.perf_counter()
+        for _ in range(count):
+            for _ in range(ticks_per_frame):
+                game.update()
+            game.music_pulse = game.music.get_pulse()
+            game.render_frame()
+        sequential += time.perf_counter() - start
+        game.screen = display
+
+        start = time.perf_counter()
+        for _ in range(count):
+            for _ in range(ticks_per_frame):
+                game.update()
+            pipeline.draw(present=False)
+        pipeline.wait()
+        pipelined += time.perf_counter() - start
+    pipeline.stop()
+
+    return {
+        "frames": frames,
+        "sequential_fps": frames / sequential,
+        "pipelined_fps": frames / pipelined,
+        "speedup": sequential / pipelined,
+    }
@@ -0,0 +1,44 @@
+class Pool:
+    """Free list of reusable objects
+
+    acquire() hands back a released object after calling its reset() with
+    the same arguments the constructor takes, so images, masks and other
+    per-type data are reused instead of reallocated. A new object is only
+    built when the free list is empty.
+    """
+    def __init__(self, factory, name=None):
+        self.factory = factory
+        self.name = name or factory.__name__
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+
+    def __len__(self):
+        return self.in_use + len(self.free)
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "size": len(self),
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "created": self.created,
+        }
@@ -0,0 +1,78 @@
+"""On-demand cProfile captures of the game loop.
+
+F9 starts a capture and F9 again stops it. Setting FRUIT_PROFILE=1
+profiles the whole Game.run loop instead, from the first frame until
+the game exits. Every capture is dumped to its own .prof file, tagged
+in the name with the screen, game mode and entity counts at the moment
+it stopped, and the top 20 functions by cumulative time are printed.
+
+    FRUIT_PROFILE=1 python main.py
+    python -m pstats profiles/20261019-150102_game_unlimited_f12_p340.prof
+
+FRUIT_PROFILE_DIR changes where the files go (default: profiles/).
+"""
+import os
+import time
+import pstats
+import cProfile
+
+PROFILE_ENV = "FRUIT_PROFILE"
+PROFILE_DIR_ENV = "FRUIT_PROFILE_DIR"
+TOP_FUNCTIONS = 20
+
+
+class SessionProfiler:
+    def __init__(self, out_dir=None):
+        self.out_dir = out_dir or os.environ.get(PROFILE_DIR_ENV, "profiles")
+        self.profile = None
+        self.started = 0.0
+        self.from_env = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def start(self):
+        if self.active:
+            return
+        self.profile = cProfile.Profile()
+        self.started = time.perf_counter()
+        print("Profiling started")
+        self.profile.enable()
+
+    def stop(self, game):
+        """Stop the capture, dump it and print the hot spots; returns the file path"""
+        if not self.active:
+            return None
+        self.profile.disable()
+        profile = self.profile
+        self.profile = None
+        seconds = time.perf_counter() - self.started
+
+        tag = self.tag(game)
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{tag}.prof")
+        profile.dump_stats(path)
+
+        print(f"Profile of {seconds:.1f}s saved to {path} ({tag})")
+        stats = pstats.Stats(profile)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        return path
+
+    def toggle(self, game):
+        if self.active:
+            self.stop(game)
+        else:
+            self.start()
+
+    def tag(self, game):
+        counts = game.count_entities()
+        mode = getattr(game, "game_mode", None) if game.current_screen == "game" else None
+        return "_".join([
+            game.current_screen,
+            mode or "none",
+            f"f{counts['fruits']}",
+            f"p{counts['particles']}",
+            f"l{counts['lasers']}",
+            f"x{counts['explosions']}",
+        ])
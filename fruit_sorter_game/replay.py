@@ -0,0 +1,163 @@
+"""Compact per-tick input recording and playback.
+
+File layout (all integers are unsigned LEB128 varints):
+
+    b"NFCR" version seed sim_rate tick_count
+    then one record per tick whose input differs from "same keys, no events":
+        tick_delta flags [click_count (dx dy)*]
+
+flags bit 0/1 are the A/D keys, bit 2 is escape and bit 3 means clicks
+follow. Click coordinates are zigzag-encoded deltas from the previous
+click, so a typical session is a few hundred bytes.
+"""
+import hashlib
+
+MAGIC = b"NFCR"
+VERSION = 1
+
+FLAG_LEFT = 1
+FLAG_RIGHT = 2
+FLAG_ESCAPE = 4
+FLAG_CLICKS = 8
+
+
+def write_varint(out, value):
+    if value < 0:
+        raise ValueError(f"varints are unsigned, got {value}")
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    """Return (value, new_pos)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+class ReplayRecorder:
+    def __init__(self, path, seed, sim_rate):
+        self.path = path
+        self.seed = seed
+        self.sim_rate = sim_rate
+        self.body = bytearray()
+        self.tick = 0
+        self.last_record_tick = 0
+        self.last_keys = 0
+        self.last_click = (0, 0)
+
+    def record(self, left, right, clicks, escape):
+        """Record the input consumed by one tick"""
+        flags = (FLAG_LEFT if left else 0) | (FLAG_RIGHT if right else 0)
+        keys = flags
+        if escape:
+            flags |= FLAG_ESCAPE
+        if clicks:
+            flags |= FLAG_CLICKS
+
+        # Only ticks where something changed are stored
+        if keys != self.last_keys or flags & (FLAG_ESCAPE | FLAG_CLICKS):
+            write_varint(self.body, self.tick - self.last_record_tick)
+            self.body.append(flags)
+            if clicks:
+                write_varint(self.body, len(clicks))
+                for x, y in clicks:
+                    write_varint(self.body, zigzag(x - self.last_click[0]))
+                    write_varint(self.body, zigzag(y - self.last_click[1]))
+                    self.last_click = (x, y)
+            self.last_record_tick = self.tick
+            self.last_keys = keys
+
+        self.tick += 1
+
+    def to_bytes(self):
+        header = bytearray(MAGIC)
+        header.append(VERSION)
+        write_varint(header, self.seed)
+        write_varint(header, self.sim_rate)
+        write_varint(header, self.tick)
+        return bytes(header + self.body)
+
+    def close(self):
+        with open(self.path, "wb") as f:
+            f.write(self.to_bytes())
+        print(f"Replay saved to {self.path} ({self.tick} ticks, {len(self.body)} bytes of input)")
+
+
+class ReplayPlayer:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        if data[4] != VERSION:
+            raise ValueError(f"Unsupported replay version {data[4]}")
+
+        pos = 5
+        self.seed, pos = read_varint(data, pos)
+        self.sim_rate, pos = read_varint(data, pos)
+        self.tick_count, pos = read_varint(data, pos)
+
+        # Decode into {tick: (flags, clicks)}
+        self.records = {}
+        tick = 0
+        last_click = (0, 0)
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            tick += delta
+            flags = data[pos]
+            pos += 1
+            clicks = []
+            if flags & FLAG_CLICKS:
+                count, pos = read_varint(data, pos)
+                for _ in range(count):
+                    dx, pos = read_varint(data, pos)
+                    dy, pos = read_varint(data, pos)
+                    last_click = (last_click[0] + unzigzag(dx), last_click[1] + unzigzag(dy))
+                    clicks.append(last_click)
+            self.records[tick] = (flags, clicks)
+
+        self.tick = 0
+        self.keys = 0
+
+    def finished(self):
+        return self.tick >= self.tick_count
+
+    def feed(self, game):
+        """Set the game's input for the next tick"""
+        flags, clicks = self.records.get(self.tick, (self.keys, []))
+        self.keys = flags & (FLAG_LEFT | FLAG_RIGHT)
+        game.input_left = bool(flags & FLAG_LEFT)
+        game.input_right = bool(flags & FLAG_RIGHT)
+        game.input_escape = bool(flags & FLAG_ESCAPE)
+        game.input_clicks = list(clicks)
+        self.tick += 1
+
+
+def state_digest(game):
+    """Short hash of the gameplay state, for checking replays match"""
+    parts = [game.current_screen, round(game.sim_time, 6)]
+    if hasattr(game, "score"):
+        parts += [game.score, game.lives, game.level, game.game_over, game.basket.x]
+        parts += [(f.fruit_type, f.x, f.y, f.speed) for f in game.fruits]
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
@@ -0,0 +1,25 @@
+import random
+import argparse
+
+# One stream per subsystem, so extra draws in one (say, more particles)
+# never shift the sequence another one sees
+STREAMS = ("spawn", "fruit", "particles", "background", "render")
+
+def seed_arg(text):
+    """argparse type for --seed; replays store the seed as an unsigned varint"""
+    seed = int(text)
+    if seed < 0:
+        raise argparse.ArgumentTypeError(f"seed must not be negative: {seed}")
+    return seed
+
+class RandomStreams:
+    """Independent seeded random.Random instances for each game subsystem"""
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+
+        # String seeds are hashed with SHA-512, so streams are stable across
+        # runs and Python processes regardless of PYTHONHASHSEED
+        for name in STREAMS:
+            setattr(self, name, random.Random(f"{seed}:{name}"))
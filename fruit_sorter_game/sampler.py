@@ -0,0 +1,183 @@
+"""Statistical sampling profiler for the game loop.
+
+A daemon thread wakes up `hz` times a second, reads the main thread's
+stack with sys._current_frames() and counts it as a collapsed stack
+("outer;inner;innermost"). Unlike cProfile nothing is hooked into the
+profiled code, so the frame timings stay close to the real thing.
+
+Samples are also collected per frame. When a frame's work (everything
+but the wait in clock.tick) takes longer than the budget, that frame's
+samples are added to a separate hitch capture, so the spikes in
+Game.update and Game.draw can be told apart from the steady-state cost.
+
+Both are written in the collapsed format read by flamegraph.pl,
+speedscope and inferno when the game exits:
+
+    FRUIT_SAMPLE=500 python main.py
+    flamegraph.pl samples/20261019-151500.collapsed > profile.svg
+
+FRUIT_SAMPLE is the sample rate in Hz and FRUIT_SAMPLE_BUDGET_MS the
+hitch threshold (default 16.7).
+
+Running this module checks that frames the game loop skips to catch up
+(the most overloaded ones) still end up in the hitch capture:
+
+    python sampler.py
+"""
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+SAMPLE_ENV = "FRUIT_SAMPLE"
+BUDGET_ENV = "FRUIT_SAMPLE_BUDGET_MS"
+SAMPLE_DIR = "samples"
+MAX_DEPTH = 64
+
+
+class StackSampler:
+    def __init__(self, hz=200, budget_ms=1000 / 60, out_dir=SAMPLE_DIR):
+        self.interval = 1.0 / hz
+        self.budget_ms = budget_ms
+        self.out_dir = out_dir
+        self.stacks = Counter()
+        self.hitch_stacks = Counter()
+        self.frame_samples = []
+        self.hitches = 0
+        self.frames = 0
+        self.labels = {}
+        self.target = threading.main_thread().ident
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @classmethod
+    def from_env(cls):
+        """Sampler configured from the environment, or None if not requested"""
+        hz = os.environ.get(SAMPLE_ENV, "")
+        if hz in ("", "0"):
+            return None
+        budget = float(os.environ.get(BUDGET_ENV, 1000 / 60))
+        return cls(hz=float(hz), budget_ms=budget)
+
+    def start(self):
+        self.target = threading.get_ident()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._sample_loop, name="stack-sampler", daemon=True)
+        self.thread.start()
+        print(f"Sampling the main thread at {1 / self.interval:.0f} Hz")
+
+    def stop(self):
+        if self.thread:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self.labels[code] = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def collapse(self, frame):
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(self.label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+
+    def _sample_loop(self):
+        target = self.target
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = self.collapse(frame)
+            del frame
+            self.stacks[stack] += 1
+            self.frame_samples.append(stack)
+
+    def begin_frame(self):
+        """Drop samples taken since the last frame ended (the clock.tick wait)"""
+        self.frame_samples = []
+
+    def end_frame(self, work_ms):
+        """Keep this frame's samples as a hitch if its work blew the budget"""
+        samples = self.frame_samples
+        self.frame_samples = []
+        self.frames += 1
+        if work_ms > self.budget_ms:
+            self.hitches += 1
+            self.hitch_stacks.update(samples)
+
+    def write(self):
+        """Write the collapsed stacks; returns (all samples path, hitch path)"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, time.strftime("%Y%m%d-%H%M%S"))
+        paths = (f"{base}.collapsed", f"{base}_hitches.collapsed")
+        for path, stacks in zip(paths, (self.stacks, self.hitch_stacks)):
+            with open(path, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        print(f"{sum(self.stacks.values())} samples saved to {paths[0]}")
+        print(f"{self.hitches} of {self.frames} frames over {self.budget_ms:.1f} ms, "
+              f"{sum(self.hitch_stacks.values())} of their samples saved to {paths[1]}")
+        return paths
+
+
+def check_skipped_frames(frames=60, tick_delay=0.025):
+    """Run Game.run headless with every tick slowed by `tick_delay` seconds
+
+    Most frames then run out of catch-up ticks and skip drawing. Returns
+    (loop iterations, frames skipped, frames the sampler closed, hitches
+    captured, hitch samples).
+    """
+    import tempfile
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import Game
+
+    game = Game(seed=1, display_fps=0)
+    sampler = game.sampler = StackSampler(hz=500, out_dir=tempfile.mkdtemp())
+    update = game.update
+    handle_events = game.handle_events
+    draw = game.draw
+    iterations = [0]
+    drawn = [0]
+
+    def slow_update():
+        time.sleep(tick_delay)
+        update()
+
+    def counted_events():
+        iterations[0] += 1
+        handle_events()
+        if iterations[0] == frames:
+            game.running = False
+
+    def counted_draw(*args):
+        drawn[0] += 1
+        draw(*args)
+
+    game.update = slow_update
+    game.handle_events = counted_events
+    game.draw = counted_draw
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    skipped = iterations[0] - drawn[0]
+    return iterations[0], skipped, sampler.frames, sampler.hitches, sum(sampler.hitch_stacks.values())
+
+
+if __name__ == "__main__":
+    iterations, skipped, closed, hitches, samples = check_skipped_frames()
+    print(f"{iterations} loop iterations, {skipped} skipped, {closed} frames closed, "
+          f"{hitches} hitches, {samples} hitch samples")
+    if not skipped or closed != iterations or hitches < skipped or not samples:
+        print("FAIL: overloaded frames are missing from the hitch capture")
+        sys.exit(1)
+    print("Skipped frames are captured")
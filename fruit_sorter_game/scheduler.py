@@ -0,0 +1,80 @@
+"""Callbacks keyed on simulation time.
+
+Game.update calls run_due() once per tick, and only the events that are
+actually due are popped off the heap, instead of every timer being
+compared against the clock every frame. Times are simulation
+milliseconds (Game.sim_time), so timers behave the same in real time,
+headless fast-forward and replays.
+"""
+import heapq
+import itertools
+
+
+class ScheduledEvent:
+    __slots__ = ("due", "callback", "args", "interval", "group", "cancelled")
+
+    def __init__(self, due, callback, args, interval, group):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.group = group
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self):
+        self.queue = []
+        # Ties on due time run in the order they were scheduled
+        self.counter = itertools.count()
+        self.now = 0.0
+
+    def __len__(self):
+        return sum(1 for _, _, event in self.queue if not event.cancelled)
+
+    def at(self, due, callback, *args, interval=None, group=None):
+        """Run callback(*args) once the clock reaches `due`
+
+        With an interval the event repeats, `interval` ms after each time
+        it actually runs (a stalled clock does not cause a burst of
+        catch-up calls).
+        """
+        event = ScheduledEvent(due, callback, args, interval, group)
+        heapq.heappush(self.queue, (due, next(self.counter), event))
+        return event
+
+    def after(self, delay, callback, *args, interval=None, group=None):
+        """Run callback(*args) `delay` ms from now"""
+        return self.at(self.now + delay, callback, *args, interval=interval, group=group)
+
+    def every(self, interval, callback, *args, group=None):
+        """Run callback(*args) every `interval` ms, starting one interval from now"""
+        return self.after(interval, callback, *args, interval=interval, group=group)
+
+    def cancel(self, event):
+        if event is not None:
+            event.cancelled = True
+
+    def cancel_group(self, group):
+        for _, _, event in self.queue:
+            if event.group == group:
+                event.cancelled = True
+
+    def clear(self):
+        self.queue.clear()
+
+    def run_due(self, now):
+        """Advance the clock to `now` and run every event that is due"""
+        self.now = now
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            _, _, event = heapq.heappop(queue)
+            if event.cancelled:
+                continue
+            event.callback(*event.args)
+            if event.interval is not None and not event.cancelled:
+                event.due = now + event.interval
+                heapq.heappush(queue, (event.due, next(self.counter), event))
@@ -0,0 +1,3 @@
+"""Window size shared by the game, its sprites and the headless tools"""
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
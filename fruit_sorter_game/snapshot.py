@@ -0,0 +1,245 @@
+"""Binary game-state snapshots and a delta-compressed rewind buffer.
+
+A snapshot is a fixed-layout header (struct, including the due times of
+the session's scheduled events), the spawn/fruit RNG states
+(uint32 arrays) and one fixed-size record per fruit (numpy structured
+array). Particles, the background and audio are presentation only and
+are not captured.
+"""
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+MAGIC = b"NFCS"
+VERSION = 3
+
+SCREENS = ["home", "game", "info"]
+MODES = ["normal", "unlimited"]
+FRUIT_TYPES = ["apple", "banana", "orange", "star_fruit", "blueberry", "bomb"]
+
+# Streams that feed gameplay decisions; the others only drive effects
+SNAPSHOT_STREAMS = ("spawn", "fruit")
+RNG_STATE_WORDS = 625  # Mersenne Twister state plus index
+
+HEADER = struct.Struct(
+    "<4sBBB"  # magic, version, screen, has_session
+    "diii"    # sim_time, best_score, fruit count, pending spawn count
+    "BBBB"    # mode, game_over, speed_boosted, pattern
+    "iiid"    # score, lives, level, fruit_speed
+    "ddd"     # game_over_time, timer_start_time, game_start_time
+    "di"      # next fruit spawn due, fruit_spawn_delay
+    "di"      # next bomb spawn due, bomb_spawn_delay
+    "d"       # next pattern change due
+    "iii"     # last_milestone, fruits_per_drop, max_fruits_per_drop
+    "dddd"    # basket x, prev_x, target_x, pulse_factor
+)
+
+FRUIT_DTYPE = np.dtype([
+    ("type", "u1"),
+    ("x", "<f8"), ("y", "<f8"), ("prev_x", "<f8"), ("prev_y", "<f8"),
+    ("speed", "<f8"),
+    ("rotation", "<f8"), ("rotation_speed", "<f8"),
+    ("pulse_factor", "<f8"), ("pulse_speed", "<f8"),
+])
+
+# Fruits of a staggered drop that have not spawned yet
+PENDING_DTYPE = np.dtype([
+    ("due", "<f8"), ("x", "<f8"), ("type", "u1"), ("speed", "<f8"),
+])
+
+
+def capture(game):
+    """Serialize the gameplay state of a Game to bytes"""
+    in_session = hasattr(game, "basket")
+    fruits = list(game.fruits) if in_session else []
+    pending = game.pending_spawns if in_session else []
+
+    if in_session:
+        basket = game.basket
+        session = (
+            MODES.index(game.game_mode), game.game_over, game.speed_boosted,
+            game.patterns.names.index(game.fruit_pattern),
+            game.score, game.lives, game.level, game.fruit_speed,
+            getattr(game, "game_over_time", 0), game.timer_start_time, game.game_start_time,
+            game.fruit_spawn_event.due, game.fruit_spawn_delay,
+            game.bomb_spawn_event.due, game.bomb_spawn_delay,
+            game.pattern_event.due,
+            game.last_milestone, game.fruits_per_drop, game.max_fruits_per_drop,
+            basket.x, basket.prev_x, basket.target_x, basket.pulse_factor,
+        )
+    else:
+        session = (0,) * 19 + (0.0,) * 4
+
+    header = HEADER.pack(
+        MAGIC, VERSION, SCREENS.index(game.current_screen), in_session,
+        game.sim_time, game.best_score, len(fruits), len(pending),
+        *session
+    )
+
+    rng_words = np.empty((len(SNAPSHOT_STREAMS), RNG_STATE_WORDS), dtype="<u4")
+    for i, name in enumerate(SNAPSHOT_STREAMS):
+        rng_words[i] = getattr(game.rng, name).getstate()[1]
+
+    records = np.empty(len(fruits), dtype=FRUIT_DTYPE)
+    for i, fruit in enumerate(fruits):
+        records[i] = (
+            FRUIT_TYPES.index(fruit.fruit_type),
+            fruit.x, fruit.y, fruit.prev_x, fruit.prev_y, fruit.speed,
+            fruit.rotation, fruit.rotation_speed,
+            fruit.pulse_factor, fruit.pulse_speed,
+        )
+
+    spawns = np.array([(due, x, FRUIT_TYPES.index(fruit_type), speed)
+                       for due, x, fruit_type, speed in pending], dtype=PENDING_DTYPE)
+
+    return header + rng_words.tobytes() + records.tobytes() + spawns.tobytes()
+
+
+def restore(game, data):
+    """Load a snapshot produced by capture() into a Game"""
+    fields = HEADER.unpack_from(data)
+    magic, version, screen, in_session, sim_time, best_score, fruit_count, pending_count = fields[:8]
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a compatible game snapshot")
+
+    offset = HEADER.size
+    rng_bytes = len(SNAPSHOT_STREAMS) * RNG_STATE_WORDS * 4
+    rng_words = np.frombuffer(data, dtype="<u4", count=len(SNAPSHOT_STREAMS) * RNG_STATE_WORDS, offset=offset)
+    rng_words = rng_words.reshape(len(SNAPSHOT_STREAMS), RNG_STATE_WORDS)
+    offset += rng_bytes
+    records = np.frombuffer(data, dtype=FRUIT_DTYPE, count=fruit_count, offset=offset)
+    offset += fruit_count * FRUIT_DTYPE.itemsize
+    spawns = np.frombuffer(data, dtype=PENDING_DTYPE, count=pending_count, offset=offset)
+
+    if in_session:
+        # Start from a fresh session so every derived attribute exists
+        if not hasattr(game, "basket") or game.current_screen != "game":
+            game.start_new_game(MODES[fields[8]])
+        (mode, game_over, speed_boosted, pattern,
+         game.score, game.lives, game.level, game.fruit_speed,
+         game.game_over_time, game.timer_start_time, game.game_start_time,
+         fruit_due, game.fruit_spawn_delay,
+         bomb_due, game.bomb_spawn_delay,
+         pattern_due,
+         game.last_milestone, game.fruits_per_drop, game.max_fruits_per_drop,
+         basket_x, basket_prev_x, basket_target_x, basket_pulse) = fields[8:]
+        game.game_mode = MODES[mode]
+        game.game_over = bool(game_over)
+        game.speed_boosted = bool(speed_boosted)
+        game.fruit_pattern = game.patterns.names[pattern]
+        game.pending_spawns = [(due, x, FRUIT_TYPES[fruit_type], speed)
+                               for due, x, fruit_type, speed in spawns.tolist()]
+
+        basket = game.basket
+        basket.x, basket.prev_x, basket.target_x = basket_x, basket_prev_x, basket_target_x
+        basket.pulse_factor = basket_pulse
+        basket.rect.centerx = round(basket.x)
+
+        for fruit in list(game.fruits):
+            game.remove_fruit(fruit)
+        for (fruit_type, x, y, prev_x, prev_y, speed,
+             rotation, rotation_speed, pulse_factor, pulse_speed) in records.tolist():
+            fruit = game.fruit_pool.acquire(x, y, FRUIT_TYPES[fruit_type], "basket", speed, game.rng.fruit)
+            fruit.rotation = rotation
+            fruit.rotation_speed = rotation_speed
+            fruit.pulse_factor = pulse_factor
+            fruit.pulse_speed = pulse_speed
+            fruit.update(0)  # Rebuild the rotated image and rect
+            fruit.x, fruit.y = x, y
+            fruit.prev_x, fruit.prev_y = prev_x, prev_y
+            game.add_fruit(fruit)
+
+    game.current_screen = SCREENS[screen]
+    game.sim_time = sim_time
+    game.best_score = best_score
+    game.scheduler.now = sim_time
+    
+    # Timed events are not stored, only their due times; re-arm them
+    if in_session:
+        if game.game_over:
+            game.schedule_return_home()
+        else:
+            game.schedule_session(fruit_due, bomb_due, pattern_due)
+    else:
+        game.scheduler.cancel_group("session")
+
+    # RNG state last: creating the fruits above drew from the fruit stream
+    for i, name in enumerate(SNAPSHOT_STREAMS):
+        getattr(game.rng, name).setstate((3, tuple(rng_words[i].tolist()), None))
+
+
+def xor_bytes(a, b):
+    """XOR two byte strings, zero-padding the shorter one"""
+    size = max(len(a), len(b))
+    left = np.zeros(size, dtype=np.uint8)
+    right = np.zeros(size, dtype=np.uint8)
+    left[:len(a)] = np.frombuffer(a, dtype=np.uint8)
+    right[:len(b)] = np.frombuffer(b, dtype=np.uint8)
+    return (left ^ right).tobytes()
+
+
+class RewindBuffer:
+    """Ring buffer of recent snapshots with bounded memory
+
+    A snapshot is taken every `interval` ticks. Every `keyframe_every`-th
+    one is stored whole; the rest are stored as the XOR against their
+    keyframe, which is mostly zeros and compresses to a few hundred bytes.
+    Restoring any entry is one decompress plus one XOR.
+    """
+    def __init__(self, seconds=10, sim_rate=60, interval=6, keyframe_every=20):
+        self.interval = interval
+        self.keyframe_every = keyframe_every
+        self.entries = deque(maxlen=max(1, int(seconds * sim_rate / interval)))
+        self.ticks = 0
+        self.captured = 0
+        self.keyframe_raw = None
+        self.keyframe = None  # Compressed, shared by the deltas that follow it
+
+    def tick(self, game):
+        """Call once per simulation tick"""
+        if self.ticks % self.interval == 0:
+            self.push(game)
+        self.ticks += 1
+
+    def push(self, game):
+        data = capture(game)
+        if self.captured % self.keyframe_every == 0:
+            self.keyframe_raw = data
+            self.keyframe = zlib.compress(data, 1)
+            delta = None
+        else:
+            delta = (len(data), zlib.compress(xor_bytes(data, self.keyframe_raw), 1))
+        self.entries.append((game.sim_time, self.keyframe, delta))
+        self.captured += 1
+
+    def decode(self, entry):
+        _, keyframe, delta = entry
+        base = zlib.decompress(keyframe)
+        if delta is None:
+            return base
+        size, packed = delta
+        return xor_bytes(zlib.decompress(packed), base)[:size]
+
+    def rewind(self, game, seconds):
+        """Restore the newest snapshot at least `seconds` older than now"""
+        if not self.entries:
+            return False
+        target = game.sim_time - seconds * 1000
+        chosen = self.entries[0]
+        for entry in reversed(self.entries):
+            if entry[0] <= target:
+                chosen = entry
+                break
+
+        # Forget everything newer than the restored point
+        while self.entries and self.entries[-1] is not chosen:
+            self.entries.pop()
+        restore(game, self.decode(chosen))
+        return True
+
+    def memory_bytes(self):
+        keyframes = {id(entry[1]): len(entry[1]) for entry in self.entries}
+        deltas = sum(len(entry[2][1]) for entry in self.entries if entry[2])
+        return sum(keyframes.values()) + deltas
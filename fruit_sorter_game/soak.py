@@ -0,0 +1,245 @@
+"""Headless soak test: play many sessions back to back and watch for drift.
+
+Cycles home -> game -> game over -> home for thousands of simulated
+sessions with a scripted player, alternating game modes, and every few
+sessions samples:
+
+- process RSS and tracemalloc's traced memory
+- live objects per class (gc.get_objects), and the sizes of the
+  unbounded lists: fruits, particles, lasers, explosion particles, the
+  scheduler queue and pending spawns
+- update + draw time per tick (mean and p95 over the window)
+
+At the end a straight line is fitted through each series (after a
+warm-up share of the samples) and anything whose fitted growth over the
+run is above the threshold is flagged. The allocation sites that grew
+most since the end of the warm-up are listed from tracemalloc.
+
+    python soak.py --sessions 2000 --draw-every 4
+    python soak.py --sessions 50 --sample-every 5 --json soak.json
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from collections import Counter
+
+# The dummy drivers must be selected before pygame is initialized
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+from main import Game
+from autopilot import SCRIPTS
+from rng import seed_arg
+
+# Series checked for an upward trend: (key, minimum absolute growth to care about)
+TREND_SERIES = [
+    ("rss_mb", 2.0),
+    ("traced_mb", 1.0),
+    ("objects", 500),
+    ("fruits", 20),
+    ("particles", 500),
+    ("lasers", 20),
+    ("explosions", 100),
+    ("scheduled", 20),
+    ("pending", 20),
+    ("tick_ms", 0.05),
+    ("tick_p95_ms", 0.1),
+]
+
+# Fewer fitted samples than this are reported but never flagged
+MIN_SAMPLES = 5
+
+
+def rss_mb():
+    """Resident set size, from /proc where available (peak RSS otherwise)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def count_objects():
+    """Live gc-tracked objects per class name"""
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def take_sample(game, session, tick_times, use_tracemalloc):
+    gc.collect()
+    classes = count_objects()
+    times = np.array(tick_times) if tick_times else np.zeros(1)
+    return {
+        "session": session,
+        "sim_hours": game.sim_time / 3600000,
+        "rss_mb": rss_mb(),
+        "traced_mb": tracemalloc.get_traced_memory()[0] / 2 ** 20 if use_tracemalloc else 0.0,
+        "objects": sum(classes.values()),
+        "classes": dict(classes),
+        "fruits": len(game.fruits) if hasattr(game, "fruits") else 0,
+        "particles": len(game.particles.particles),
+        "lasers": len(game.background.lasers),
+        "explosions": len(game.background.explosion_particles),
+        "scheduled": len(game.scheduler.queue),
+        "pending": len(getattr(game, "pending_spawns", ())),
+        "tick_ms": float(times.mean()),
+        "tick_p95_ms": float(np.percentile(times, 95)),
+    }
+
+
+def take_snapshot():
+    """tracemalloc snapshot without the soak test's own bookkeeping"""
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+
+def fitted_growth(values):
+    """Growth over the series according to a least-squares line"""
+    if len(values) < 3:
+        return 0.0
+    slope = np.polyfit(np.arange(len(values)), np.asarray(values, dtype=float), 1)[0]
+    return float(slope * (len(values) - 1))
+
+
+def find_trends(samples, warmup, threshold, time_threshold):
+    """Return [(name, start value, fitted growth, flagged)] for each series
+
+    Tick times use their own, looser threshold: they also move with
+    whatever else the machine is doing.
+    """
+    kept = samples[int(len(samples) * warmup):]
+    enough = len(kept) >= MIN_SAMPLES
+    trends = []
+    for key, min_growth in TREND_SERIES:
+        values = [sample[key] for sample in kept]
+        growth = fitted_growth(values)
+        start = values[0] if values else 0
+        relative = growth / start if start else float(growth > 0)
+        limit = time_threshold if key.startswith("tick") else threshold
+        trends.append((key, start, growth, enough and growth > min_growth and relative > limit))
+
+    # Per-class counts, for the classes that grew the most
+    if len(kept) >= 3:
+        first, last = kept[0]["classes"], kept[-1]["classes"]
+        grown = sorted(last, key=lambda name: last[name] - first.get(name, 0), reverse=True)[:10]
+        for name in grown:
+            values = [sample["classes"].get(name, 0) for sample in kept]
+            growth = fitted_growth(values)
+            start = values[0]
+            relative = growth / start if start else float(growth > 0)
+            trends.append((f"class {name}", start, growth, enough and growth > 100 and relative > threshold))
+    return trends
+
+
+def run_soak(game, sessions, modes, script, sample_every, draw_every, use_tracemalloc, warmup):
+    """Play `sessions` sessions
+
+    Returns the samples and the tracemalloc snapshots taken at the end
+    of the warm-up and at the last sample.
+    """
+    samples = []
+    snapshots = []
+    # The trend fit starts at this sample; snapshot just before it, so the
+    # snapshot's own memory is in every fitted sample
+    first_fitted = int((sessions // sample_every + 1) * warmup)
+    tick_times = []
+    session = 0
+    tick = 0
+    started = time.perf_counter()
+
+    while session <= sessions:
+        if game.current_screen != "game":
+            # Home (or back from game over): start the next session
+            if session % sample_every == 0:
+                samples.append(take_sample(game, session, tick_times, use_tracemalloc))
+                tick_times = []
+                if use_tracemalloc and (len(samples) == max(1, first_fitted) or session == sessions):
+                    snapshots.append(take_snapshot())
+                sample = samples[-1]
+                print(f"session {session:>6}  {sample['sim_hours']:6.2f} h sim  "
+                      f"{time.perf_counter() - started:7.0f} s wall  rss {sample['rss_mb']:7.1f} MB  "
+                      f"traced {sample['traced_mb']:6.1f} MB  objects {sample['objects']:>8}  "
+                      f"tick {sample['tick_ms']:.3f} ms (p95 {sample['tick_p95_ms']:.3f})", flush=True)
+            if session == sessions:
+                break
+            mode = modes[session % len(modes)]
+            button = game.unlimited_button if mode == "unlimited" else game.start_button
+            game.input_clicks.append(button.rect.center)
+            session += 1
+        else:
+            game.input_left, game.input_right = script(game, tick)
+
+        start = time.perf_counter()
+        game.update()
+        if tick % draw_every == 0:
+            game.draw()
+        tick_times.append((time.perf_counter() - start) * 1000)
+        tick += 1
+    return samples, snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless soak test for memory and frame-time drift")
+    parser.add_argument("--sessions", type=int, default=200, help="game sessions to play")
+    parser.add_argument("--modes", default="normal,unlimited", help="comma list of modes, used in turn")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="autopilot", help="scripted player")
+    parser.add_argument("--seed", type=seed_arg, default=1, help="seed for all gameplay randomness")
+    parser.add_argument("--sample-every", type=int, default=10, help="sessions between samples")
+    parser.add_argument("--draw-every", type=int, default=4, help="draw every Nth tick (1 draws every tick)")
+    parser.add_argument("--warmup", type=float, default=0.25, help="share of samples ignored by the trend fit")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="flag series whose fitted growth exceeds this fraction of their start value")
+    parser.add_argument("--time-threshold", type=float, default=0.2, help="the same for tick times")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip tracemalloc (runs about twice as fast)")
+    parser.add_argument("--json", metavar="PATH", help="write the samples and trends as JSON")
+    args = parser.parse_args()
+
+    use_tracemalloc = not args.no_tracemalloc
+    if use_tracemalloc:
+        tracemalloc.start()
+
+    game = Game(display_fps=0, seed=args.seed)
+    # Background decoding would otherwise show up as growth in the first samples
+    game.music.wait_decoded()
+    modes = args.modes.split(",")
+    samples, snapshots = run_soak(game, args.sessions, modes, SCRIPTS[args.script],
+                                  args.sample_every, args.draw_every, use_tracemalloc, args.warmup)
+    game.music.stop()
+
+    trends = find_trends(samples, args.warmup, args.threshold, args.time_threshold)
+    print(f"\nTrends over {len(samples)} samples (first {args.warmup:.0%} ignored):")
+    if len(samples) - int(len(samples) * args.warmup) < MIN_SAMPLES:
+        print(f"Fewer than {MIN_SAMPLES} samples after the warm-up; nothing is flagged")
+    print(f"{'series':<28} {'start':>12} {'growth':>12}")
+    for name, start, growth, flagged in trends:
+        print(f"{name:<28} {start:>12.2f} {growth:>+12.2f}  {'UPWARD TREND' if flagged else ''}")
+
+    if len(snapshots) == 2:
+        print("\nLargest allocation growth since the end of the warm-up:")
+        for stat in snapshots[1].compare_to(snapshots[0], "lineno")[:10]:
+            print(f"  {stat}")
+
+    flagged = [name for name, _, _, flag in trends if flag]
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"samples": samples, "flagged": flagged,
+                       "trends": [{"series": name, "start": start, "growth": growth, "flagged": flag}
+                                  for name, start, growth, flag in trends]}, f, indent=1)
+    if flagged:
+        print(f"\nUpward trend in: {', '.join(flagged)}")
+        return 1
+    print("\nNo upward trends")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
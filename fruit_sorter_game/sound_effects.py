@@ -289,10 +289,10 @@ class SoundEffects:
         sound = pygame.sndarray.make_sound(stereo)
         return sound
     
-    def play(self, sound_name):
-        """Play a sound effect by name"""
+    def play(self, sound_name, loudness=1.0):
+        """Play a sound effect by name; loudness scales the effects volume, capped at full volume"""
         if sound_name in self.sounds:
-            self.sounds[sound_name].set_volume(self.sfx_volume)
+            self.sounds[sound_name].set_volume(min(1.0, self.sfx_volume * loudness))
             self.sounds[sound_name].play()
         else:
             print(f"Sound '{sound_name}' not found")
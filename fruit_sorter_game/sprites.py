@@ -1,8 +1,14 @@
 import pygame
 import os
+import copy
 import random
 import math
 
+from collision import get_frames, get_hitbox, rotation_frame, swept_rect
+from pool import Pool
+from perf_hud import new_surface, render_text
+from screen import SCREEN_WIDTH
+
 # Enhanced color palette (neon retro style)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -16,27 +22,56 @@ NEON_PINK = (255, 100, 200)
 NEON_CYAN = (60, 255, 255)
 
 class Fruit(pygame.sprite.Sprite):
-    def __init__(self, x, y, fruit_type, side, speed):
+    # Base artwork per fruit type, drawn once and shared by every fruit
+    image_cache = {}
+    
+    def __init__(self, x, y, fruit_type, side, speed, rng=None):
         super().__init__()
+        self.reset(x, y, fruit_type, side, speed, rng)
+    
+    def reset(self, x, y, fruit_type, side, speed, rng=None):
+        """(Re)initialize the fruit, so a pooled one can be reused"""
+        self.rng = rng or random
         self.fruit_type = fruit_type
         self.side = side
         self.speed = speed
         self.rotation = 0
-        self.rotation_speed = random.uniform(-2, 2)
+        self.rotation_speed = self.rng.uniform(-2, 2)
         self.pulse_factor = 0
-        self.pulse_speed = random.uniform(0.05, 0.1)
+        self.pulse_speed = self.rng.uniform(0.05, 0.1)
         
         # Create enhanced pixel art for the fruit
-        self.original_image = self.create_enhanced_fruit(fruit_type)
-        self.image = self.original_image.copy()
+        self.original_image = self.get_fruit_image(fruit_type)
+        self.frames = get_frames(fruit_type, self.original_image)
+        self.image, self.mask = self.frames[0]
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
         
+        # Collision box that does not grow with the rotated image
+        self.hitbox_offset = get_hitbox(fruit_type, self.original_image)
+        self.hitbox = self.hitbox_offset.move(self.rect.center)
+        
+        # Area covered by the last tick's movement, indexed by the broadphase
+        self.sweep_rect = self.rect.copy()
+        
+        # Exact position, plus the previous tick's for render interpolation
+        self.x = float(x)
+        self.y = float(y)
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Add glow effect
         self.glow_color = self.get_glow_color(fruit_type)
         self.glow_radius = self.rect.width // 2 + 4
     
+    def get_fruit_image(self, fruit_type):
+        image = Fruit.image_cache.get(fruit_type)
+        if image is None:
+            image = self.create_enhanced_fruit(fruit_type)
+            Fruit.image_cache[fruit_type] = image
+        return image
+    
     def get_glow_color(self, fruit_type):
         if fruit_type == "apple":
             return NEON_RED
@@ -57,7 +92,7 @@ class Fruit(pygame.sprite.Sprite):
     def create_enhanced_fruit(self, fruit_type):
         # Create a surface for the fruit with higher resolution
         size = 48
-        image = pygame.Surface((size, size))
+        image = new_surface((size, size))
         image.fill((0, 0, 0))
         image.set_colorkey((0, 0, 0))  # Make black transparent
         
@@ -67,7 +102,7 @@ class Fruit(pygame.sprite.Sprite):
             # Draw apple body
             pygame.draw.circle(image, color, (size//2, size//2 + 2), size//2 - 6)
             # Add highlight
-            highlight = pygame.Surface((size//4, size//4), pygame.SRCALPHA)
+            highlight = new_surface((size//4, size//4), pygame.SRCALPHA)
             pygame.draw.circle(highlight, (255, 255, 255, 100), (size//8, size//8), size//8)
             image.blit(highlight, (size//3, size//3))
             # Draw stem
@@ -94,7 +129,7 @@ class Fruit(pygame.sprite.Sprite):
             # Draw orange body
             pygame.draw.circle(image, color, (size//2, size//2), size//2 - 6)
             # Add highlight
-            highlight = pygame.Surface((size//3, size//3), pygame.SRCALPHA)
+            highlight = new_surface((size//3, size//3), pygame.SRCALPHA)
             pygame.draw.circle(highlight, (255, 255, 255, 80), (size//6, size//6), size//6)
             image.blit(highlight, (size//3, size//3))
             # Add texture details (segments)
@@ -110,7 +145,7 @@ class Fruit(pygame.sprite.Sprite):
             # Draw bomb body
             pygame.draw.circle(image, (30, 30, 30), (size//2, size//2 + 2), size//2 - 6)
             # Add highlight
-            highlight = pygame.Surface((size//4, size//4), pygame.SRCALPHA)
+            highlight = new_surface((size//4, size//4), pygame.SRCALPHA)
             pygame.draw.circle(highlight, (100, 100, 100, 100), (size//8, size//8), size//8)
             image.blit(highlight, (size//3, size//3))
             # Draw fuse
@@ -140,7 +175,7 @@ class Fruit(pygame.sprite.Sprite):
                 points.append((x, y))
             pygame.draw.polygon(image, color, points)
             # Add highlight
-            highlight = pygame.Surface((size//4, size//4), pygame.SRCALPHA)
+            highlight = new_surface((size//4, size//4), pygame.SRCALPHA)
             pygame.draw.circle(highlight, (255, 255, 255, 100), (size//8, size//8), size//8)
             image.blit(highlight, (size//3, size//3))
         
@@ -150,65 +185,97 @@ class Fruit(pygame.sprite.Sprite):
             # Draw blueberry body
             pygame.draw.circle(image, color, (size//2, size//2), size//2 - 6)
             # Add highlight
-            highlight = pygame.Surface((size//4, size//4), pygame.SRCALPHA)
+            highlight = new_surface((size//4, size//4), pygame.SRCALPHA)
             pygame.draw.circle(highlight, (255, 255, 255, 100), (size//8, size//8), size//8)
             image.blit(highlight, (size//3, size//3))
             # Add stem
             pygame.draw.rect(image, (100, 70, 40), (size//2 - 1, 8, 2, 4))
-            # Add texture dots
+            # Add texture dots (fixed layout, the image is shared by all blueberries)
+            dots = random.Random(fruit_type)
             for _ in range(10):
-                angle = random.uniform(0, 2*math.pi)
-                dist = random.randint(size//6, size//2 - 8)
+                angle = dots.uniform(0, 2*math.pi)
+                dist = dots.randint(size//6, size//2 - 8)
                 x = int(size//2 + dist * math.cos(angle))
                 y = int(size//2 + dist * math.sin(angle))
                 pygame.draw.circle(image, (color[0]//1.5, color[1]//1.5, color[2]//1.5), (x, y), 2)
         
         return image
     
-    def update(self):
+    def update(self, dt=1.0):
+        """Advance one simulation tick; dt is the tick length in 60 Hz frames"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Move the fruit down
-        self.rect.y += self.speed
+        self.y += self.speed * dt
         
-        # Add a slight wobble
-        self.rect.x += random.randint(-1, 1)
+        # Add a slight wobble; a random walk's spread grows with the square
+        # root of time, so the step scales by sqrt(dt) to stay rate-independent
+        self.x += self.rng.randint(-1, 1) * math.sqrt(dt)
         
-        # Rotate the fruit
-        self.rotation += self.rotation_speed
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
+        # Rotate the fruit, using the nearest pre-rotated frame
+        self.rotation += self.rotation_speed * dt
+        self.image, self.mask = self.frames[rotation_frame(self.rotation)]
         
         # Update rect to maintain center position
-        old_center = self.rect.center
         self.rect = self.image.get_rect()
-        self.rect.center = old_center
+        self.rect.center = (round(self.x), round(self.y))
+        self.hitbox = self.hitbox_offset.move(self.rect.center)
+        self.sweep_rect = swept_rect(self.rect, self.rect.centerx - round(self.prev_x),
+                                     self.rect.centery - round(self.prev_y))
         
         # Pulse effect
-        self.pulse_factor += self.pulse_speed
+        self.pulse_factor += self.pulse_speed * dt
         if self.pulse_factor > 1:
             self.pulse_factor = 0
     
+    def snapshot(self):
+        """Frozen copy for drawing while the original keeps updating"""
+        frozen = copy.copy(self)
+        frozen.rect = self.rect.copy()
+        return frozen
+    
+    def get_draw_rect(self, alpha=None):
+        """Return the rect to draw at, interpolated between ticks if alpha is given"""
+        if alpha is None:
+            return self.rect
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return self.image.get_rect(center=(round(x), round(y)))
+    
     def draw(self, surface):
         """Draw the fruit directly to a surface with glow effect"""
         # Draw glow effect
         if self.fruit_type not in ["bomb", "rotten"]:
-            glow_surf = pygame.Surface((self.glow_radius*2, self.glow_radius*2), pygame.SRCALPHA)
+            glow_surf = new_surface((self.glow_radius*2, self.glow_radius*2), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (*self.glow_color, 100), (self.glow_radius, self.glow_radius), self.glow_radius)
             surface.blit(glow_surf, (self.rect.centerx - self.glow_radius, self.rect.centery - self.glow_radius), special_flags=pygame.BLEND_ADD)
         
         # Draw the fruit
         surface.blit(self.image, self.rect)
     
-    def draw_with_effects(self, surface):
-        """Draw the fruit with all visual effects"""
+    def draw_with_effects(self, surface, music_pulse=None, alpha=None):
+        """Draw the fruit with all visual effects
+        
+        If music_pulse (0-1) is given the glow follows the music instead of
+        the fruit's own pulse counter. alpha interpolates the position
+        between the previous and current simulation tick.
+        """
+        rect = self.get_draw_rect(alpha)
+        
         # Draw glow effect
         if self.fruit_type not in ["bomb", "rotten"]:
-            pulse = abs(math.sin(self.pulse_factor * 2 * math.pi)) * 0.3 + 0.7
+            if music_pulse is None:
+                pulse = abs(math.sin(self.pulse_factor * 2 * math.pi)) * 0.3 + 0.7
+            else:
+                pulse = music_pulse * 0.3 + 0.7
             glow_radius = int(self.glow_radius * pulse)
-            glow_surf = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
+            glow_surf = new_surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (*self.glow_color, 100), (glow_radius, glow_radius), glow_radius)
-            surface.blit(glow_surf, (self.rect.centerx - glow_radius, self.rect.centery - glow_radius), special_flags=pygame.BLEND_ADD)
+            surface.blit(glow_surf, (rect.centerx - glow_radius, rect.centery - glow_radius), special_flags=pygame.BLEND_ADD)
         
         # Draw the fruit
-        surface.blit(self.image, self.rect)
+        surface.blit(self.image, rect)
 
 class Basket(pygame.sprite.Sprite):
     def __init__(self, x, y, side):
@@ -218,6 +285,7 @@ class Basket(pygame.sprite.Sprite):
         # Create enhanced pixel art for the basket
         self.original_image = self.create_enhanced_basket()
         self.image = self.original_image
+        self.mask = pygame.mask.from_surface(self.image)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
@@ -226,6 +294,9 @@ class Basket(pygame.sprite.Sprite):
         self.speed = 10
         self.target_x = x
         self.smooth_factor = 0.2
+        self.x = float(self.rect.centerx)
+        self.prev_x = self.x
+        self.sweep_rect = self.rect.copy()
         
         # Visual effects
         self.glow_color = NEON_PURPLE
@@ -236,7 +307,7 @@ class Basket(pygame.sprite.Sprite):
     def create_enhanced_basket(self):
         # Create a surface for the basket with higher resolution
         width, height = 100, 50
-        image = pygame.Surface((width, height))
+        image = new_surface((width, height))
         image.fill((0, 0, 0))
         image.set_colorkey((0, 0, 0))  # Make black transparent
         
@@ -263,40 +334,56 @@ class Basket(pygame.sprite.Sprite):
         
         return image
     
-    def move_left(self):
-        self.target_x -= self.speed
+    def move_left(self, dt=1.0):
+        self.target_x -= self.speed * dt
     
-    def move_right(self):
-        self.target_x += self.speed
+    def move_right(self, dt=1.0):
+        self.target_x += self.speed * dt
     
-    def update(self):
-        # Smooth movement towards target
-        self.rect.x += (self.target_x - self.rect.centerx) * self.smooth_factor
+    def update(self, dt=1.0):
+        self.prev_x = self.x
+        
+        # Smooth movement towards target (same easing per second at any tick rate)
+        self.x += (self.target_x - self.x) * (1 - (1 - self.smooth_factor) ** dt)
         
         # Keep basket within screen bounds
-        if self.rect.left < 0:
-            self.rect.left = 0
-            self.target_x = self.rect.centerx
-        if self.rect.right > 800:  # Screen width
-            self.rect.right = 800
-            self.target_x = self.rect.centerx
+        half_width = self.rect.width / 2
+        if self.x - half_width < 0:
+            self.x = half_width
+            self.target_x = self.x
+        if self.x + half_width > SCREEN_WIDTH:
+            self.x = SCREEN_WIDTH - half_width
+            self.target_x = self.x
+        self.rect.centerx = round(self.x)
+        self.sweep_rect = swept_rect(self.rect, self.rect.centerx - round(self.prev_x), 0)
         
         # Update pulse effect
-        self.pulse_factor += self.pulse_speed
+        self.pulse_factor += self.pulse_speed * dt
         if self.pulse_factor > 1:
             self.pulse_factor = 0
     
-    def draw_with_effects(self, surface):
+    def snapshot(self):
+        """Frozen copy for drawing while the original keeps updating"""
+        frozen = copy.copy(self)
+        frozen.rect = self.rect.copy()
+        return frozen
+    
+    def draw_with_effects(self, surface, alpha=None):
         """Draw the basket with glow effect"""
+        rect = self.rect
+        if alpha is not None:
+            rect = self.rect.copy()
+            rect.centerx = round(self.prev_x + (self.x - self.prev_x) * alpha)
+        
         # Draw glow effect
         pulse = abs(math.sin(self.pulse_factor * 2 * math.pi)) * 0.3 + 0.7
         glow_radius = int(self.glow_radius * pulse)
-        glow_surf = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
+        glow_surf = new_surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
         pygame.draw.circle(glow_surf, (*self.glow_color, 80), (glow_radius, glow_radius), glow_radius)
-        surface.blit(glow_surf, (self.rect.centerx - glow_radius, self.rect.centery - glow_radius), special_flags=pygame.BLEND_ADD)
+        surface.blit(glow_surf, (rect.centerx - glow_radius, rect.centery - glow_radius), special_flags=pygame.BLEND_ADD)
         
         # Draw the basket
-        surface.blit(self.image, self.rect)
+        surface.blit(self.image, rect)
 
 class Conveyor(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -315,7 +402,7 @@ class Conveyor(pygame.sprite.Sprite):
     def create_enhanced_conveyor(self):
         # Create a surface for the conveyor with higher resolution
         width, height = 500, 30
-        image = pygame.Surface((width, height))
+        image = new_surface((width, height))
         image.fill((0, 0, 0))
         image.set_colorkey((0, 0, 0))  # Make black transparent
         
@@ -336,9 +423,9 @@ class Conveyor(pygame.sprite.Sprite):
         
         return image
     
-    def update(self):
+    def update(self, dt=1.0):
         # Animate the conveyor
-        self.frame = (self.frame + self.animation_speed) % 20
+        self.frame = (self.frame + self.animation_speed * dt) % 20
         
         # Create a new image with updated pattern
         width, height = 500, 30
@@ -383,25 +470,32 @@ class Button:
         self.pulse_factor = 0
         self.pulse_speed = 0.03
     
-    def update(self, mouse_pos):
+    def update(self, mouse_pos, dt=1.0):
         # Check if mouse is hovering over button
         self.is_hovered = self.rect.collidepoint(mouse_pos)
         self.current_color = self.hover_color if self.is_hovered else self.color
         
         # Update pulse effect
-        self.pulse_factor += self.pulse_speed
+        self.pulse_factor += self.pulse_speed * dt
         if self.pulse_factor > 1:
             self.pulse_factor = 0
     
+    def snapshot(self):
+        """Frozen copy for drawing while the original keeps updating"""
+        return copy.copy(self)
+    
     def is_clicked(self, click_pos):
         return self.rect.collidepoint(click_pos)
     
-    def draw(self, surface):
+    def draw(self, surface, music_pulse=None):
         # Draw glow effect if hovered
         if self.is_hovered:
-            pulse = abs(math.sin(self.pulse_factor * 2 * math.pi)) * 0.3 + 0.7
+            if music_pulse is None:
+                pulse = abs(math.sin(self.pulse_factor * 2 * math.pi)) * 0.3 + 0.7
+            else:
+                pulse = music_pulse * 0.3 + 0.7
             glow_radius = int(self.glow_radius * pulse)
-            glow_surf = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
+            glow_surf = new_surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (*self.glow_color, 100), (glow_radius, glow_radius), glow_radius)
             surface.blit(glow_surf, (self.rect.centerx - glow_radius, self.rect.centery - glow_radius), special_flags=pygame.BLEND_ADD)
         
@@ -429,11 +523,11 @@ class Button:
             self.draw_speaker_icon(surface, self.text == "speaker-muted")
         else:
             # Draw text with shadow
-            text_surface = self.font.render(self.text, True, BLACK)
+            text_surface = render_text(self.font, self.text, BLACK)
             text_rect = text_surface.get_rect(center=(self.rect.centerx + 2, self.rect.centery + 2))
             surface.blit(text_surface, text_rect)
             
-            text_surface = self.font.render(self.text, True, WHITE)
+            text_surface = render_text(self.font, self.text, WHITE)
             text_rect = text_surface.get_rect(center=self.rect.center)
             surface.blit(text_surface, text_rect)
     
@@ -471,109 +565,164 @@ class Button:
                            (self.rect.centerx + 4, self.rect.centery + 8), 2)
 
 class Particle:
-    def __init__(self, x, y, color, size=3, speed=2):
+    def __init__(self, x, y, color, size=3, speed=2, rng=None):
+        self.reset(x, y, color, size, speed, rng)
+    
+    def reset(self, x, y, color, size=3, speed=2, rng=None):
+        self.rng = rng or random
         self.x = x
         self.y = y
         self.color = color
         self.size = size
         self.speed = speed
-        self.angle = random.uniform(0, 2 * math.pi)
-        self.lifetime = random.randint(20, 60)
+        self.angle = self.rng.uniform(0, 2 * math.pi)
+        self.lifetime = self.rng.randint(20, 60)
     
-    def update(self):
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
-        self.lifetime -= 1
-        self.size = max(0, self.size - 0.1)
+    def update(self, dt=1.0):
+        self.x += math.cos(self.angle) * self.speed * dt
+        self.y += math.sin(self.angle) * self.speed * dt
+        self.lifetime -= dt
+        self.size = max(0, self.size - 0.1 * dt)
     
     def draw(self, surface):
-        alpha = min(255, int(255 * self.lifetime / 30))
-        particle_color = (*self.color, alpha)
-        particle_surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(particle_surf, particle_color, (self.size, self.size), self.size)
-        surface.blit(particle_surf, (int(self.x - self.size), int(self.y - self.size)), special_flags=pygame.BLEND_ADD)
+        self.draw_at(surface, self.x, self.y, self.color, self.size, self.lifetime, self.angle)
+    
+    @staticmethod
+    def draw_at(surface, x, y, color, size, lifetime, angle):
+        """Draw from plain values, so snapshots need not copy the particle"""
+        alpha = min(255, int(255 * lifetime / 30))
+        particle_color = (*color, alpha)
+        particle_surf = new_surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(particle_surf, particle_color, (size, size), size)
+        surface.blit(particle_surf, (int(x - size), int(y - size)), special_flags=pygame.BLEND_ADD)
 
 class CrackleParticle(Particle):
-    def __init__(self, x, y, color, size=2, speed=3, angle_offset=0):
-        super().__init__(x, y, color, size, speed)
+    def __init__(self, x, y, color, size=2, speed=3, angle_offset=0, rng=None):
+        self.reset(x, y, color, size, speed, angle_offset, rng)
+    
+    def reset(self, x, y, color, size=2, speed=3, angle_offset=0, rng=None):
+        super().reset(x, y, color, size, speed, rng)
         self.angle_offset = angle_offset
         self.zigzag_counter = 0
-        self.zigzag_freq = random.uniform(0.2, 0.4)
-        self.lifetime = random.randint(10, 30)  # Shorter lifetime for crackle
+        self.zigzag_freq = self.rng.uniform(0.2, 0.4)
+        self.lifetime = self.rng.randint(10, 30)  # Shorter lifetime for crackle
         
-    def update(self):
+    def update(self, dt=1.0):
         # Create zigzag motion by changing angle periodically
-        self.zigzag_counter += self.zigzag_freq
+        self.zigzag_counter += self.zigzag_freq * dt
         if self.zigzag_counter >= 1.0:
-            self.angle += self.angle_offset * random.uniform(0.5, 1.5) * math.pi
+            self.angle += self.angle_offset * self.rng.uniform(0.5, 1.5) * math.pi
             self.zigzag_counter = 0
             
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
-        self.lifetime -= 1
+        self.x += math.cos(self.angle) * self.speed * dt
+        self.y += math.sin(self.angle) * self.speed * dt
+        self.lifetime -= dt
         
         # Particles get smaller as they age
-        self.size = max(0, self.size - 0.05)
+        self.size = max(0, self.size - 0.05 * dt)
     
-    def draw(self, surface):
+    @staticmethod
+    def draw_at(surface, x, y, color, size, lifetime, angle):
         # Brighter glow for electric effect
-        alpha = min(255, int(255 * self.lifetime / 20))
-        particle_color = (*self.color, alpha)
+        alpha = min(255, int(255 * lifetime / 20))
+        particle_color = (*color, alpha)
         
         # Draw a line instead of a circle for electric look
-        if self.lifetime > 5:  # Only draw if particle is still visible
-            end_x = int(self.x + math.cos(self.angle) * self.size * 2)
-            end_y = int(self.y + math.sin(self.angle) * self.size * 2)
+        if lifetime > 5:  # Only draw if particle is still visible
+            end_x = int(x + math.cos(angle) * size * 2)
+            end_y = int(y + math.sin(angle) * size * 2)
             
             # Draw glow
-            glow_surf = pygame.Surface((int(self.size * 6), int(self.size * 6)), pygame.SRCALPHA)
+            glow_surf = new_surface((int(size * 6), int(size * 6)), pygame.SRCALPHA)
             pygame.draw.line(glow_surf, 
                            (particle_color[0], particle_color[1], particle_color[2], alpha//3),
-                           (int(self.size * 3 - (end_x - self.x)/2), int(self.size * 3 - (end_y - self.y)/2)),
-                           (int(self.size * 3 + (end_x - self.x)/2), int(self.size * 3 + (end_y - self.y)/2)),
-                           int(self.size * 2))
+                           (int(size * 3 - (end_x - x)/2), int(size * 3 - (end_y - y)/2)),
+                           (int(size * 3 + (end_x - x)/2), int(size * 3 + (end_y - y)/2)),
+                           int(size * 2))
             
             surface.blit(glow_surf, 
-                       (int(self.x - self.size * 3), int(self.y - self.size * 3)), 
+                       (int(x - size * 3), int(y - size * 3)), 
                        special_flags=pygame.BLEND_ADD)
             
             # Draw core
             pygame.draw.line(surface, 
                            (255, 255, 255, alpha),
-                           (int(self.x), int(self.y)),
+                           (int(x), int(y)),
                            (end_x, end_y),
-                           max(1, int(self.size)))
+                           max(1, int(size)))
 
 class ParticleSystem:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng or random
         self.particles = []
+        self.particle_pool = Pool(Particle)
+        self.crackle_pool = Pool(CrackleParticle)
+        self.burst_scale = 1.0  # Multiplier on burst sizes (stress testing)
     
     def add_particles(self, x, y, color, count=10):
-        for _ in range(count):
-            size = random.uniform(2, 5)
-            speed = random.uniform(1, 3)
-            self.particles.append(Particle(x, y, color, size, speed))
+        for _ in range(round(count * self.burst_scale)):
+            size = self.rng.uniform(2, 5)
+            speed = self.rng.uniform(1, 3)
+            self.particles.append(self.particle_pool.acquire(x, y, color, size, speed, self.rng))
     
     def add_crackle(self, x, y, color=NEON_CYAN):
         """Add a crackle effect (electric-like particles)"""
         for _ in range(20):
-            size = random.uniform(1, 3)
-            speed = random.uniform(2, 5)
-            angle_offset = random.uniform(-0.5, 0.5)  # For zigzag effect
-            self.particles.append(CrackleParticle(x, y, color, size, speed, angle_offset))
-    
-    def update(self):
-        for particle in self.particles[:]:
-            particle.update()
+            size = self.rng.uniform(1, 3)
+            speed = self.rng.uniform(2, 5)
+            angle_offset = self.rng.uniform(-0.5, 0.5)  # For zigzag effect
+            self.particles.append(self.crackle_pool.acquire(x, y, color, size, speed, angle_offset, self.rng))
+    
+    def release(self, particle):
+        if isinstance(particle, CrackleParticle):
+            self.crackle_pool.release(particle)
+        else:
+            self.particle_pool.release(particle)
+    
+    def update(self, dt=1.0):
+        alive = []
+        for particle in self.particles:
+            particle.update(dt)
             if particle.lifetime <= 0:
-                self.particles.remove(particle)
+                self.release(particle)
+            else:
+                alive.append(particle)
+        self.particles = alive
+    
+    def clear(self):
+        for particle in self.particles:
+            self.release(particle)
+        self.particles = []
+    
+    def snapshot(self, into=None):
+        """Draw-only copy for drawing while the original keeps updating
+        
+        Fills `into` (a ParticleSnapshot, reused between frames) with one
+        plain tuple per particle instead of copying the particles.
+        """
+        frozen = into if into is not None else ParticleSnapshot()
+        frozen.items[:] = [(type(p).draw_at, p.x, p.y, p.color, p.size, p.lifetime, p.angle)
+                           for p in self.particles]
+        return frozen
     
     def draw(self, surface):
         for particle in self.particles:
             particle.draw(surface)
 
+class ParticleSnapshot:
+    """The particles of one frame, as (draw_at, x, y, color, size, lifetime, angle)"""
+    def __init__(self):
+        self.items = []
+    
+    def draw(self, surface):
+        for draw_at, x, y, color, size, lifetime, angle in self.items:
+            draw_at(surface, x, y, color, size, lifetime, angle)
+
 class Background:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, render_rng=None):
+        self.rng = rng or random
+        # Draw-only randomness (crater flicker), kept off the simulation stream
+        self.render_rng = render_rng or random
         self.width = width
         self.height = height
         self.stars = []
@@ -600,54 +749,61 @@ class Background:
     
     def generate_stars(self, count):
         for _ in range(count):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
-            size = random.randint(1, 3)
-            brightness = random.randint(100, 255)
+            x = self.rng.randint(0, self.width)
+            y = self.rng.randint(0, self.height)
+            size = self.rng.randint(1, 3)
+            brightness = self.rng.randint(100, 255)
             color = (brightness, brightness, brightness)
             self.stars.append((x, y, size, color))
     
     def generate_tie_fighters(self, count):
         for _ in range(count):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height // 3)
-            size = random.randint(15, 25)
-            speed = random.uniform(0.5, 1.2)
+            x = self.rng.randint(0, self.width)
+            y = self.rng.randint(0, self.height // 3)
+            size = self.rng.randint(15, 25)
+            speed = self.rng.uniform(0.5, 1.2)
             self.tie_fighters.append([x, y, size, speed])
     
+    def set_ships(self, tie_fighters, x_wings):
+        """Replace the ships flying across the background"""
+        self.tie_fighters = []
+        self.x_wings = []
+        self.generate_tie_fighters(tie_fighters)
+        self.generate_x_wings(x_wings)
+    
     def generate_x_wings(self, count):
         for _ in range(count):
-            x = random.randint(0, self.width)
-            y = random.randint(self.height // 4, self.height // 2)
-            size = random.randint(15, 25)
-            speed = random.uniform(0.7, 1.5)
+            x = self.rng.randint(0, self.width)
+            y = self.rng.randint(self.height // 4, self.height // 2)
+            size = self.rng.randint(15, 25)
+            speed = self.rng.uniform(0.7, 1.5)
             self.x_wings.append([x, y, size, speed])
     
-    def update(self):
-        self.offset = (self.offset + self.scroll_speed) % self.height
+    def update(self, dt=1.0):
+        self.offset = (self.offset + self.scroll_speed * dt) % self.height
         
         # Update TIE fighters
         for fighter in self.tie_fighters:
-            fighter[0] += fighter[3]  # Move horizontally
+            fighter[0] += fighter[3] * dt  # Move horizontally
             if fighter[0] > self.width + fighter[2]:
                 fighter[0] = -fighter[2]
-                fighter[1] = random.randint(0, self.height // 3)
+                fighter[1] = self.rng.randint(0, self.height // 3)
         
         # Update X-Wings
         for x_wing in self.x_wings:
-            x_wing[0] -= x_wing[3]  # Move in opposite direction
+            x_wing[0] -= x_wing[3] * dt  # Move in opposite direction
             if x_wing[0] < -x_wing[2]:
                 x_wing[0] = self.width + x_wing[2]
-                x_wing[1] = random.randint(self.height // 4, self.height // 2)
+                x_wing[1] = self.rng.randint(self.height // 4, self.height // 2)
         
         # Update laser shots
-        self.laser_timer += 1
+        self.laser_timer += dt
         if self.laser_timer >= 20:  # Fire lasers more frequently
             self.laser_timer = 0
             
             # Random chance for each ship to fire
             for x_wing in self.x_wings:
-                if random.random() < 0.3:  # 30% chance to fire
+                if self.rng.random() < 0.3:  # 30% chance to fire
                     # Find closest TIE fighter
                     closest_tie = None
                     min_dist = float('inf')
@@ -662,7 +818,7 @@ class Background:
                         self.lasers.append([x_wing[0], x_wing[1], closest_tie[0], closest_tie[1], (255, 0, 0), 20])
             
             for tie in self.tie_fighters:
-                if random.random() < 0.3:  # 30% chance to fire
+                if self.rng.random() < 0.3:  # 30% chance to fire
                     # Find closest X-Wing
                     closest_x_wing = None
                     min_dist = float('inf')
@@ -686,11 +842,11 @@ class Background:
             
             # Move laser
             speed = 8
-            laser[0] += dx * speed
-            laser[1] += dy * speed
+            laser[0] += dx * speed * dt
+            laser[1] += dy * speed * dt
             
             # Decrease lifetime
-            laser[5] -= 1
+            laser[5] -= dt
             
             # Check if laser has reached target or expired
             if laser[5] <= 0 or (abs(laser[0] - laser[2]) < 10 and abs(laser[1] - laser[3]) < 10):
@@ -700,20 +856,29 @@ class Background:
         
         # Update explosion particles
         for particle in self.explosion_particles[:]:
-            particle[0] += particle[3]  # x position
-            particle[1] += particle[4]  # y position
-            particle[5] -= 1  # lifetime
+            particle[0] += particle[3] * dt  # x position
+            particle[1] += particle[4] * dt  # y position
+            particle[5] -= dt  # lifetime
             
             if particle[5] <= 0:
                 self.explosion_particles.remove(particle)
     
+    def snapshot(self):
+        """Frozen copy for drawing while the original keeps updating"""
+        frozen = copy.copy(self)
+        frozen.tie_fighters = [fighter[:] for fighter in self.tie_fighters]
+        frozen.x_wings = [x_wing[:] for x_wing in self.x_wings]
+        frozen.lasers = [laser[:] for laser in self.lasers]
+        frozen.explosion_particles = [particle[:] for particle in self.explosion_particles]
+        return frozen
+    
     def create_explosion(self, x, y, color):
         # Create particles for explosion
         for _ in range(15):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(0.5, 3)
-            size = random.uniform(1, 4)
-            lifetime = random.randint(10, 30)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(0.5, 3)
+            size = self.rng.uniform(1, 4)
+            lifetime = self.rng.randint(10, 30)
             dx = math.cos(angle) * speed
             dy = math.sin(angle) * speed
             self.explosion_particles.append([x, y, size, dx, dy, lifetime, color])
@@ -730,7 +895,7 @@ class Background:
                             int(start_y + (end_y - start_y) * 0.2)), 3)
             
             # Draw glow effect
-            glow_surf = pygame.Surface((8, 8), pygame.SRCALPHA)
+            glow_surf = new_surface((8, 8), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (*color, 150), (4, 4), 4)
             surface.blit(glow_surf, (int(start_x) - 4, int(start_y) - 4), special_flags=pygame.BLEND_ADD)
         
@@ -740,7 +905,7 @@ class Background:
             pygame.draw.circle(surface, color, (int(x), int(y)), int(size))
             
             # Draw glow
-            glow_surf = pygame.Surface((int(size*4), int(size*4)), pygame.SRCALPHA)
+            glow_surf = new_surface((int(size*4), int(size*4)), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (*color, 50), (int(size*2), int(size*2)), int(size*2))
             surface.blit(glow_surf, (int(x - size*2), int(y - size*2)), special_flags=pygame.BLEND_ADD)
         
@@ -753,9 +918,9 @@ class Background:
         
         # Add some craters/details
         for _ in range(5):
-            crater_x = x + random.randint(-radius//2, radius//2)
-            crater_y = y + random.randint(-radius//2, radius//2)
-            crater_radius = random.randint(5, 15)
+            crater_x = x + self.render_rng.randint(-radius//2, radius//2)
+            crater_y = y + self.render_rng.randint(-radius//2, radius//2)
+            crater_radius = self.render_rng.randint(5, 15)
             
             # Only draw if within planet bounds
             if ((crater_x - x)**2 + (crater_y - y)**2)**0.5 < radius - crater_radius:
@@ -0,0 +1,178 @@
+"""Span recorder with Chrome trace-event export.
+
+Spans (name, thread, start, end) go into a ring buffer allocated up
+front, so a long session keeps only its most recent spans and tracing
+never allocates per span beyond the float timestamps. export() writes
+the buffer as Chrome trace-event JSON, which chrome://tracing and
+ui.perfetto.dev show as a timeline per thread.
+
+Methods are traced by swapping in a timing wrapper on their class while
+tracing is on, and putting the original back when it is turned off, so
+with tracing off the traced code runs exactly as before. F10 in the game
+toggles tracing and exports on stop; FRUIT_TRACE=1 traces from the
+first frame and exports at exit.
+
+    with tracer.span("load level"):
+        ...
+"""
+import os
+import json
+import time
+import functools
+import threading
+
+TRACE_ENV = "FRUIT_TRACE"
+TRACE_DIR = "traces"
+CAPACITY = 1 << 16
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = [0.0] * capacity
+        self.ends = [0.0] * capacity
+        self.threads = [0] * capacity
+        self.lock = threading.Lock()
+        self.next = 0
+        self.total = 0
+        self.enabled = False
+        self.from_env = os.environ.get(TRACE_ENV, "") not in ("", "0")
+        self.targets = []
+        self.originals = {}
+        self.origin = time.perf_counter()
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def trace_method(self, cls, method, name=None):
+        """Register cls.method to be traced as `name` while tracing is on"""
+        self.targets.append((cls, method, name or f"{cls.__name__}.{method}"))
+
+    def start(self):
+        if self.enabled:
+            return
+        self.clear()
+        for cls, method, name in self.targets:
+            original = cls.__dict__[method]
+            self.originals[(cls, method)] = original
+            setattr(cls, method, self._wrap(original, name))
+        self.enabled = True
+        print("Tracing started")
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for (cls, method), original in self.originals.items():
+            setattr(cls, method, original)
+        self.originals.clear()
+
+    def toggle(self, out_dir=TRACE_DIR):
+        """Start tracing, or stop and export; returns the exported path"""
+        if not self.enabled:
+            self.start()
+            return None
+        self.stop()
+        return self.export(out_dir=out_dir)
+
+    def _wrap(self, func, name):
+        record = self.record
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def traced(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, clock())
+        return traced
+
+    def span(self, name):
+        """Context manager recording one span; free when tracing is off"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start, end):
+        # The render thread records spans too
+        with self.lock:
+            i = self.next
+            self.next = (i + 1) % self.capacity
+            self.total += 1
+        self.names[i] = name
+        self.starts[i] = start
+        self.ends[i] = end
+        self.threads[i] = threading.get_ident()
+
+    def clear(self):
+        self.next = 0
+        self.total = 0
+
+    def events(self):
+        """Spans in the buffer, oldest first, as Chrome complete ("X") events"""
+        count = len(self)
+        first = (self.next - count) % self.capacity
+        thread_ids = {}
+        events = []
+        for k in range(count):
+            i = (first + k) % self.capacity
+            tid = thread_ids.setdefault(self.threads[i], len(thread_ids) + 1)
+            events.append({
+                "name": self.names[i],
+                "ph": "X",
+                "ts": (self.starts[i] - self.origin) * 1e6,
+                "dur": (self.ends[i] - self.starts[i]) * 1e6,
+                "pid": 1,
+                "tid": tid,
+            })
+
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, tid in thread_ids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                           "args": {"name": names.get(ident, f"thread {ident}")}})
+        return events
+
+    def export(self, path=None, out_dir=TRACE_DIR):
+        """Write the buffer as Chrome trace JSON and return the path"""
+        if path is None:
+            os.makedirs(out_dir, exist_ok=True)
+            path = os.path.join(out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+        dropped = max(0, self.total - self.capacity)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        print(f"Trace of {len(self)} spans saved to {path}"
+              + (f" ({dropped} older spans overwritten)" if dropped else ""))
+        return path
+
+
+# One recorder for the whole process; wrapped methods from any thread write to it
+tracer = Tracer()